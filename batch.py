@@ -0,0 +1,84 @@
+"""
+Runs many independent statement trees (one per person) in one go:
+
+    python batch.py "people/*/statements" --workers 8 --output batch_results.json
+    python batch.py @roots.txt --shard-index 0 --shard-count 4   # this machine's quarter
+
+Each root holds an accounts.json, or the default moneyfarm/ and interactive-investor/ folders.
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+from src.batch import BatchSettings, find_roots, run_batch, shard, write_batch_results
+from src.adapters.provider_registry import EXTRACTORS
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compare ISA performance for many statement trees.",
+                                     fromfile_prefix_chars="@")
+    parser.add_argument("roots", nargs="+",
+                        help="Statement roots or glob patterns; @file reads them from a file, one per line")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes, each handling one tree at a time (default: all cores)")
+    parser.add_argument("--shard-index", type=int, default=0,
+                        help="Which shard of the roots this machine processes, from 0 (default: 0)")
+    parser.add_argument("--shard-count", type=int, default=1,
+                        help="Number of machines the roots are split across (default: 1)")
+    parser.add_argument("--output", default="batch_results.json",
+                        help="Consolidated results file (default: batch_results.json)")
+    parser.add_argument("--extractor", choices=sorted(EXTRACTORS), default="layout",
+                        help="Text extraction for accounts that do not set one in their config (default: layout)")
+    parser.add_argument("--cache", default=".cache/extraction.sqlite",
+                        help="Path of the extracted text cache shared by all workers (default: .cache/extraction.sqlite)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always re-extract statements")
+    parser.add_argument("--incremental", metavar="STATE_DIR", nargs="?", const=".cache/batch",
+                        help="Only parse statements that are new or changed since the last run, keeping "
+                             "manifests under STATE_DIR (default: .cache/batch)")
+    parser.add_argument("--fx-rates",
+                        help="CSV or Parquet file of daily exchange rates (date,currency,rate) for foreign-currency accounts")
+    parser.add_argument("--currency",
+                        help="Currency to report in (default: GBP)")
+    parser.add_argument("--detect", action="store_true",
+                        help="Recognise each statement's provider from its first page and skip everything else")
+    parser.add_argument("--twr", action="store_true",
+                        help="Also calculate time-weighted returns")
+    parser.add_argument("--log-level", default="WARNING",
+                        help="Logging level (default: WARNING)")
+    args = parser.parse_args()
+    if not 0 <= args.shard_index < args.shard_count:
+        parser.error("--shard-index must be between 0 and --shard-count - 1")
+    return args
+
+def main():
+    args = parse_args()
+    logging.basicConfig(level=args.log_level.upper(), format="%(levelname)s %(name)s: %(message)s")
+
+    roots = shard(find_roots(args.roots), args.shard_index, args.shard_count)
+    settings = BatchSettings(
+        extractor=args.extractor,
+        cache_path=None if args.no_cache else args.cache,
+        state_dir=args.incremental,
+        fx_rates_path=args.fx_rates,
+        currency=args.currency,
+        twr=args.twr,
+        detect=args.detect,
+    )
+    print(f"Processing {len(roots)} statement trees (shard {args.shard_index + 1} of {args.shard_count}) "
+          f"with {min(args.workers, max(len(roots), 1))} workers...")
+    start = time.perf_counter()
+    results = run_batch(roots, settings, args.workers)
+    elapsed = time.perf_counter() - start
+
+    write_batch_results(results, args.output, args.shard_index, args.shard_count)
+    failed = [result for result in results if result.error]
+    for result in failed:
+        print(f"FAILED {result.root}: {result.error}")
+    print(f"{len(results) - len(failed)} of {len(results)} trees processed in {elapsed:.1f}s; "
+          f"results saved to {args.output}")
+    # Failures are in the results file; a non-zero status lets schedulers notice them
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
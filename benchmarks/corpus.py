@@ -0,0 +1,258 @@
+"""
+Synthetic statement corpus for benchmarks and scale tests.
+
+Generates Moneyfarm-style (quarterly) and Interactive Investor-style (monthly)
+statements whose wording matches what the readers parse, surrounded by the kind
+of noise real statements carry (holdings tables, fund trades, legal notices).
+Statements are written either as text "PDFs" (pages separated by form feeds,
+read back with TextCorpusExtractor) or as real PDFs via write_pdf.
+"""
+import argparse
+import calendar
+import os
+import random
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from src.domain.model import Transaction
+from src.ports.pdf_extractor import PDFExtractor
+
+PAGE_BREAK = "\f"
+
+FUNDS = [
+    "Vanguard FTSE Global All Cap Index", "iShares Core MSCI World ETF", "Fidelity Index World",
+    "HSBC FTSE All-Share Index", "Legal & General Global Technology", "Royal London Short Term Money Market",
+]
+
+BOILERPLATE = [
+    "Important information",
+    "The value of investments can go down as well as up and you may get back less than you invest.",
+    "Past performance is not a reliable indicator of future results.",
+    "This statement should be read together with our terms and conditions.",
+    "If you have any questions about this statement please contact our customer services team.",
+]
+
+@dataclass
+class CorpusSpec:
+    accounts: int = 1
+    years: int = 5
+    start_year: int = 2015
+    deposits_per_statement: int = 3
+    holdings_lines: int = 40
+    boilerplate_pages: int = 2
+    seed: int = 0
+
+@dataclass
+class GeneratedAccount:
+    """A generated statement directory and what the readers should find in it."""
+    directory: str
+    provider: str  # "moneyfarm" or "interactive-investor"
+    transactions: List[Transaction] = field(default_factory=list)
+    valuations: List[Tuple[date, float]] = field(default_factory=list)
+
+class TextCorpusExtractor(PDFExtractor):
+    """Reads statements written in text mode, so parsing can be measured without pdfplumber."""
+
+    def extract_tables(self, file_path: str) -> List[List[List[str]]]:
+        return []
+
+    def extract_text(self, file_path: str) -> str:
+        return "".join(page + "\n" for page in self.iter_pages(file_path))
+
+    def iter_pages(self, file_path: str, pages: Optional[Sequence[int]] = None) -> Iterator[str]:
+        with open(file_path, encoding="utf-8") as f:
+            texts = f.read().split(PAGE_BREAK)
+        for index in range(len(texts)) if pages is None else pages:
+            yield texts[index]
+
+    def probe_pages(self, file_path: str, keywords: Sequence[str]) -> Optional[List[int]]:
+        needles = [k.lower() for k in keywords]
+        return [i for i, text in enumerate(self.iter_pages(file_path)) if any(n in text.lower() for n in needles)]
+
+def money(amount: float, spaced: bool = False) -> str:
+    return f"£ {amount:,.2f}" if spaced else f"£{amount:,.2f}"
+
+def month_end(year: int, month: int) -> date:
+    return date(year, month, calendar.monthrange(year, month)[1])
+
+def holdings_page(rng: random.Random, lines: int, spaced: bool) -> str:
+    rows = ["Holdings", "Fund Units Price Value"]
+    for _ in range(lines):
+        fund = rng.choice(FUNDS)
+        units = rng.uniform(1, 500)
+        price = rng.uniform(0.5, 300)
+        rows.append(f"{fund} {units:,.3f} {price:,.4f} {money(units * price, spaced)}")
+    return "\n".join(rows)
+
+def boilerplate_page(rng: random.Random) -> str:
+    return "\n".join(rng.choice(BOILERPLATE) for _ in range(30))
+
+def moneyfarm_statement(rng: random.Random, spec: CorpusSpec, period_end: date, value: float,
+                        deposits: List[Transaction], carried: List[Transaction]) -> List[str]:
+    """Quarterly statement: account value summary, transaction list, holdings, notices."""
+    lines = [
+        "Moneyfarm Stocks and Shares ISA",
+        f"Statement for the quarter ending {period_end.strftime('%d %B %Y')}",
+        f"Total account value At {period_end.strftime('%d %B %Y')} {money(value)}",
+        "Transactions",
+    ]
+    # Statements repeat the end of the previous period, which the readers must deduplicate
+    for tx in sorted(carried + deposits, key=lambda t: t.date):
+        lines.append(f"{tx.date.isoformat()} {tx.description} {money(-tx.amount)}")
+        if rng.random() < 0.5:
+            lines.append(f"{tx.date.isoformat()} Portfolio rebalancing {money(rng.uniform(10, 500))}")
+    pages = ["\n".join(lines), holdings_page(rng, spec.holdings_lines, spaced=False)]
+    pages.extend(boilerplate_page(rng) for _ in range(spec.boilerplate_pages))
+    return pages
+
+def ii_statement(rng: random.Random, spec: CorpusSpec, period_end: date, value: float,
+                 deposits: List[Transaction], fees: List[Transaction]) -> List[str]:
+    """Monthly statement: portfolio summary, activities, regular fees, then holdings and notices."""
+    cash = value * rng.uniform(0.01, 0.1)
+    summary = [
+        "Interactive Investor Statement",
+        f"Statement date {period_end.strftime('%d %b %Y')}",
+        f"Total Portfolio Value {money(value - cash, True)} {money(cash, True)} {money(value, True)}",
+        "Activities - ISA",
+    ]
+    for tx in deposits:
+        summary.append(f"{tx.date.strftime('%d %b %Y')} {tx.description} {money(-tx.amount, True)}")
+        fund = rng.choice(FUNDS)
+        summary.append(f"{tx.date.strftime('%d %b %Y')} Buy {fund} {money(-tx.amount * 0.99, True)}")
+    fee_lines = ["Regular Fees", "Due Date Fee Type Fee Amount Invoiced Account Status"]
+    for fee in fees:
+        fee_lines.append(f"{fee.date.strftime('%d %b %Y')} Total Monthly Fee {money(-fee.amount, True)} 3657992 PAID")
+    pages = ["\n".join(summary), "\n".join(fee_lines), holdings_page(rng, spec.holdings_lines, spaced=True)]
+    pages.extend(boilerplate_page(rng) for _ in range(spec.boilerplate_pages))
+    return pages
+
+def generate_account(root: str, provider: str, index: int, spec: CorpusSpec,
+                     rng: random.Random, pdf: bool) -> GeneratedAccount:
+    directory = os.path.join(root, f"{provider}-{index:03d}")
+    os.makedirs(directory, exist_ok=True)
+    account = GeneratedAccount(directory, provider)
+    value = 0.0
+    previous: List[Transaction] = []
+    quarterly = provider == "moneyfarm"
+    months = range(3, 13, 3) if quarterly else range(1, 13)
+
+    for year in range(spec.start_year, spec.start_year + spec.years):
+        for month in months:
+            period_end = month_end(year, month)
+            period_start = date(year, month - 2 if quarterly else month, 1)
+            deposits = []
+            used_keys = set()
+            for _ in range(spec.deposits_per_statement):
+                day = period_start + timedelta(days=rng.randrange((period_end - period_start).days + 1))
+                amount = round(rng.choice([100, 250, 500, 1000, 2000]) * rng.uniform(0.5, 1.5), 2)
+                # Keep (date, amount) unique so the expected deduplicated set is exact
+                if (day, amount) in used_keys:
+                    continue
+                used_keys.add((day, amount))
+                description = "Bank input" if quarterly else "Monthly Subscription"
+                deposits.append(Transaction(day, -amount, description))
+            growth = rng.gauss(0.015 if quarterly else 0.005, 0.04)
+            value = round(max(value * (1 + growth), 0.0) - sum(tx.amount for tx in deposits), 2)
+
+            if quarterly:
+                pages = moneyfarm_statement(rng, spec, period_end, value, deposits, previous[-1:])
+                filename = f"{year % 100:02d}_q{month // 3}.pdf"
+                account.transactions.extend(deposits)
+                previous = deposits or previous
+            else:
+                fee = Transaction(date(year, month, 10), -4.99, "Total Monthly Fee")
+                fees = [fee] + previous[-1:]
+                pages = ii_statement(rng, spec, period_end, value, deposits, fees)
+                filename = f"Statement {period_end.isoformat()}.pdf"
+                account.transactions.extend(deposits + [fee])
+                previous = [fee]
+
+            path = os.path.join(directory, filename)
+            if pdf:
+                write_pdf(path, pages)
+            else:
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(PAGE_BREAK.join(pages))
+            account.valuations.append((period_end, value))
+    return account
+
+def generate_corpus(root: str, spec: CorpusSpec, providers: Tuple[str, ...] = ("moneyfarm", "interactive-investor"),
+                    pdf: bool = False) -> List[GeneratedAccount]:
+    """Writes spec.accounts statement directories per provider under root."""
+    rng = random.Random(spec.seed)
+    accounts = []
+    for provider in providers:
+        for index in range(spec.accounts):
+            accounts.append(generate_account(root, provider, index, spec, rng, pdf))
+    return accounts
+
+def write_pdf(path: str, pages: List[str], font_size: float = 8.0):
+    """
+    Writes a minimal PDF with one text line per statement line, using the standard
+    Helvetica font (WinAnsi encoding, which covers £). Long pages are split so text
+    stays on the A4 media box.
+    """
+    leading = font_size * 1.25
+    lines_per_page = int(780 / leading)
+    physical_pages = []
+    for page in pages:
+        lines = page.split("\n")
+        for start in range(0, max(len(lines), 1), lines_per_page):
+            physical_pages.append(lines[start:start + lines_per_page])
+
+    objects: Dict[int, bytes] = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    }
+    page_ids = []
+    next_id = 4
+    for lines in physical_pages:
+        ops = [f"BT /F1 {font_size} Tf {leading} TL 36 806 Td".encode("latin-1")]
+        for line in lines:
+            escaped = line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+            ops.append(b"(" + escaped.encode("cp1252", errors="replace") + b") Tj T*")
+        ops.append(b"ET")
+        stream = b"\n".join(ops)
+        content_id, page_id = next_id, next_id + 1
+        next_id += 2
+        objects[content_id] = b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream"
+        objects[page_id] = (b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id)
+        page_ids.append(page_id)
+    kids = b" ".join(b"%d 0 R" % i for i in page_ids)
+    objects[2] = b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(page_ids)
+    write_pdf_objects(path, objects)
+
+def write_pdf_objects(path: str, objects: Dict[int, bytes]):
+    """Writes numbered PDF objects with their cross-reference table; object 1 is the catalog."""
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for obj_id in sorted(objects):
+        offsets[obj_id] = len(out)
+        out += b"%d 0 obj\n" % obj_id + objects[obj_id] + b"\nendobj\n"
+    xref_at = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for obj_id in sorted(objects):
+        out += b"%010d 00000 n \n" % offsets[obj_id]
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_at)
+    with open(path, "wb") as f:
+        f.write(out)
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic statement corpus.")
+    parser.add_argument("root", help="Directory to write account folders into")
+    parser.add_argument("--accounts", type=int, default=1, help="Accounts per provider")
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--deposits", type=int, default=3, help="Deposits per statement")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--pdf", action="store_true", help="Write real PDFs instead of text statements")
+    args = parser.parse_args()
+
+    spec = CorpusSpec(accounts=args.accounts, years=args.years, deposits_per_statement=args.deposits, seed=args.seed)
+    accounts = generate_corpus(args.root, spec, pdf=args.pdf)
+    files = sum(len(a.valuations) for a in accounts)
+    transactions = sum(len(a.transactions) for a in accounts)
+    print(f"Wrote {files} statements with {transactions} transactions across {len(accounts)} accounts")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Stage-by-stage benchmark over a synthetic corpus.
+
+Times extraction (pdfplumber and the fast pdfminer adapter on generated PDFs), parsing, deduplication, XIRR and
+chart rendering separately, so it is clear where run time goes as the archive grows.
+Results can be saved as a baseline; later runs compare against it and exit non-zero
+when a stage is slower than the allowed tolerance.
+
+    python -m benchmarks.run --accounts 20 --years 10
+    python -m benchmarks.run --save-baseline
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+from benchmarks.corpus import CorpusSpec, TextCorpusExtractor, generate_corpus
+from src.adapters.pdf_statement_reader import PdfStatementReader
+from src.adapters.provider_registry import PROVIDERS
+from src.domain.model import Portfolio
+from src.domain.service import PerformanceService
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+def best_of(repeat: int, func: Callable[[], object]) -> float:
+    """Best wall-clock time of `repeat` runs, in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def statement_files(directory: str) -> List[str]:
+    return sorted(f for f in os.listdir(directory) if f.endswith(".pdf"))
+
+def run_benchmarks(root: str, spec: CorpusSpec, pdf_statements: int, repeat: int) -> Dict[str, Dict[str, float]]:
+    accounts = generate_corpus(os.path.join(root, "text"), spec)
+    results: Dict[str, Dict[str, float]] = {}
+
+    readers: Dict[str, PdfStatementReader] = {
+        provider: reader_cls(TextCorpusExtractor()) for provider, reader_cls in PROVIDERS.items()
+    }
+    files = {a.directory: statement_files(a.directory) for a in accounts}
+    total_files = sum(len(f) for f in files.values())
+    total_transactions = sum(len(a.transactions) for a in accounts)
+
+    def parse_all():
+        return {a.directory: readers[a.provider]._parse_files([os.path.join(a.directory, f) for f in files[a.directory]])
+                for a in accounts}
+
+    parsed = parse_all()
+    results["parse"] = {"seconds": best_of(repeat, parse_all), "files": total_files}
+
+    def dedup_all() -> List[Portfolio]:
+        return [readers[a.provider]._merge(files[a.directory], parsed[a.directory]) for a in accounts]
+
+    portfolios = dedup_all()
+    results["dedup"] = {"seconds": best_of(repeat, dedup_all), "transactions": total_transactions}
+
+    service = PerformanceService()
+    results["xirr"] = {
+        "seconds": best_of(repeat, lambda: [service.calculate_xirr_result(p) for p in portfolios]),
+        "portfolios": len(portfolios),
+    }
+    results["xirr_batch"] = {
+        "seconds": best_of(repeat, lambda: service.calculate_xirr_batch(portfolios)),
+        "portfolios": len(portfolios),
+    }
+    results["xirr_series"] = {
+        "seconds": best_of(repeat, lambda: [service.calculate_xirr_series(p) for p in portfolios]),
+        "points": sum(len(p.valuations) for p in portfolios),
+    }
+
+    from src.adapters.matplotlib_chart_generator import MatplotlibChartGenerator
+    # Without the render cache, so every repeat measures a real render
+    chart = MatplotlibChartGenerator(cache=False)
+    chart_data = {p.name + str(i): (service.calculate_xirr(p), service.calculate_total_return(p))
+                  for i, p in enumerate(portfolios[:10])}
+    chart_path = os.path.join(root, "chart.png")
+    results["chart"] = {"seconds": best_of(repeat, lambda: chart.generate_performance_chart(chart_data, chart_path))}
+
+    if pdf_statements > 0:
+        from src.adapters.pdf_plumber_extractor import PdfPlumberExtractor
+        pdf_spec = CorpusSpec(accounts=1, years=max(1, pdf_statements // 16), seed=spec.seed)
+        pdf_accounts = generate_corpus(os.path.join(root, "pdf"), pdf_spec, pdf=True)
+        pdf_paths = [os.path.join(a.directory, f) for a in pdf_accounts for f in statement_files(a.directory)]
+        from src.adapters.pdfminer_text_extractor import PdfMinerTextExtractor
+        extractor = PdfPlumberExtractor()
+        results["extract"] = {
+            "seconds": best_of(1, lambda: [extractor.extract_text(p) for p in pdf_paths]),
+            "files": len(pdf_paths),
+        }
+        fast = PdfMinerTextExtractor()
+        results["extract_fast"] = {
+            "seconds": best_of(1, lambda: [fast.extract_text(p) for p in pdf_paths]),
+            "files": len(pdf_paths),
+        }
+    return results
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], tolerance: float) -> List[str]:
+    regressions = []
+    for stage, metrics in results.items():
+        before = baseline.get(stage)
+        if before is None:
+            continue
+        ratio = metrics["seconds"] / before["seconds"] if before["seconds"] > 0 else 1.0
+        marker = "REGRESSION" if ratio > tolerance else ""
+        print(f"{stage:<12} {before['seconds']:>10.4f}s -> {metrics['seconds']:>10.4f}s  x{ratio:5.2f} {marker}")
+        if ratio > tolerance:
+            regressions.append(stage)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark each pipeline stage on a synthetic corpus.")
+    parser.add_argument("--accounts", type=int, default=10, help="Accounts per provider")
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--deposits", type=int, default=3, help="Deposits per statement")
+    parser.add_argument("--pdf-statements", type=int, default=32,
+                        help="Real PDFs generated to time pdfplumber extraction (0 to skip)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=1.25,
+                        help="Slowdown ratio against the baseline that counts as a regression")
+    parser.add_argument("--output", help="Also write the results as JSON to this path")
+    args = parser.parse_args()
+
+    spec = CorpusSpec(accounts=args.accounts, years=args.years, deposits_per_statement=args.deposits, seed=args.seed)
+    with tempfile.TemporaryDirectory() as root:
+        results = run_benchmarks(root, spec, args.pdf_statements, args.repeat)
+
+    report = {
+        "spec": vars(spec),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "stages": results,
+    }
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("spec") != report["spec"]:
+            print("Baseline was recorded with a different corpus spec; timings are not comparable")
+        if compare(results, baseline["stages"], args.tolerance):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
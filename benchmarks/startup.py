@@ -0,0 +1,68 @@
+"""
+CLI startup benchmark.
+
+Times fresh interpreters importing main.py (what every scheduled run pays before
+doing any work) and reports which heavy libraries were loaded on the way, plus
+the slowest imports from `python -X importtime`.
+
+    python -m benchmarks.startup --runs 10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ["pdfplumber", "scipy", "matplotlib", "pandas"]
+
+def time_import(runs: int) -> List[float]:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "import main"], cwd=ROOT, check=True)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def heavy_modules_loaded() -> List[str]:
+    probe = f"import main, sys; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    output = subprocess.run([sys.executable, "-c", probe], cwd=ROOT, check=True, capture_output=True, text=True)
+    return [m for m in output.stdout.strip().split(",") if m]
+
+def slowest_imports(top: int) -> List[Dict[str, object]]:
+    output = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"],
+                            cwd=ROOT, check=True, capture_output=True, text=True)
+    rows = []
+    for line in output.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, module = [part.strip() for part in line.split(":", 1)[1].split("|")]
+        rows.append({"module": module, "cumulative_ms": int(cumulative_us) / 1000})
+    return sorted(rows, key=lambda r: r["cumulative_ms"], reverse=True)[:top]
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure main.py import (startup) time.")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--top", type=int, default=10, help="Number of slowest imports to list")
+    parser.add_argument("--max-seconds", type=float,
+                        help="Exit non-zero if the median startup time exceeds this")
+    args = parser.parse_args()
+
+    timings = time_import(args.runs)
+    report = {
+        "median_seconds": statistics.median(timings),
+        "min_seconds": min(timings),
+        "heavy_modules_loaded": heavy_modules_loaded(),
+        "slowest_imports": slowest_imports(args.top),
+    }
+    print(json.dumps(report, indent=2))
+
+    if args.max_seconds is not None and report["median_seconds"] > args.max_seconds:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,51 +1,316 @@
+import argparse
+import asyncio
+import logging
 import os
-from src.adapters.pdf_plumber_extractor import PdfPlumberExtractor
-from src.adapters.moneyfarm_reader import MoneyfarmReader
-from src.adapters.interactive_investor_reader import InteractiveInvestorReader
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import date, datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from src.adapters.caching_pdf_extractor import CachingPDFExtractor
+from src.adapters.provider_registry import DEFAULT_ACCOUNTS, EXTRACTORS, AccountConfig, build_classifier, build_reader, load_accounts, slugify
+from src.ports.pdf_extractor import PDFExtractor
+from src.adapters.sqlite_ledger import SqliteLedger, LedgerStatementReader
 from src.adapters.matplotlib_chart_generator import MatplotlibChartGenerator
+from src.ports.chart_generator import ChartRequest
 from src.domain.service import PerformanceService
+from src.domain.projection import ProjectionResult, contribution_schedule, project
+from src.instrumentation import Instrumentation, profiled
+from src.orchestration import InlineExecutor, ProviderJob, ProviderOutcome, run_providers, run_outputs, write_results
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compare ISA performance across providers.")
+    parser.add_argument("--config",
+                        help="JSON file declaring the accounts to compare (default: the Moneyfarm and "
+                             "Interactive Investor folders under statements/)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of processes used to read statements (default: 1, serial)")
+    parser.add_argument("--cache", default=".cache/extraction.sqlite",
+                        help="Path of the extracted text cache (default: .cache/extraction.sqlite)")
+    parser.add_argument("--extractor", choices=sorted(EXTRACTORS), default="layout",
+                        help="Text extraction for accounts that do not set one in the config: 'layout' "
+                             "(pdfplumber, default) or 'fast' (line-based pdfminer, for plain layouts)")
+    parser.add_argument("--detect", action="store_true",
+                        help="Recognise each statement's provider from its first page: skip PDFs that are not "
+                             "statements or belong to another provider, and let providers share one folder")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always re-extract statements with pdfplumber")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only parse statements that are new or changed since the last run, keeping a "
+                             "manifest per account next to the --cache file")
+    parser.add_argument("--history", action="store_true",
+                        help="Also print the XIRR as of every statement date")
+    parser.add_argument("--twr", action="store_true",
+                        help="Also print the time-weighted return between statement valuations, overall and per year")
+    parser.add_argument("--log-level", default="WARNING",
+                        help="Logging level, e.g. DEBUG to log XIRR cash flows (default: WARNING)")
+    parser.add_argument("--report",
+                        help="Write stage timings, counters and per-file metrics as JSON to this path")
+    parser.add_argument("--profile",
+                        help="Run under cProfile and write the stats to this path. Accounts are then read one "
+                             "at a time on the main thread so their work is profiled; statements parsed in "
+                             "--workers processes are not")
+    parser.add_argument("--concurrency", type=int, default=2,
+                        help="Number of accounts read at the same time (default: 2)")
+    parser.add_argument("--results",
+                        help="Write the per-account results as JSON to this path")
+    parser.add_argument("--ledger",
+                        help="Record parsed statements in this SQLite ledger, e.g. .cache/ledger.sqlite")
+    parser.add_argument("--from-ledger", action="store_true",
+                        help="Build portfolios from the ledger instead of reading the PDFs")
+    parser.add_argument("--start", type=date.fromisoformat,
+                        help="With --from-ledger, measure from this date (YYYY-MM-DD): the last valuation on or "
+                             "before it becomes the opening deposit and earlier transactions are ignored")
+    parser.add_argument("--end", type=date.fromisoformat,
+                        help="With --from-ledger, value the portfolios as of this date (YYYY-MM-DD)")
+    parser.add_argument("--fx-rates",
+                        help="CSV or Parquet file of daily exchange rates (date,currency,rate: the GBP value of one "
+                             "unit of currency) used to convert accounts and transactions in other currencies")
+    parser.add_argument("--currency",
+                        help="Currency to report in (default: GBP); needs --fx-rates covering it unless every "
+                             "account is already in it")
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep running: ingest new statements as they arrive, refresh outputs and serve results over HTTP")
+    parser.add_argument("--port", type=int, default=8765,
+                        help="With --watch, local port of the JSON results endpoint (default: 8765)")
+    parser.add_argument("--poll-interval", type=float, default=2.0,
+                        help="With --watch, seconds between directory scans when inotify is unavailable (default: 2)")
+    parser.add_argument("--polling", action="store_true",
+                        help="With --watch, always poll instead of using inotify (e.g. for network mounts)")
+    parser.add_argument("--project", type=int, metavar="YEARS",
+                        help="Simulate each account this many years ahead at its historical XIRR, continuing "
+                             "its recent contributions, and report percentile bands")
+    parser.add_argument("--paths", type=int, default=100_000,
+                        help="With --project, number of simulated return paths (default: 100000)")
+    parser.add_argument("--volatility", type=float, default=0.15,
+                        help="With --project, yearly volatility of returns (default: 0.15)")
+    parser.add_argument("--seed", type=int,
+                        help="With --project, random seed for reproducible projections")
+    parser.add_argument("--no-chart", "--numbers-only", dest="no_chart", action="store_true",
+                        help="Only print the numbers; never load matplotlib")
+    args = parser.parse_args()
+    if args.from_ledger and not args.ledger:
+        parser.error("--from-ledger requires --ledger")
+    if args.watch:
+        if args.project:
+            parser.error("--project is not supported with --watch")
+        if args.from_ledger:
+            parser.error("--watch reads statement folders and cannot be combined with --from-ledger")
+        if args.profile:
+            parser.error("--profile is not supported with --watch")
+        # Only statements that arrive after start-up should be extracted on each refresh
+        args.incremental = True
+    return args
 
 def main():
-    extractor = PdfPlumberExtractor()
-    performance_service = PerformanceService()
-    chart_generator = MatplotlibChartGenerator()
-    
-    # Readers
-    moneyfarm_reader = MoneyfarmReader(extractor)
-    ii_reader = InteractiveInvestorReader(extractor)
-    
-    print("Reading statements...")
-    
-    # Directories
-    mf_dir = "statements/moneyfarm"
-    ii_dir = "statements/interactive-investor"
-    
-    mf_portfolio = moneyfarm_reader.read_all(mf_dir)
-    ii_portfolio = ii_reader.read_all(ii_dir)
-    
-    # Calculate Returns (XIRR)
-    mf_xirr = performance_service.calculate_xirr(mf_portfolio)
-    ii_xirr = performance_service.calculate_xirr(ii_portfolio)
-    
-    # Calculate Returns (Simple)
-    mf_simple = performance_service.calculate_total_return(mf_portfolio)
-    ii_simple = performance_service.calculate_total_return(ii_portfolio)
-    
-    results = {
-        "Moneyfarm": (mf_xirr, mf_simple),
-        "Interactive Investor": (ii_xirr, ii_simple)
-    }
-    
+    args = parse_args()
+    logging.basicConfig(level=args.log_level.upper(), format="%(levelname)s %(name)s: %(message)s")
+    with profiled(args.profile):
+        run(args)
+
+def run(args):
+    if args.watch:
+        watch(args)
+    else:
+        asyncio.run(run_async(args))
+
+def print_header():
     print("\n--- Results ---")
     print(f"{ 'Account':<25} | {'Annualized (XIRR)':<20} | {'Total Return (Simple)':<20}")
     print("-" * 70)
-    for name, (xirr, simple) in results.items():
-        print(f"{name:<25} | {xirr*100:>18.2f}% | {simple*100:>18.2f}%")
+
+def print_row(outcome: ProviderOutcome):
+    print(f"{outcome.name:<25} | {outcome.xirr*100:>18.2f}% | {outcome.simple_return*100:>18.2f}%")
+
+def print_twr(outcomes: List[ProviderOutcome]):
+    # pandas is already loaded once time-weighted returns have been calculated
+    import pandas as pd
+    print("\n--- Time-weighted return ---")
+    print(f"{'Account':<25} | {'Annualized (TWR)':<20} | {'Cumulative':<20}")
+    print("-" * 70)
+    for outcome in outcomes:
+        print(f"{outcome.name:<25} | {outcome.twr.annualised*100:>18.2f}% | {outcome.twr.cumulative*100:>18.2f}%")
+    # One column per account, one row per calendar year
+    yearly = pd.DataFrame({outcome.name: outcome.twr.yearly for outcome in outcomes}).sort_index()
+    if not yearly.empty:
+        print()
+        print(yearly.to_string(float_format=lambda value: f"{value*100:.2f}%", na_rep="-"))
+
+def build_service(args, instrumentation: Instrumentation) -> PerformanceService:
+    fx_rates = None
+    if args.fx_rates:
+        # Imported here so runs without exchange rates never load pandas
+        from src.adapters.fx_rate_file import load_fx_rates
+        with instrumentation.stage("fx_rates"):
+            fx_rates = load_fx_rates(args.fx_rates)
+    return PerformanceService(instrumentation, fx_rates, args.currency)
+
+def build_jobs(args, instrumentation: Instrumentation) -> Tuple[List[ProviderJob], Dict[str, PDFExtractor], Optional[ProcessPoolExecutor]]:
+    """Readers for every configured account, sharing extractors, cache, ledger and worker pool."""
+    extractors: Dict[str, PDFExtractor] = {}
+
+    def extractor_for(account: AccountConfig) -> PDFExtractor:
+        # One instance per kind, shared by every account using it
+        kind = account.extractor or args.extractor
+        if kind not in extractors:
+            extractor = EXTRACTORS[kind]()
+            extractors[kind] = extractor if args.no_cache else CachingPDFExtractor(extractor, args.cache)
+        return extractors[kind]
+    ledger = SqliteLedger(args.ledger) if args.ledger else None
+    # Manifests and classifications live next to the extraction cache
+    state_dir = os.path.dirname(args.cache)
+    classifier = None
+    if args.detect:
+        # Classifications are cached per file content
+        cache_path = None if args.no_cache else os.path.join(state_dir, "classification.json")
+        classifier = build_classifier(cache_path=cache_path)
+    accounts = load_accounts(args.config) if args.config else DEFAULT_ACCOUNTS
+    # One worker pool for every account rather than one per statement directory
+    pool = ProcessPoolExecutor(max_workers=args.workers) if args.workers > 1 and not args.from_ledger else None
+
+    # Readers
+    jobs = []
+    for account in accounts:
+        if args.from_ledger:
+            reader = LedgerStatementReader(ledger, args.start, args.end, account.name)
+        else:
+            reader = build_reader(account, extractor=extractor_for(account), workers=args.workers,
+                                  manifest_path=os.path.join(state_dir, f"{account.slug}.manifest.json")
+                                  if args.incremental else None,
+                                  instrumentation=instrumentation, ledger=ledger, executor=pool,
+                                  classifier=classifier)
+        jobs.append(ProviderJob(account.name, reader, account.directory))
+    return jobs, extractors, pool
+
+async def run_async(args):
+    instrumentation = Instrumentation()
+    performance_service = build_service(args, instrumentation)
+    jobs, extractors, pool = build_jobs(args, instrumentation)
+    # The profiler only sees the main thread, so profiled runs keep all work on it
+    executor = InlineExecutor() if args.profile else None
+
+    print("Reading statements...")
+    print_header()
+    # Rows are printed as each provider finishes, so the order can vary
+    try:
+        with instrumentation.stage("providers"):
+            outcomes = await run_providers(jobs, performance_service, max_concurrency=args.concurrency,
+                                           history=args.history, twr=args.twr, on_outcome=print_row,
+                                           executor=executor)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    caches = [e for e in extractors.values() if isinstance(e, CachingPDFExtractor)]
+    if caches:
+        # Summed from each statement's metrics, so reads in worker processes are included
+        hits, misses = instrumentation.counters["cache_hits"], instrumentation.counters["cache_misses"]
+        print(f"Extraction cache: {hits} hits, {misses} misses")
+        for cache in caches:
+            # Writes the access times of this run's hits, which keep eviction least-recently-used
+            cache.close()
+    
+    if args.history:
+        for outcome in outcomes:
+            print(f"\n--- XIRR history: {outcome.name} ---")
+            for as_of, result in outcome.history:
+                print(f"{as_of.isoformat():<12} | {result.rate*100:>8.2f}%")
+
+    if args.twr:
+        print_twr(outcomes)
     
-    # Generate Chart
-    chart_path = "performance_comparison.png"
-    chart_generator.generate_performance_chart(results, chart_path)
-    print(f"\nChart saved to {chart_path}")
+    projections = project_outcomes(args, outcomes, instrumentation) if args.project else []
+    await render_outputs(args, outcomes, instrumentation, projections, executor)
+    if args.report:
+        instrumentation.write_json(args.report)
+        print(f"Run report saved to {args.report}")
+
+def project_outcomes(args, outcomes: List[ProviderOutcome], instrumentation: Instrumentation) -> List[ProjectionResult]:
+    """Monte Carlo projection of every account, growing at its own XIRR."""
+    # One generator for all accounts so a seed reproduces the whole run
+    rng = np.random.default_rng(args.seed)
+    projections = []
+    print(f"\n--- Projection: {args.project} years, {args.paths:,} paths ---")
+    print(f"{'Account':<25} | {'Contributions/yr':>16} | {'5th pct':>12} | {'Median':>12} | {'95th pct':>12}")
+    print("-" * 90)
+    for outcome in outcomes:
+        if not np.isfinite(outcome.xirr):
+            print(f"{outcome.name:<25} | no XIRR to project from")
+            continue
+        schedule = contribution_schedule(outcome.portfolio)
+        with instrumentation.stage("projection"):
+            projection = project(outcome.portfolio, outcome.xirr, args.volatility, years=args.project,
+                                 paths=args.paths, schedule=schedule, rng=rng)
+        projections.append(projection)
+        low, median, high = (projection.band(p)[-1] for p in (5, 50, 95))
+        print(f"{outcome.name:<25} | {schedule.per_year:>16,.0f} | {low:>12,.0f} | {median:>12,.0f} | {high:>12,.0f}")
+    return projections
+
+async def render_outputs(args, outcomes: List[ProviderOutcome], instrumentation: Instrumentation,
+                         projections: Sequence[ProjectionResult] = (), executor: Optional[Executor] = None):
+    results = {outcome.name: (outcome.xirr, outcome.simple_return) for outcome in outcomes}
+    charts = [ChartRequest("comparison", results, "performance_comparison.png")]
+    if args.history:
+        history = {outcome.name: outcome.history for outcome in outcomes}
+        charts.append(ChartRequest("history", history, "performance_history.png"))
+    charts.extend(ChartRequest("projection", projection, f"projection_{slugify(projection.name)}.png")
+                  for projection in projections)
+    rendered: List[bool] = []
+
+    def render_charts():
+        with instrumentation.stage("chart"):
+            rendered.extend(MatplotlibChartGenerator().render_charts(charts))
+
+    # Chart rendering and the results file do not depend on each other
+    outputs = []
+    if not args.no_chart:
+        outputs.append(render_charts)
+    if args.results:
+        outputs.append(lambda: write_results(outcomes, args.results))
+    await run_outputs(outputs, executor)
+
+    if not args.no_chart:
+        print()
+        for chart, was_rendered in zip(charts, rendered):
+            print(f"Chart saved to {chart.output_path}" if was_rendered else f"Chart up to date: {chart.output_path}")
+    if args.results:
+        print(f"Results saved to {args.results}")
+
+def watch(args):
+    """
+    Daemon mode: one warm process that re-ingests only the statements that arrive,
+    refreshes the affected accounts and outputs, and serves results over HTTP.
+    """
+    # Imported here so one-shot runs do not pay for the HTTP server and watcher modules
+    from src.adapters.directory_watcher import create_watcher
+    from src.adapters.results_server import ResultsServer
+    from src.watch import WatchService
+    instrumentation = Instrumentation()
+    jobs, _, pool = build_jobs(args, instrumentation)
+
+    def on_update(outcomes: List[ProviderOutcome]):
+        print(f"\nUpdated at {datetime.now():%H:%M:%S}")
+        print_header()
+        for outcome in outcomes:
+            print_row(outcome)
+        asyncio.run(render_outputs(args, outcomes, instrumentation))
+
+    watcher = create_watcher([job.directory for job in jobs], args.poll_interval, polling=True if args.polling else None)
+    service = WatchService(jobs, build_service(args, instrumentation), watcher, max_concurrency=args.concurrency,
+                           history=args.history, twr=args.twr, on_update=on_update)
+    server = ResultsServer(service.results, ("127.0.0.1", args.port))
+    server.start()
+    host, port = server.address
+    print(f"Watching {len(jobs)} statement folders; results at http://{host}:{port}/results (Ctrl+C to stop)")
+    try:
+        service.run(threading.Event())
+    except KeyboardInterrupt:
+        print("\nStopping")
+    finally:
+        server.close()
+        watcher.close()
+        if pool is not None:
+            pool.shutdown()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
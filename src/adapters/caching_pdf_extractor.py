@@ -0,0 +1,272 @@
+import hashlib
+import itertools
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+from src.ports.pdf_extractor import PDFExtractor, PageContent
+from src.adapters.file_fingerprint import file_sha256
+from src.adapters.pdf_content_stream import PROBE_VERSION
+from src.adapters.sqlite_connection import SqliteConnectionMixin
+
+# Cache hits record their access time in memory and write it in batches of this many
+TOUCH_BATCH = 100
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+class CachingPDFExtractor(SqliteConnectionMixin, PDFExtractor):
+    """
+    Decorates another PDFExtractor with a persistent SQLite cache.
+    Entries are keyed by the SHA-256 of the file bytes plus the wrapped extractor's
+    settings, so renamed or moved statements still hit and changed files never do.
+    Payloads are stored as zlib-compressed JSON.
+    """
+
+    def __init__(self, inner: PDFExtractor, db_path: str,
+                 max_bytes: Optional[int] = 256 * 1024 * 1024,
+                 max_age_seconds: Optional[float] = None,
+                 clock: Callable[[], float] = time.time):
+        """
+        max_bytes: Upper bound on the total compressed payload size; least recently
+        used entries are evicted first. None disables size-based eviction.
+        max_age_seconds: Entries older than this are treated as misses and evicted.
+        None keeps entries indefinitely.
+        """
+        self.inner = inner
+        self._init_connections(db_path)
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.clock = clock
+        self.stats = CacheStats()
+        # Access times of cache hits, shared by reader threads until written
+        self._touched: Dict[str, float] = {}
+        self._touch_lock = threading.Lock()
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        del state["_touch_lock"]
+        state["_touched"] = {}
+        return state
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        self._touch_lock = threading.Lock()
+
+    @property
+    def supports_tables(self) -> bool:
+        return self.inner.supports_tables
+
+    def settings_key(self) -> str:
+        return self.inner.settings_key()
+
+    def extract_tables(self, file_path: str) -> List[List[List[str]]]:
+        return self._cached(file_path, "tables", lambda: self.inner.extract_tables(file_path))
+
+    def extract_text(self, file_path: str) -> str:
+        return self._cached(file_path, "text", lambda: self.inner.extract_text(file_path))
+
+    def probe_pages(self, file_path: str, keywords: Sequence[str]) -> Optional[List[int]]:
+        # The keyword set is part of the key, so each reader keeps its own page index
+        keywords_hash = hashlib.sha256("\n".join(keywords).encode("utf-8")).hexdigest()[:16]
+        return self._cached(file_path, f"probe:{PROBE_VERSION}:{keywords_hash}", lambda: self.inner.probe_pages(file_path, keywords))
+
+    def iter_pages(self, file_path: str, pages: Optional[Sequence[int]] = None) -> Iterator[str]:
+        """
+        Streams pages from the cache, falling back to the wrapped extractor.
+        Readers often stop early, so the pages read so far are cached as a prefix;
+        a later caller wanting more pages resumes from the wrapped extractor at the
+        first page not cached. A page selection is cached separately from the
+        whole document.
+        """
+        def produce(skip: int) -> Iterator[str]:
+            remaining = self._remaining(file_path, pages, skip)
+            if remaining is not None:
+                return self.inner.iter_pages(file_path, remaining)
+            return itertools.islice(self.inner.iter_pages(file_path), skip, None)
+
+        return self._cached_prefix(self._key(file_path, self._pages_kind("page-prefix", pages)), produce)
+
+    def iter_document(self, file_path: str, pages: Optional[Sequence[int]] = None) -> Iterator[PageContent]:
+        """Cached like iter_pages, with text and tables stored together per page."""
+        key = self._key(file_path, self._pages_kind("document-prefix", pages))
+        def produce(skip: int) -> Iterator[Any]:
+            remaining = self._remaining(file_path, pages, skip)
+            if remaining is not None:
+                document = self.inner.iter_document(file_path, remaining)
+            else:
+                document = itertools.islice(self.inner.iter_document(file_path), skip, None)
+            return ({"text": c.text, "tables": c.tables} for c in document)
+
+        contents = self._cached_prefix(key, produce)
+        try:
+            for content in contents:
+                yield PageContent(content["text"], content["tables"])
+        finally:
+            # Make sure an early stop still stores the prefix read so far
+            contents.close()
+
+    @staticmethod
+    def _pages_kind(kind: str, pages: Optional[Sequence[int]]) -> str:
+        return kind if pages is None else f"{kind}:{','.join(map(str, pages))}"
+
+    def _remaining(self, file_path: str, pages: Optional[Sequence[int]], skip: int) -> Optional[List[int]]:
+        """
+        Page indices still to extract after the first skip, or None to read the
+        whole document from the wrapped extractor and drop the first skip pages.
+        """
+        if pages is not None:
+            return list(pages)[skip:]
+        if skip == 0:
+            return None
+        count = self.inner.page_count(file_path)
+        return None if count is None else list(range(skip, count))
+
+    def _cached_prefix(self, key: str, produce: Callable[[int], Iterator[Any]]) -> Iterator[Any]:
+        cached = self._get(key)
+        items: List[Any] = cached["pages"] if cached else []
+        complete = bool(cached and cached["complete"])
+        self._count(hit=cached is not None)
+
+        yield from items
+        if complete:
+            return
+
+        prefix_length = len(items)
+        read_to_end = False
+        try:
+            # Only reached when the prefix was not enough; cached pages are not extracted again
+            for item in produce(prefix_length):
+                items.append(item)
+                yield item
+            read_to_end = True
+        finally:
+            # Runs on early close (GeneratorExit) too, so partial reads are kept
+            if read_to_end or len(items) > prefix_length:
+                self._put(key, {"pages": items, "complete": read_to_end})
+
+    def _cached(self, file_path: str, kind: str, compute: Callable[[], Any]) -> Any:
+        key = self._key(file_path, kind)
+        payload = self._get(key)
+        if payload is not None:
+            self._count(hit=True)
+            return payload
+
+        self._count(hit=False)
+        value = compute()
+        self._put(key, value)
+        return value
+
+    def thread_stats(self) -> CacheStats:
+        """
+        Hits and misses of the lookups made on the calling thread. Readers sharing
+        the cache on several threads use it to attribute lookups to their own files.
+        """
+        stats = getattr(self._local, "stats", None)
+        if stats is None:
+            stats = self._local.stats = CacheStats()
+        return stats
+
+    def _count(self, hit: bool):
+        for stats in (self.stats, self.thread_stats()):
+            if hit:
+                stats.hits += 1
+            else:
+                stats.misses += 1
+
+    def _key(self, file_path: str, kind: str) -> str:
+        return f"{file_sha256(file_path)}:{self.inner.settings_key()}:{kind}"
+
+    def _create_schema(self, conn: sqlite3.Connection):
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS extractions ("
+            " key TEXT PRIMARY KEY,"
+            " payload BLOB NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " created REAL NOT NULL,"
+            " accessed REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_extractions_accessed ON extractions (accessed)")
+
+    def _get(self, key: str) -> Optional[Any]:
+        conn = self._connection()
+        row = conn.execute("SELECT payload, created FROM extractions WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+
+        payload, created = row
+        now = self.clock()
+        if self._expired(created, now):
+            with conn:
+                conn.execute("DELETE FROM extractions WHERE key = ?", (key,))
+            self.stats.evictions += 1
+            return None
+
+        self._touch(key, now)
+        return json.loads(zlib.decompress(payload))
+
+    def _put(self, key: str, value: Any):
+        payload = zlib.compress(json.dumps(value).encode("utf-8"))
+        now = self.clock()
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO extractions (key, payload, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, payload, len(payload), now, now),
+            )
+            self._flush_touches(conn)
+            self._evict(conn, now)
+
+    def close(self):
+        """Writes pending access times, then closes the calling thread's connection."""
+        if self._touched:
+            conn = self._connection()
+            with conn:
+                self._flush_touches(conn)
+        super().close()
+
+    def _touch(self, key: str, now: float):
+        # A hit only reads; access times are written with the next store or in batches
+        with self._touch_lock:
+            self._touched[key] = now
+            full = len(self._touched) >= TOUCH_BATCH
+        if full:
+            conn = self._connection()
+            with conn:
+                self._flush_touches(conn)
+
+    def _flush_touches(self, conn: sqlite3.Connection):
+        with self._touch_lock:
+            touched, self._touched = self._touched, {}
+        if touched:
+            conn.executemany("UPDATE extractions SET accessed = ? WHERE key = ?",
+                             [(accessed, key) for key, accessed in touched.items()])
+
+    def _expired(self, created: float, now: float) -> bool:
+        return self.max_age_seconds is not None and now - created > self.max_age_seconds
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        if self.max_age_seconds is not None:
+            cursor = conn.execute("DELETE FROM extractions WHERE created < ?", (now - self.max_age_seconds,))
+            self.stats.evictions += cursor.rowcount
+
+        if self.max_bytes is None:
+            return
+
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM extractions").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        # Drop least recently used entries until the cache fits
+        for key, size in conn.execute("SELECT key, size FROM extractions ORDER BY accessed").fetchall():
+            if total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM extractions WHERE key = ?", (key,))
+            total -= size
+            self.stats.evictions += 1
@@ -0,0 +1,163 @@
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# From <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+class DirectoryWatcher(ABC):
+    """
+    Reports which watched directories gained, changed or lost statement PDFs.
+    Bursts of events (a batch of statements being copied in) are settled into one
+    report, so a caller recomputes once per batch rather than once per file.
+    """
+
+    def __init__(self, directories: Iterable[str], settle_seconds: float = 0.5):
+        self.directories = [os.path.abspath(d) for d in directories]
+        self.settle_seconds = settle_seconds
+
+    @abstractmethod
+    def changes(self, timeout: float) -> Set[str]:
+        """Waits up to timeout seconds and returns the directories that changed (possibly none)."""
+        pass
+
+    def close(self):
+        pass
+
+class PollingWatcher(DirectoryWatcher):
+    """Compares size and mtime of every PDF on each poll. Works on any platform and filesystem."""
+
+    def __init__(self, directories: Iterable[str], interval: float = 2.0, settle_seconds: float = 0.5):
+        super().__init__(directories, settle_seconds)
+        self.interval = interval
+        self._snapshots = {d: self._snapshot(d) for d in self.directories}
+
+    def changes(self, timeout: float) -> Set[str]:
+        deadline = time.monotonic() + timeout
+        while True:
+            changed = self._poll()
+            if changed:
+                # Keep polling until the directory stops changing, e.g. a copy in progress
+                while True:
+                    time.sleep(self.settle_seconds)
+                    settled = self._poll()
+                    if not settled:
+                        return changed
+                    changed |= settled
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return set()
+            time.sleep(min(self.interval, remaining))
+
+    def _poll(self) -> Set[str]:
+        changed = set()
+        for directory in self.directories:
+            snapshot = self._snapshot(directory)
+            if snapshot != self._snapshots[directory]:
+                self._snapshots[directory] = snapshot
+                changed.add(directory)
+        return changed
+
+    @staticmethod
+    def _snapshot(directory: str) -> Dict[str, Tuple[int, int]]:
+        snapshot = {}
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".pdf") and entry.is_file():
+                        stat = entry.stat()
+                        snapshot[entry.name] = (stat.st_size, stat.st_mtime_ns)
+        except FileNotFoundError:
+            pass
+        return snapshot
+
+class InotifyWatcher(DirectoryWatcher):
+    """
+    Linux inotify through ctypes, so the process sleeps until a file is written,
+    moved or deleted instead of rescanning. Only completed writes (IN_CLOSE_WRITE)
+    count, so a statement is never picked up half copied.
+    """
+    mask = IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_DELETE
+
+    def __init__(self, directories: Iterable[str], settle_seconds: float = 0.5):
+        super().__init__(directories, settle_seconds)
+        self._libc = _load_libc()
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._watches: Dict[int, str] = {}
+        try:
+            for directory in self.directories:
+                wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), self.mask)
+                if wd < 0:
+                    errno = ctypes.get_errno()
+                    raise OSError(errno, f"Cannot watch {directory}: {os.strerror(errno)}")
+                self._watches[wd] = directory
+        except OSError:
+            os.close(self._fd)
+            raise
+
+    def changes(self, timeout: float) -> Set[str]:
+        changed = self._read_events(timeout)
+        # Drain follow-up events until the burst settles
+        while changed:
+            more = self._read_events(self.settle_seconds)
+            if not more:
+                break
+            changed |= more
+        return changed
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def _read_events(self, timeout: float) -> Set[str]:
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+        data = os.read(self._fd, 64 * 1024)
+        changed = set()
+        offset = 0
+        while offset < len(data):
+            wd, _mask, _cookie, length = EVENT_HEADER.unpack_from(data, offset)
+            name = data[offset + EVENT_HEADER.size:offset + EVENT_HEADER.size + length].rstrip(b"\0")
+            offset += EVENT_HEADER.size + length
+            if name.endswith(b".pdf") and wd in self._watches:
+                changed.add(self._watches[wd])
+        return changed
+
+def _load_libc() -> ctypes.CDLL:
+    libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    libc.inotify_init1.argtypes = [ctypes.c_int]
+    libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    return libc
+
+def create_watcher(directories: List[str], poll_interval: float = 2.0, polling: Optional[bool] = None) -> DirectoryWatcher:
+    """
+    inotify where available, polling otherwise (other platforms, network mounts
+    where inotify sees nothing, or when the watch limit is exhausted).
+    polling: Force one or the other; None picks automatically.
+    """
+    if not polling:
+        try:
+            return InotifyWatcher(directories)
+        except (OSError, AttributeError) as e:
+            if polling is False:
+                raise
+            logger.info("inotify unavailable (%s), polling every %.1fs instead", e, poll_interval)
+    return PollingWatcher(directories, poll_interval)
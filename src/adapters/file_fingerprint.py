@@ -0,0 +1,21 @@
+import hashlib
+import os
+from functools import lru_cache
+
+def file_sha256(file_path: str, chunk_size: int = 1 << 20) -> str:
+    """
+    Returns the hex SHA-256 digest of a file's bytes, read in chunks. Digests are
+    remembered per path, size, modification time and inode, so the extraction
+    cache, manifest and classifier looking at the same file during a read hash
+    it once; a file that is rewritten or replaced is hashed again.
+    """
+    stat = os.stat(file_path)
+    return _sha256(os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns, stat.st_ino, chunk_size)
+
+@lru_cache(maxsize=4096)
+def _sha256(file_path: str, size: int, mtime_ns: int, inode: int, chunk_size: int) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
@@ -0,0 +1,30 @@
+from datetime import date
+import numpy as np
+from src.domain.fx import FxRateTable
+from src.domain.model import DEFAULT_CURRENCY
+
+COLUMNS = ("date", "currency", "rate")
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+def load_fx_rates(path: str, base: str = DEFAULT_CURRENCY) -> FxRateTable:
+    """
+    Loads a local rate file into an FxRateTable. CSV, or Parquet when the path ends
+    in .parquet (needs pyarrow or fastparquet), with one row per currency and day:
+        date,currency,rate
+        2024-01-02,USD,0.7862
+    rate is the value of one unit of currency in base. The file is read once with
+    pandas and the columns go straight into the table's sorted arrays.
+    """
+    # Imported here so runs without foreign-currency accounts never load pandas
+    import pandas as pd
+    if path.endswith(".parquet"):
+        frame = pd.read_parquet(path, columns=list(COLUMNS))
+    else:
+        frame = pd.read_csv(path, usecols=list(COLUMNS), dtype={"currency": str, "rate": np.float64})
+
+    days = pd.to_datetime(frame["date"]).to_numpy().astype("datetime64[D]").astype(np.int64) + _EPOCH_ORDINAL
+    currencies = frame["currency"].str.strip().str.upper().to_numpy(dtype=str)
+    rates = frame["rate"].to_numpy(dtype=np.float64)
+    if not np.all(rates > 0):
+        raise ValueError(f"{path}: rates must be positive")
+    return FxRateTable.from_columns(base, days, currencies, rates)
@@ -0,0 +1,79 @@
+import re
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Optional, Pattern, Tuple
+
+@dataclass(frozen=True)
+class LineRule:
+    """
+    name: Identifies the rule to the reader handling its matches.
+    pattern: Compiled once; decides whether the line really matches.
+    keywords: Lower-case substrings, one of which must appear in any line the pattern
+    can match. They only prefilter lines and never change what the pattern accepts.
+    find_all: Yield every match on the line instead of the first one.
+    wrap: Matches the start of an entry at the end of a line whose remainder (e.g.
+    the amount) is printed on the following lines; pattern is then tried on the
+    start joined with those lines.
+    """
+    name: str
+    pattern: Pattern[str]
+    keywords: Tuple[str, ...] = ()
+    find_all: bool = False
+    wrap: Optional[Pattern[str]] = None
+
+class LineClassifier:
+    """
+    Single-pass matcher shared by the statement readers.
+    Readers declare their rules once at class level; each line is first checked
+    against one combined keyword regex, so lines that no rule can match (the vast
+    majority of a statement) cost a single search.
+    """
+
+    def __init__(self, rules: Iterable[LineRule]):
+        self.rules = tuple(rules)
+        if all(rule.keywords for rule in self.rules):
+            keywords = sorted({k for rule in self.rules for k in rule.keywords}, key=len, reverse=True)
+            self._prefilter = re.compile("|".join(re.escape(k) for k in keywords), re.IGNORECASE)
+            # Every matchable line contains one of these, so readers can also use them to pick pages
+            self.keywords: Tuple[str, ...] = tuple(keywords)
+        else:
+            # A rule without keywords could match any line, so nothing can be skipped
+            self._prefilter = None
+            self.keywords = ()
+        self._wrapping = tuple(rule for rule in self.rules if rule.wrap is not None)
+
+    def matches(self, line: str) -> Iterator[Tuple[str, re.Match]]:
+        """Yields (rule name, match) for every rule matching the line, in rule order."""
+        if self._prefilter is not None and not self._prefilter.search(line):
+            return
+
+        lowered = line.lower()
+        for rule in self.rules:
+            if rule.keywords and not any(k in lowered for k in rule.keywords):
+                continue
+            if rule.find_all:
+                for match in rule.pattern.finditer(line):
+                    yield rule.name, match
+            else:
+                match = rule.pattern.search(line)
+                if match:
+                    yield rule.name, match
+
+    def wrapped(self, line: str, following: Iterable[str]) -> Iterator[Tuple[str, re.Match]]:
+        """
+        Yields (rule name, match) for entries that start at the end of line and end on
+        one of the following lines. The match is made on the lines joined by newlines,
+        as if the statement had been read as one text, so the pattern decides how many
+        of them (blank lines included) the entry spans.
+        """
+        following = tuple(following)
+        for rule in self._wrapping:
+            start = rule.wrap.search(line)
+            if not start:
+                continue
+            # The keyword may be on a following line, e.g. after a date printed on its own
+            text = "\n".join((start.group(0),) + following)
+            if rule.keywords and not any(k in text.lower() for k in rule.keywords):
+                continue
+            match = rule.pattern.match(text)
+            if match:
+                yield rule.name, match
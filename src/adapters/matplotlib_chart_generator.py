@@ -1,30 +1,94 @@
-import matplotlib.pyplot as plt
+import hashlib
+import json
+import os
+from importlib.metadata import version
 import numpy as np
-from typing import Dict, Tuple
-from src.ports.chart_generator import ChartGenerator
+from typing import Any, Dict, List, Tuple
+from src.ports.chart_generator import ChartGenerator, ChartRequest
+
+# Bump when the drawing code changes so charts rendered by older code are redrawn
+RENDER_VERSION = 3
+
+def _figure(figsize: Tuple[float, float], dpi: float):
+    """
+    Builds a Figure on the non-interactive Agg canvas. Imported on first render so
+    runs that skip charts never load matplotlib, and pyplot (with its global figure
+    manager) is not needed at all, so scheduled jobs never need a display.
+    """
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    fig = Figure(figsize=figsize, dpi=dpi)
+    FigureCanvasAgg(fig)
+    return fig
 
 class MatplotlibChartGenerator(ChartGenerator):
-    def generate_performance_chart(self, data: Dict[str, Tuple[float, float]], output_path: str):
+    """
+    Renders PNG charts with matplotlib.
+    Each chart gets a sidecar file (<output>.key) holding a hash of its data and
+    output settings; when the hash matches and the PNG exists, rendering is skipped.
+    """
+
+    def __init__(self, figsize: Tuple[float, float] = (10, 6), dpi: float = 100, cache: bool = True):
+        self.figsize = figsize
+        self.dpi = dpi
+        self.cache = cache
+
+    def generate_performance_chart(self, data: Dict[str, Tuple[float, float]], output_path: str) -> bool:
         """
         data: Dict where key=Name, value=(XIRR, SimpleReturn)
+        Returns False when an up-to-date chart was already there.
         """
+        return self.render_charts([ChartRequest("comparison", data, output_path)])[0]
+
+    def render_charts(self, requests: List[ChartRequest]) -> List[bool]:
+        """Renders every stale chart on a single reused figure."""
+        draw = {"comparison": self._draw_comparison, "account": self._draw_account, "history": self._draw_history,
+                "projection": self._draw_projection}
+        fig = None
+        rendered = []
+        for request in requests:
+            if request.kind not in draw:
+                raise ValueError(f"Unknown chart kind: {request.kind}")
+            key = self._key(request)
+            if self.cache and self._is_fresh(request.output_path, key):
+                rendered.append(False)
+                continue
+
+            if fig is None:
+                fig = _figure(self.figsize, self.dpi)
+            fig.clear()
+            ax = fig.add_subplot()
+            draw[request.kind](ax, request)
+            fig.tight_layout()
+            fig.savefig(request.output_path)
+            if self.cache:
+                with open(self._key_path(request.output_path), "w") as f:
+                    f.write(key)
+            rendered.append(True)
+        return rendered
+
+    def _draw_comparison(self, ax, request: ChartRequest):
+        data = request.data
         names = list(data.keys())
         xirr_vals = [v[0] * 100 for v in data.values()]
         simple_vals = [v[1] * 100 for v in data.values()]
-        
+
         x = np.arange(len(names))
         width = 0.35
-        
-        fig, ax = plt.subplots(figsize=(10, 6))
+
         rects1 = ax.bar(x - width/2, xirr_vals, width, label='Annualized (XIRR)', color='#3498db')
         rects2 = ax.bar(x + width/2, simple_vals, width, label='Total Return (Simple)', color='#2ecc71')
-        
+
         ax.set_ylabel('Percentage Return (%)')
-        ax.set_title('ISA Performance Comparison')
+        ax.set_title(request.title or 'ISA Performance Comparison')
         ax.set_xticks(x)
-        ax.set_xticklabels(names)
+        # Slant the names once there are too many accounts to fit side by side
+        if len(names) > 4:
+            ax.set_xticklabels(names, rotation=30, ha='right')
+        else:
+            ax.set_xticklabels(names)
         ax.legend()
-        
+
         ax.axhline(0, color='black', linewidth=0.8)
 
         def autolabel(rects):
@@ -39,6 +103,88 @@ class MatplotlibChartGenerator(ChartGenerator):
         autolabel(rects1)
         autolabel(rects2)
 
-        fig.tight_layout()
-        plt.savefig(output_path)
-        plt.close()
\ No newline at end of file
+    def _draw_account(self, ax, request: ChartRequest):
+        portfolio = request.data
+        store = portfolio.transactions
+        dates = [v.date for v in portfolio.valuations]
+        # Net money put in up to each valuation date (deposits are negative amounts)
+        net_invested = np.concatenate(([0.0], np.cumsum(-store.amounts)))
+        upto = np.searchsorted(store.days, [d.toordinal() for d in dates], side="right")
+
+        ax.plot(dates, [v.value for v in portfolio.valuations], label='Account value', color='#3498db', marker='o')
+        ax.step(dates, net_invested[upto], where='post', label='Net invested', color='#7f8c8d')
+        ax.set_ylabel(f'Value ({portfolio.currency})')
+        ax.set_title(request.title or portfolio.name)
+        ax.legend()
+        ax.grid(alpha=0.3)
+
+    def _draw_history(self, ax, request: ChartRequest):
+        for name, points in request.data.items():
+            ax.plot([d for d, _ in points], [self._rate(r) * 100 for _, r in points], label=name, marker='.')
+        ax.set_ylabel('Annualized (XIRR) %')
+        ax.set_title(request.title or 'XIRR over time')
+        ax.axhline(0, color='black', linewidth=0.8)
+        ax.legend()
+        ax.grid(alpha=0.3)
+
+    def _draw_projection(self, ax, request: ChartRequest):
+        projection = request.data
+        dates = projection.dates
+        percentiles = list(projection.percentiles)
+        # Shade from the outermost pair of percentiles inwards, darker towards the middle
+        pairs = list(zip(percentiles, reversed(percentiles)))[:len(percentiles) // 2]
+        for i, (low, high) in enumerate(pairs):
+            ax.fill_between(dates, projection.band(low), projection.band(high), color='#3498db',
+                            alpha=0.15 + 0.15 * i, linewidth=0, label=f'{low:g}th-{high:g}th percentile')
+        if len(percentiles) % 2:
+            middle = percentiles[len(percentiles) // 2]
+            ax.plot(dates, projection.band(middle), color='#2c3e50', label=f'{middle:g}th percentile')
+        ax.plot(dates, projection.bands[0, 0] + projection.contributed, color='#7f8c8d', linestyle='--',
+                label='Value today plus contributions')
+        ax.set_ylabel(f'Value ({projection.currency})')
+        ax.set_title(request.title or f'{projection.name}: {projection.paths:,} simulated paths')
+        ax.legend(loc='upper left')
+        ax.grid(alpha=0.3)
+
+    @staticmethod
+    def _rate(result: Any) -> float:
+        # History points may carry plain rates or XirrResult objects
+        return getattr(result, "rate", result)
+
+    def _key(self, request: ChartRequest) -> str:
+        digest = hashlib.sha256()
+        # The version comes from package metadata so a cache hit never imports matplotlib
+        settings = [RENDER_VERSION, version("matplotlib"), request.kind, request.title, list(self.figsize), self.dpi]
+        digest.update(json.dumps(settings).encode("utf-8"))
+
+        if request.kind == "account":
+            portfolio = request.data
+            digest.update(json.dumps([portfolio.name, portfolio.currency,
+                                      [[v.date.isoformat(), v.value] for v in portfolio.valuations]]).encode("utf-8"))
+            digest.update(portfolio.transactions.days.tobytes())
+            digest.update(portfolio.transactions.amounts.tobytes())
+        elif request.kind == "projection":
+            projection = request.data
+            digest.update(json.dumps([projection.name, projection.currency, projection.start.isoformat(),
+                                      list(projection.percentiles), projection.paths]).encode("utf-8"))
+            digest.update(np.ascontiguousarray(projection.bands).tobytes())
+            digest.update(projection.contributed.tobytes())
+        elif request.kind == "history":
+            points = [[name, [[d.isoformat(), self._rate(r)] for d, r in series]] for name, series in request.data.items()]
+            digest.update(json.dumps(points).encode("utf-8"))
+        else:
+            digest.update(json.dumps([[name, list(values)] for name, values in request.data.items()]).encode("utf-8"))
+        return digest.hexdigest()
+
+    @staticmethod
+    def _key_path(output_path: str) -> str:
+        return output_path + ".key"
+
+    def _is_fresh(self, output_path: str, key: str) -> bool:
+        if not os.path.exists(output_path):
+            return False
+        try:
+            with open(self._key_path(output_path)) as f:
+                return f.read() == key
+        except FileNotFoundError:
+            return False
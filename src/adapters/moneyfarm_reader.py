@@ -1,49 +1,72 @@
-import os
 import re
+from collections import deque
+from itertools import chain, islice
 from datetime import datetime, date
-from typing import List, Set, Optional, Tuple
-from src.domain.model import Transaction, Portfolio
-from src.ports.statement_reader import StatementReader
-from src.ports.pdf_extractor import PDFExtractor
+from typing import Deque, Iterator, List, Optional
+from src.domain.model import Transaction
+from src.adapters.pdf_statement_reader import PdfStatementReader, ParsedStatement
+from src.adapters.line_classifier import LineClassifier, LineRule
+from src.adapters.statement_classifier import Fingerprint
 
-class MoneyfarmReader(StatementReader):
-    def __init__(self, extractor: PDFExtractor):
-        self.extractor = extractor
+class MoneyfarmReader(PdfStatementReader):
+    portfolio_name = "Moneyfarm"
+    provider = "moneyfarm"
+    fingerprint = Fingerprint("quarterly statement", brand=("moneyfarm",),
+                              markers=("total account value", "total investments value"))
+    # 2: amounts in $ and € as well as £; 3: amounts wrapped onto the next line;
+    # 4: entries wrapped after a bare date or over blank lines
+    parser_version = 4
+    # The account value can sit a few lines below its label
+    value_lookahead = 5
 
-    def read_all(self, directory_path: str) -> Portfolio:
-        all_transactions: List[Transaction] = []
-        latest_value = 0.0
-        latest_date = date(1970, 1, 1)
-        seen_txs: Set[tuple] = set()
+    line_rules = LineClassifier([
+        # Moneyfarm has varied wording over the years
+        LineRule("account_value", re.compile(r"Total account value|Total investments value"),
+                 ("total account value", "total investments value")),
+        # Lines like: 2023-11-03 Bank input £2,000.00
+        # The entry may wrap over the following lines, blank ones included:
+        # 2023-11-03 Bank input / £2,000.00 or 2023-11-03 / Bank input £2,000.00
+        LineRule("transaction", re.compile(r"(\d{4}-\d{2}-\d{2})\s+(.*?)\s+([£$€])\s*([\d,]+(?:\.\d{2})?)"),
+                 ("input", "subscription", "withdrawal"), find_all=True,
+                 wrap=re.compile(r"\d{4}-\d{2}-\d{2}(?:\s+[^£$€]*)?$")),
+    ])
+    amount_pattern = re.compile(r"[£$€]?\s*([\d,]+\.\d{2})")
+    # Pages without any rule keyword (holdings, legal notices) are never extracted
+    page_keywords = line_rules.keywords
 
-        files = sorted([f for f in os.listdir(directory_path) if f.endswith(".pdf")])
-        
-        for filename in files:
-            file_path = os.path.join(directory_path, filename)
-            text_content = self.extractor.extract_text(file_path)
-            
-            # Identify the statement period end date from the filename
-            statement_date = self._get_date_from_filename(filename, fallback_date=latest_date)
-            
-            # Extract the total value of the account (cash + investments)
-            account_value = self._extract_account_value(text_content)
-            
-            if account_value is not None:
-                # Update latest value if this file represents a newer or same date
-                if statement_date >= latest_date:
-                    latest_date = statement_date
-                    latest_value = account_value
+    def _parse_pages(self, pages: Iterator[str]) -> ParsedStatement:
+        account_value: Optional[float] = None
+        transactions: List[Transaction] = []
+        # Sliding window over the line stream: window[0] is the line being parsed and
+        # the rest is the lookahead used to find an account value below its label
+        window: Deque[str] = deque()
+
+        for line in self._iter_lines(pages):
+            window.append(line)
+            if len(window) == self.value_lookahead:
+                account_value = self._scan_line(window, account_value, transactions)
+                window.popleft()
 
-            # Extract new transactions found in this file
-            new_transactions = self._extract_transactions(text_content)
-            for tx in new_transactions:
-                # Deduplicate based on date and amount (rounded to 2 decimal places)
-                tx_key = (tx.date, round(tx.amount, 2))
-                if tx_key not in seen_txs:
-                    all_transactions.append(tx)
-                    seen_txs.add(tx_key)
+        while window:
+            account_value = self._scan_line(window, account_value, transactions)
+            window.popleft()
 
-        return Portfolio("Moneyfarm", all_transactions, latest_value, latest_date)
+        return ParsedStatement(account_value, transactions)
+
+    def _scan_line(self, window: Deque[str], account_value: Optional[float],
+                   transactions: List[Transaction]) -> Optional[float]:
+        # Wrapped entries are completed from the lookahead lines
+        wrapped = self.line_rules.wrapped(window[0], islice(window, 1, None)) if len(window) > 1 else ()
+        for rule, match in chain(self.line_rules.matches(window[0]), wrapped):
+            if rule == "account_value":
+                # Extract the total value of the account (cash + investments); the first match wins
+                if account_value is None:
+                    account_value = self._extract_account_value(window)
+            else:
+                tx = self._parse_transaction_match(match)
+                if tx:
+                    transactions.append(tx)
+        return account_value
 
     def _get_date_from_filename(self, filename: str, fallback_date: date) -> date:
         """
@@ -66,51 +89,34 @@ class MoneyfarmReader(StatementReader):
                 return date(year, m, d)
         return fallback_date
 
-    def _extract_account_value(self, text: str) -> Optional[float]:
+    def _extract_account_value(self, window: Deque[str]) -> Optional[float]:
         """
-        Scans text for the Total Account Value.
-        Looks for 'Total account value' or 'Total investments value' followed by a monetary amount.
+        Reads the Total Account Value for a label found on window[0].
+        Looks in this line and the next few lines for the value, which handles
+        cases where the value is on a subsequent line.
         """
-        lines = text.split("\n")
-        for i, line in enumerate(lines):
-            # Moneyfarm has varied wording over the years
-            if "Total account value" in line or "Total investments value" in line:
-                # Look in this line and the next few lines for the value
-                # This handles cases where the value is on a subsequent line
-                chunk = " ".join(lines[i:i+5])
-                match = re.search(r"£?\s*([\d,]+\.\d{2})", chunk)
-                if match:
-                    return float(match.group(1).replace(",", ""))
+        match = self.amount_pattern.search(" ".join(window))
+        if match:
+            return float(match.group(1).replace(",", ""))
         return None
 
-    def _extract_transactions(self, text: str) -> List[Transaction]:
-        """Finds all valid transactions in the text block."""
-        transactions = []
-        # Regex to find lines like: 2023-11-03 Bank input £2,000.00
-        tx_pattern = re.compile(r"(\d{4}-\d{2}-\d{2})\s+(.*?)\s+£\s*([\d,]+(?:\.\d{2})?)")
-        
-        for match in tx_pattern.finditer(text):
-            tx = self._parse_transaction_match(match)
-            if tx:
-                transactions.append(tx)
-        return transactions
-
     def _parse_transaction_match(self, match: re.Match) -> Optional[Transaction]:
         """Converts a regex match object into a Transaction domain object."""
-        date_str, description, amount_str = match.groups()
+        date_str, description, symbol, amount_str = match.groups()
         try:
             tx_date = datetime.strptime(date_str, "%Y-%m-%d").date()
             amount = float(amount_str.replace(",", ""))
             desc_clean = description.strip()
+            desc_lower = desc_clean.lower()
             
             # We filter for specific external cash flow keywords
-            is_deposit = "input" in desc_clean.lower() or "subscription" in desc_clean.lower()
-            is_withdrawal = "withdrawal" in desc_clean.lower()
+            is_deposit = "input" in desc_lower or "subscription" in desc_lower
+            is_withdrawal = "withdrawal" in desc_lower
             
             if is_deposit or is_withdrawal:
                 # Deposits are negative for XIRR, Withdrawals are positive
                 final_amount = -amount if is_deposit else amount
-                return Transaction(tx_date, final_amount, desc_clean)
+                return Transaction(tx_date, final_amount, desc_clean, self._currency(symbol))
         except ValueError:
             pass
             
@@ -0,0 +1,126 @@
+import re
+from io import BytesIO
+from typing import Callable, Dict, Optional
+
+# Single-byte encodings whose codes map straight to text, so strings can be read from the raw content stream
+SIMPLE_ENCODINGS = {"WinAnsiEncoding": "cp1252", "StandardEncoding": "latin-1", "MacRomanEncoding": "mac-roman"}
+# Composite font encodings whose character codes are two-byte CIDs, read through the font's ToUnicode map
+IDENTITY_ENCODINGS = {"Identity-H", "Identity-V"}
+# Bumped whenever raw_page_text changes what it finds, so cached probe results are not reused
+PROBE_VERSION = 3
+# Literal (...) or hex <...> string operands ("<<" opens a dictionary, not a string), or a font selection (/F1 8 Tf)
+CONTENT_TOKEN = re.compile(rb"\(((?:\\.|[^\\)])*)\)|<(?!<)([0-9A-Fa-f\s]*)>|/([^\s/\[\]()<>{}%]+)\s+[-+]?[\d.]+\s+Tf\b",
+                           re.DOTALL)
+STRING_ESCAPE = re.compile(rb"\\([0-7]{1,3}|.)", re.DOTALL)
+STRING_ESCAPES = {b"n": b"\n", b"r": b"\r", b"t": b"\t", b"b": b"\b", b"f": b"\f"}
+# An XObject drawn by the page (/Fm0 Do)
+DRAW_XOBJECT = re.compile(rb"/([^\s/\[\]()<>{}%]+)\s+Do\b")
+NAME_ESCAPE = re.compile(r"#([0-9A-Fa-f]{2})")
+WHITESPACE = re.compile(r"\s+")
+
+def squash(text: str) -> str:
+    """Lower-cases and drops whitespace, since PDFs often position words instead of spacing them."""
+    return WHITESPACE.sub("", text).lower()
+
+def raw_page_text(page_obj) -> Optional[str]:
+    """
+    Concatenated string operands of a pdfminer PDFPage's content stream, read without
+    running the content interpreter. Good enough to search for keywords, not to parse.
+    Strings are decoded with the font selected for them, through its ToUnicode map
+    when it has one. Returns None when a font's codes cannot be decoded that way
+    (embedded encodings without ToUnicode, CID fonts with other encodings), when the
+    page draws form XObjects, whose text lives in their own streams, or when it has
+    no fonts, so its text (if any) cannot come from the page's own stream.
+    """
+    from pdfminer.pdftypes import resolve1
+    from pdfminer.psparser import PSLiteral
+    resources = resolve1(page_obj.resources) or {}
+    forms = set()
+    for name, xobject in (resolve1(resources.get("XObject")) or {}).items():
+        subtype = resolve1(xobject).get("Subtype")
+        if isinstance(subtype, PSLiteral) and subtype.name == "Form":
+            forms.add(name)
+    fonts = resolve1(resources.get("Font")) or {}
+    if not fonts:
+        return None
+    decoders: Dict[str, Callable[[bytes], str]] = {}
+    for name, font in fonts.items():
+        decoder = _font_decoder(resolve1(font))
+        if decoder is None:
+            return None
+        decoders[name] = decoder
+
+    data = b"".join(resolve1(stream).get_data() for stream in page_obj.contents)
+    if forms and any(_name(name) in forms for name in DRAW_XOBJECT.findall(data)):
+        return None
+    decode: Optional[Callable[[bytes], str]] = None
+    parts = []
+    for match in CONTENT_TOKEN.finditer(data):
+        font_name = match.group(3)
+        if font_name is not None:
+            decode = decoders.get(_name(font_name))
+            if decode is None:
+                return None
+        elif decode is None:
+            # Text shown before any Tf, e.g. with a font set through a graphics state
+            return None
+        else:
+            parts.append(decode(_string_bytes(match)))
+    return "".join(parts)
+
+def _font_decoder(font) -> Optional[Callable[[bytes], str]]:
+    from pdfminer.pdftypes import PDFStream, resolve1
+    from pdfminer.psparser import PSLiteral
+    encoding = resolve1(font.get("Encoding"))
+    encoding_name = encoding.name if isinstance(encoding, PSLiteral) else None
+    subtype = resolve1(font.get("Subtype"))
+    if isinstance(subtype, PSLiteral) and subtype.name == "Type0":
+        if encoding_name not in IDENTITY_ENCODINGS or "ToUnicode" not in font:
+            return None
+        width, codec = 2, None
+    else:
+        width, codec = 1, SIMPLE_ENCODINGS.get(encoding_name)
+        if "ToUnicode" not in font:
+            return None if codec is None else lambda data: data.decode(codec, errors="replace")
+
+    to_unicode = resolve1(font["ToUnicode"])
+    if not isinstance(to_unicode, PDFStream):
+        # A named CMap (e.g. /Identity-H) in place of a stream
+        return None
+    unicode_map = _unicode_map(to_unicode)
+
+    def decode(data: bytes) -> str:
+        chars = []
+        for offset in range(0, len(data) - width + 1, width):
+            code = int.from_bytes(data[offset:offset + width], "big")
+            char = unicode_map.get(code)
+            if char is None:
+                # Codes the map leaves out fall back to the font's encoding, as in the interpreter
+                char = bytes([code]).decode(codec, errors="replace") if codec else "\ufffd"
+            chars.append(char)
+        return "".join(chars)
+    return decode
+
+def _unicode_map(stream) -> Dict[int, str]:
+    from pdfminer.cmapdb import CMapParser, FileUnicodeMap
+    unicode_map = FileUnicodeMap()
+    CMapParser(unicode_map, BytesIO(stream.get_data())).run()
+    return unicode_map.cid2unichr
+
+def _name(name: bytes) -> str:
+    """A resource name as written in a content stream, with #xx escapes decoded."""
+    return NAME_ESCAPE.sub(lambda m: chr(int(m.group(1), 16)), name.decode("latin-1"))
+
+def _string_bytes(match: "re.Match[bytes]") -> bytes:
+    literal, hex_digits = match.group(1), match.group(2)
+    if literal is not None:
+        return STRING_ESCAPE.sub(_unescape, literal)
+    hex_digits = re.sub(rb"\s", b"", hex_digits)
+    # An odd final digit is padded with 0, as the PDF specification says
+    return bytes.fromhex((hex_digits + b"0" * (len(hex_digits) % 2)).decode("ascii"))
+
+def _unescape(match: "re.Match[bytes]") -> bytes:
+    escaped = match.group(1)
+    if escaped[:1].isdigit():
+        return bytes([int(escaped, 8) & 0xFF])
+    return STRING_ESCAPES.get(escaped, escaped)
@@ -1,9 +1,22 @@
-import pdfplumber
-from typing import List
-from src.ports.pdf_extractor import PDFExtractor
+import json
+from typing import List, Dict, Any, Iterator, Optional, Sequence
+from src.ports.pdf_extractor import PDFExtractor, PageContent
+from src.adapters.pdf_content_stream import raw_page_text, squash
 
 class PdfPlumberExtractor(PDFExtractor):
+    def __init__(self, text_settings: Optional[Dict[str, Any]] = None):
+        """
+        text_settings: Optional keyword arguments passed to pdfplumber's page.extract_text
+        (e.g. x_tolerance, y_tolerance).
+        """
+        self.text_settings = text_settings or {}
+
+    def settings_key(self) -> str:
+        return f"{type(self).__name__}:{json.dumps(self.text_settings, sort_keys=True)}"
+
     def extract_tables(self, file_path: str) -> List[List[List[str]]]:
+        # pdfplumber is imported on first use so runs served from the cache never load it
+        import pdfplumber
         tables = []
         with pdfplumber.open(file_path) as pdf:
             for page in pdf.pages:
@@ -13,8 +26,44 @@ class PdfPlumberExtractor(PDFExtractor):
         return tables
 
     def extract_text(self, file_path: str) -> str:
-        text = ""
+        return "".join(page_text + "\n" for page_text in self.iter_pages(file_path))
+
+    def iter_pages(self, file_path: str, pages: Optional[Sequence[int]] = None) -> Iterator[str]:
+        import pdfplumber
         with pdfplumber.open(file_path) as pdf:
-            for page in pdf.pages:
-                text += (page.extract_text() or "") + "\n"
-        return text
+            for index in range(len(pdf.pages)) if pages is None else pages:
+                page = pdf.pages[index]
+                yield page.extract_text(**self.text_settings) or ""
+                # Drop the parsed layout objects so memory stays bounded by one page
+                page.close()
+
+    def iter_document(self, file_path: str, pages: Optional[Sequence[int]] = None) -> Iterator[PageContent]:
+        # Text and table extraction share the page's parsed objects, so each page is parsed once
+        import pdfplumber
+        with pdfplumber.open(file_path) as pdf:
+            for index in range(len(pdf.pages)) if pages is None else pages:
+                page = pdf.pages[index]
+                yield PageContent(page.extract_text(**self.text_settings) or "", page.extract_tables())
+                page.close()
+
+    def page_count(self, file_path: str) -> Optional[int]:
+        import pdfplumber
+        with pdfplumber.open(file_path) as pdf:
+            return len(pdf.pages)
+
+    def probe_pages(self, file_path: str, keywords: Sequence[str]) -> Optional[List[int]]:
+        """
+        Reads string operands straight from each page's content stream, skipping
+        layout analysis entirely. Pages it cannot decode (see raw_page_text) are
+        selected rather than interpreted, since the read that follows extracts
+        them anyway.
+        """
+        import pdfplumber
+        needles = [squash(k) for k in keywords]
+        found = []
+        with pdfplumber.open(file_path) as pdf:
+            for index, page in enumerate(pdf.pages):
+                text = raw_page_text(page.page_obj)
+                if text is None or any(needle in squash(text) for needle in needles):
+                    found.append(index)
+        return found
@@ -0,0 +1,323 @@
+import heapq
+import logging
+import os
+import time
+from abc import abstractmethod
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date
+from operator import attrgetter
+from typing import Any, Dict, Iterator, List, Set, Optional, Tuple, Union
+from src.domain.model import DEFAULT_CURRENCY, Transaction, Portfolio, Valuation
+from src.ports.statement_reader import StatementReader
+from src.ports.pdf_extractor import PDFExtractor, PageContent, TablesNotSupportedError
+from src.adapters.caching_pdf_extractor import CachingPDFExtractor
+from src.adapters.statement_manifest import StatementManifest
+from src.adapters.sqlite_ledger import LedgerStatement, SqliteLedger
+from src.adapters.statement_classifier import NO_TEXT, NOT_PDF, Classification, Fingerprint, StatementClassifier
+from src.instrumentation import Instrumentation
+
+logger = logging.getLogger(__name__)
+
+# Currency symbols the readers recognise in front of amounts
+CURRENCY_SYMBOLS = {"£": "GBP", "$": "USD", "€": "EUR"}
+
+@dataclass
+class ParsedStatement:
+    account_value: Optional[float]
+    transactions: List[Transaction]
+    stats: Dict[str, Any] = field(default_factory=dict)  # Per-file metrics, empty when reused from a manifest
+
+class PdfStatementReader(StatementReader):
+    """
+    Shared ingestion flow for readers that parse one PDF statement per file.
+    Subclasses provide the portfolio name, the statement date parsing and the
+    per-statement text parsing; this class handles file discovery, optional
+    parallel and incremental extraction, deduplication and latest value selection.
+    """
+    portfolio_name = ""  # Default display name, overridable per account
+    provider = ""  # Key in the provider registry and in classifications
+    # How the provider's statements look on their first page, for StatementClassifier
+    fingerprint: Optional[Fingerprint] = None
+    # Bump when parsing changes so manifests written by older code are discarded
+    parser_version = 1
+    # Only pages containing one of these (per the extractor's cheap probe) are extracted;
+    # empty means every page is
+    page_keywords: Tuple[str, ...] = ()
+    # Readers that parse tables as well as text set this and override _parse_document
+    needs_tables = False
+
+    def __init__(self, extractor: PDFExtractor, workers: int = 1, manifest_path: Optional[str] = None,
+                 instrumentation: Optional[Instrumentation] = None, ledger: Optional[SqliteLedger] = None,
+                 name: Optional[str] = None, executor: Optional[Executor] = None, currency: Optional[str] = None,
+                 classifier: Optional[StatementClassifier] = None):
+        """
+        workers: Number of processes used to extract and parse statements.
+        1 (the default) reads files serially in the calling process.
+        manifest_path: Enables incremental ingestion. Parsed results are kept in this
+        JSON manifest and only new or changed statements are extracted on later runs.
+        instrumentation: Receives stage timings and per-file metrics.
+        ledger: Every read also records the parsed statements in this ledger.
+        name: Display name of the account, also its key in the ledger. Defaults to
+        portfolio_name, which only works while there is one account per provider.
+        executor: Process pool shared between readers, so many accounts reuse the same
+        workers instead of each read starting its own. Used when workers > 1.
+        currency: The account's currency, used for its values and for amounts printed
+        without a symbol. Amounts with a symbol keep the currency it stands for.
+        classifier: Checks each file's first page before it is extracted; files that are
+        another provider's statements or no statements at all are skipped, so several
+        providers' statements can share one folder.
+        """
+        if self.needs_tables and not extractor.supports_tables:
+            raise TablesNotSupportedError(extractor)
+        self.extractor = extractor
+        self.workers = workers
+        self.manifest_path = manifest_path
+        self.instrumentation = instrumentation or Instrumentation()
+        self.ledger = ledger
+        self.name = name or self.portfolio_name
+        self.executor = executor
+        self.currency = currency or DEFAULT_CURRENCY
+        self.classifier = classifier
+
+    def __getstate__(self):
+        # Worker processes report metrics through ParsedStatement.stats instead
+        state = self.__dict__.copy()
+        state["instrumentation"] = None
+        state["executor"] = None
+        # Files are classified before they are handed to workers
+        state["classifier"] = None
+        return state
+
+    def read_all(self, directory_path: str) -> Portfolio:
+        files = sorted([f for f in os.listdir(directory_path) if f.endswith(".pdf")])
+        return self.read_files([os.path.join(directory_path, f) for f in files], directory_path)
+
+    def read_files(self, file_paths: List[str], directory_path: str) -> Portfolio:
+        """
+        Reads the given statements; with a classifier, only this provider's among them.
+        directory_path is where they came from, which keys the ledger records.
+        """
+        if self.classifier is not None:
+            with self.instrumentation.stage("classify"):
+                file_paths = self._own_statements(file_paths)
+        file_paths = sorted(file_paths, key=os.path.basename)
+        files = [os.path.basename(path) for path in file_paths]
+
+        with self.instrumentation.stage("ingest"):
+            statements = self._read_statements(file_paths)
+        for path, statement in zip(file_paths, statements):
+            if statement.stats:
+                self.instrumentation.record_file(path, **statement.stats)
+
+        # Results come back in filename order regardless of how they were produced,
+        # so the merge is identical for the serial and parallel paths.
+        with self.instrumentation.stage("dedup"):
+            portfolio = self._merge(files, statements)
+
+        if self.ledger is not None:
+            with self.instrumentation.stage("ledger"):
+                dates = self._statement_dates(files, statements)
+                self.ledger.replace_statements(
+                    self.name, directory_path, self._parser_key(),
+                    [LedgerStatement(path, statement_date, statement.account_value, statement.transactions)
+                     for path, statement_date, statement in zip(file_paths, dates, statements)],
+                    currency=self.currency,
+                )
+        return portfolio
+
+    def _statement_dates(self, files: List[str], statements: List[ParsedStatement]) -> List[date]:
+        """
+        Resolves the date of each statement, in filename order. The fallback for an
+        undated filename is the latest date of an earlier statement with a value.
+        """
+        dates = []
+        latest_date = date(1970, 1, 1)
+        for filename, statement in zip(files, statements):
+            statement_date = self._get_date_from_filename(filename, fallback_date=latest_date)
+            if statement.account_value is not None and statement_date >= latest_date:
+                latest_date = statement_date
+            dates.append(statement_date)
+        return dates
+
+    def _merge(self, files: List[str], statements: List[ParsedStatement]) -> Portfolio:
+        """Combines per-statement results, in filename order, into a Portfolio."""
+        latest_value = 0.0
+        latest_date = date(1970, 1, 1)
+        valuations: Dict[date, Valuation] = {}
+
+        for statement_date, statement in zip(self._statement_dates(files, statements), statements):
+            if statement.account_value is not None:
+                # Later files win when two statements share a date, as for the latest value
+                valuations[statement_date] = Valuation(statement_date, statement.account_value)
+                # Update latest value if this file represents a newer or same date
+                if statement_date >= latest_date:
+                    latest_date = statement_date
+                    latest_value = statement.account_value
+
+        return Portfolio(self.name, list(self._merge_transactions(statements)), latest_value, latest_date,
+                         [valuations[d] for d in sorted(valuations)], self.currency)
+
+    @staticmethod
+    def _merge_transactions(statements: List[ParsedStatement]) -> Iterator[Transaction]:
+        """
+        Date-ordered, deduplicated transactions across statements.
+        Each statement's transactions are sorted by date (stably, so same-day entries
+        keep their order) and the streams are k-way merged. The merge is stable too,
+        so on any date the earlier statement's copy of a transaction comes first and
+        wins. Duplicates are identified by date, currency and amount (rounded to 2
+        decimal places), and as the output is date-ordered only the current day's keys need
+        remembering rather than the whole history.
+        """
+        by_date = attrgetter("date")
+        streams = [sorted(statement.transactions, key=by_date) for statement in statements]
+        current_date: Optional[date] = None
+        seen_amounts: Set[Tuple[float, str]] = set()
+        for tx in heapq.merge(*streams, key=by_date):
+            if tx.date != current_date:
+                current_date = tx.date
+                seen_amounts.clear()
+            amount_key = (round(tx.amount, 2), tx.currency)
+            if amount_key not in seen_amounts:
+                seen_amounts.add(amount_key)
+                yield tx
+
+    def _read_statements(self, file_paths: List[str]) -> List[ParsedStatement]:
+        if self.manifest_path is None:
+            return self._parse_files(file_paths)
+
+        manifest = StatementManifest(self.manifest_path, self._parser_key())
+        manifest.retain(file_paths)
+
+        statements: List[Optional[ParsedStatement]] = []
+        pending: List[int] = []
+        for i, path in enumerate(file_paths):
+            entry = manifest.lookup(path)
+            if entry is None:
+                statements.append(None)
+                pending.append(i)
+            else:
+                statements.append(ParsedStatement(entry["account_value"], StatementManifest.transactions_from_entry(entry)))
+                self.instrumentation.count("manifest_hits")
+
+        # Only the delta is extracted; everything else is rebuilt from the manifest,
+        # and the merge in read_all then deduplicates across old and new statements alike
+        parsed = self._parse_files([file_paths[i] for i in pending])
+        for i, statement in zip(pending, parsed):
+            statements[i] = statement
+            manifest.store(file_paths[i], statement.account_value, statement.transactions)
+
+        manifest.save()
+        return statements
+
+    def _parse_files(self, file_paths: List[str]) -> List[ParsedStatement]:
+        if self.workers <= 1 or len(file_paths) <= 1:
+            return [self._read_statement(path) for path in file_paths]
+
+        workers = min(self.workers, len(file_paths))
+        # Hand each process a handful of files at a time to amortise pickling the reader
+        chunksize = max(1, len(file_paths) // (workers * 4))
+        if self.executor is not None:
+            return list(self.executor.map(self._read_statement, file_paths, chunksize=chunksize))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(self._read_statement, file_paths, chunksize=chunksize))
+
+    def _read_statement(self, file_path: str) -> ParsedStatement:
+        """Extracts and parses a single statement. Runs in a worker process when parallel."""
+        stats = {"pages": 0, "lines": 0}
+        start = time.perf_counter()
+        # Cache lookups are counted here, as stats come back from worker processes but caches do not
+        cache = self.extractor.thread_stats() if isinstance(self.extractor, CachingPDFExtractor) else None
+        cache_before = (cache.hits, cache.misses) if cache is not None else None
+        selected = self._select_pages(file_path)
+        if self.needs_tables:
+            # Text and tables come from one pass over the document
+            pages = self.extractor.iter_document(file_path, selected)
+        elif selected is None:
+            pages = self.extractor.iter_pages(file_path)
+        else:
+            pages = self.extractor.iter_pages(file_path, selected)
+        try:
+            if self.needs_tables:
+                statement = self._parse_document(self._counted(pages, stats))
+            else:
+                statement = self._parse_pages(self._counted(pages, stats))
+        finally:
+            # Readers may stop early; closing the generator releases the open PDF
+            close = getattr(pages, "close", None)
+            if close is not None:
+                close()
+
+        stats["matches"] = len(statement.transactions) + (statement.account_value is not None)
+        stats["seconds"] = time.perf_counter() - start
+        if cache is not None:
+            stats["cache_hits"] = cache.hits - cache_before[0]
+            stats["cache_misses"] = cache.misses - cache_before[1]
+        statement.stats = stats
+        return statement
+
+    def _own_statements(self, file_paths: List[str]) -> List[str]:
+        """This provider's statements among file_paths, judged from their first page."""
+        own = []
+        for path in file_paths:
+            classification = self.classifier.classify(path)
+            # Without text on the first page nothing is known, so the file is read as before
+            if classification.provider == self.provider and classification.is_statement or classification.kind == NO_TEXT:
+                own.append(path)
+            else:
+                self.instrumentation.count("skipped_files")
+                # Another provider's statement is expected in a shared folder; anything else may be a misfiled statement
+                level = logging.INFO if classification.is_statement else logging.WARNING
+                logger.log(level, "Skipping %s for %s: %s", path, self.name, self._describe(classification))
+        self.classifier.save()
+        return own
+
+    @staticmethod
+    def _describe(classification: Classification) -> str:
+        if classification.is_statement:
+            return f"{classification.provider} {classification.kind}"
+        if classification.provider is not None:
+            return f"{classification.provider} document that is not a statement"
+        return "not a PDF" if classification.kind == NOT_PDF else "not a statement"
+
+    def _parser_key(self) -> str:
+        # Amounts without a symbol take the account currency, so it is part of the parse
+        return f"{type(self).__name__}:{self.parser_version}:{self.currency}"
+
+    def _currency(self, symbol: Optional[str]) -> str:
+        """ISO code for a symbol matched in front of an amount; the account currency when there was none."""
+        return CURRENCY_SYMBOLS[symbol] if symbol else self.currency
+
+    def _select_pages(self, file_path: str) -> Optional[List[int]]:
+        if not self.page_keywords:
+            return None
+        selected = self.extractor.probe_pages(file_path, self.page_keywords)
+        # Finding nothing more likely means the probe could not read the text than
+        # that the statement is empty, so read everything rather than nothing
+        return selected or None
+
+    @staticmethod
+    def _counted(pages: Iterator[Union[str, PageContent]], stats: Dict[str, Any]) -> Iterator[Union[str, PageContent]]:
+        for page in pages:
+            text = page if isinstance(page, str) else page.text
+            stats["pages"] += 1
+            stats["lines"] += text.count("\n") + 1
+            yield page
+
+    @staticmethod
+    def _iter_lines(pages: Iterator[str]) -> Iterator[str]:
+        for page in pages:
+            yield from page.split("\n")
+
+    def _parse_document(self, contents: Iterator[PageContent]) -> ParsedStatement:
+        """Parses a statement from per-page text and tables. Only used when needs_tables is set."""
+        return self._parse_pages(content.text for content in contents)
+
+    @abstractmethod
+    def _parse_pages(self, pages: Iterator[str]) -> ParsedStatement:
+        """Parses a statement from its page texts, consuming only as many pages as needed."""
+        pass
+
+    @abstractmethod
+    def _get_date_from_filename(self, filename: str, fallback_date: date) -> date:
+        pass
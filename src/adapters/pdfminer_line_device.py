@@ -0,0 +1,55 @@
+from typing import List, Tuple
+from pdfminer.pdfdevice import PDFTextDevice
+from pdfminer.pdffont import PDFUnicodeNotDefined
+
+class LineCollectingDevice(PDFTextDevice):
+    """
+    pdfminer device that records each glyph's baseline position and text and
+    nothing else. Skipping pdfminer's layout objects (LTChar bounding boxes, line
+    and box analysis) is where the fast extractor saves most of its time.
+    """
+
+    def __init__(self, rsrcmgr, x_tolerance: float = 3.0, y_tolerance: float = 3.0):
+        super().__init__(rsrcmgr)
+        self.x_tolerance = x_tolerance
+        self.y_tolerance = y_tolerance
+        self.glyphs: List[Tuple[float, float, float, str]] = []  # (baseline y, x, advance, text)
+
+    def begin_page(self, page, ctm):
+        super().begin_page(page, ctm)
+        self.glyphs = []
+
+    def render_char(self, matrix, font, fontsize, scaling, rise, cid, ncs, graphicstate) -> float:
+        advance = font.char_width(cid) * fontsize * scaling
+        try:
+            text = font.to_unichr(cid)
+        except PDFUnicodeNotDefined:
+            text = f"(cid:{cid})"
+        self.glyphs.append((matrix[5], matrix[4], advance, text))
+        return advance
+
+    def page_text(self) -> str:
+        """
+        Lines top to bottom, glyphs left to right. Words are separated by a single
+        space wherever there is a space glyph or a gap wider than x_tolerance, which
+        matches how pdfplumber's default text extraction spaces simple layouts.
+        """
+        lines: List[List[Tuple[float, float, float, str]]] = []
+        line_y = None
+        for glyph in sorted(self.glyphs, key=lambda g: -g[0]):
+            if line_y is None or line_y - glyph[0] > self.y_tolerance:
+                lines.append([])
+                line_y = glyph[0]
+            lines[-1].append(glyph)
+
+        texts = []
+        for line in lines:
+            parts = []
+            end = None
+            for _, x, advance, text in sorted(line, key=lambda g: g[1]):
+                if end is not None and x - end > self.x_tolerance:
+                    parts.append(" ")
+                parts.append(text)
+                end = x + advance
+            texts.append(" ".join("".join(parts).split()))
+        return "\n".join(text for text in texts if text)
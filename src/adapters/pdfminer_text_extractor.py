@@ -0,0 +1,62 @@
+import json
+from typing import List, Iterator, Optional, Sequence
+from src.ports.pdf_extractor import PDFExtractor, TablesNotSupportedError
+from src.adapters.pdf_content_stream import raw_page_text, squash
+
+class PdfMinerTextExtractor(PDFExtractor):
+    """
+    Throughput-oriented text extraction on pdfminer's content interpreter.
+    Glyphs are grouped into lines by baseline and into words by gaps, without
+    pdfminer or pdfplumber layout analysis. Reliable for statements laid out as
+    plain lines of text; use PdfPlumberExtractor where column layout matters.
+    Tables are not detected, so readers that need them cannot use this adapter.
+    """
+    supports_tables = False
+
+    def __init__(self, x_tolerance: float = 3.0, y_tolerance: float = 3.0):
+        self.x_tolerance = x_tolerance
+        self.y_tolerance = y_tolerance
+
+    def settings_key(self) -> str:
+        settings = {"x_tolerance": self.x_tolerance, "y_tolerance": self.y_tolerance}
+        return f"{type(self).__name__}:{json.dumps(settings, sort_keys=True)}"
+
+    def extract_tables(self, file_path: str) -> List[List[List[str]]]:
+        raise TablesNotSupportedError(self)
+
+    def extract_text(self, file_path: str) -> str:
+        return "".join(page_text + "\n" for page_text in self.iter_pages(file_path))
+
+    def iter_pages(self, file_path: str, pages: Optional[Sequence[int]] = None) -> Iterator[str]:
+        # pdfminer is imported on first use so runs served from the cache never load it
+        from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+        from pdfminer.pdfpage import PDFPage
+        from src.adapters.pdfminer_line_device import LineCollectingDevice
+        with open(file_path, "rb") as f:
+            all_pages = list(PDFPage.get_pages(f))
+            resources = PDFResourceManager(caching=True)
+            device = LineCollectingDevice(resources, self.x_tolerance, self.y_tolerance)
+            interpreter = PDFPageInterpreter(resources, device)
+            for index in range(len(all_pages)) if pages is None else pages:
+                interpreter.process_page(all_pages[index])
+                yield device.page_text()
+
+    def page_count(self, file_path: str) -> Optional[int]:
+        from pdfminer.pdfpage import PDFPage
+        with open(file_path, "rb") as f:
+            return sum(1 for _ in PDFPage.get_pages(f))
+
+    def probe_pages(self, file_path: str, keywords: Sequence[str]) -> Optional[List[int]]:
+        """
+        Keyword probe on the raw content stream. Pages it cannot decode are selected
+        rather than interpreted, since the read that follows interprets them anyway.
+        """
+        from pdfminer.pdfpage import PDFPage
+        needles = [squash(k) for k in keywords]
+        found = []
+        with open(file_path, "rb") as f:
+            for index, page in enumerate(PDFPage.get_pages(f)):
+                text = raw_page_text(page)
+                if text is None or any(needle in squash(text) for needle in needles):
+                    found.append(index)
+        return found
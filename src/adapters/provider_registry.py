@@ -0,0 +1,126 @@
+import json
+import os
+import re
+from dataclasses import dataclass, replace
+from typing import Any, Dict, List, Optional, Type
+from src.adapters.pdf_statement_reader import PdfStatementReader
+from src.adapters.moneyfarm_reader import MoneyfarmReader
+from src.adapters.interactive_investor_reader import InteractiveInvestorReader
+from src.adapters.pdf_plumber_extractor import PdfPlumberExtractor
+from src.adapters.pdfminer_text_extractor import PdfMinerTextExtractor
+from src.adapters.statement_classifier import StatementClassifier
+from src.domain.model import DEFAULT_CURRENCY
+from src.ports.pdf_extractor import PDFExtractor
+
+# Provider types that can appear in an accounts config
+PROVIDERS: Dict[str, Type[PdfStatementReader]] = {
+    "moneyfarm": MoneyfarmReader,
+    "interactive-investor": InteractiveInvestorReader,
+}
+
+# Text extraction adapters an account can choose: pdfplumber's layout-aware
+# extraction, or the much faster line-based pdfminer adapter for plain layouts
+EXTRACTORS: Dict[str, Type[PDFExtractor]] = {
+    "layout": PdfPlumberExtractor,
+    "fast": PdfMinerTextExtractor,
+}
+
+@dataclass
+class AccountConfig:
+    name: str  # Display name, unique across accounts
+    provider: str  # Key of PROVIDERS
+    directory: str  # Where the account's statements live
+    extractor: Optional[str] = None  # Key of EXTRACTORS; None uses the run's default
+    currency: str = DEFAULT_CURRENCY  # ISO 4217 code the account is held in
+
+    @property
+    def slug(self) -> str:
+        """File-name friendly form of the name, e.g. for per-account manifests."""
+        return slugify(self.name)
+
+def slugify(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+
+# Used when no config file is given
+DEFAULT_ACCOUNTS = [
+    AccountConfig("Moneyfarm", "moneyfarm", "statements/moneyfarm"),
+    AccountConfig("Interactive Investor", "interactive-investor", "statements/interactive-investor"),
+]
+
+def load_accounts(path: str) -> List[AccountConfig]:
+    """
+    Reads accounts from a JSON config:
+    {"accounts": [{"name": "Moneyfarm ISA", "provider": "moneyfarm", "directory": "statements/mf-isa"}, ...]}
+    Relative directories are resolved against the config file's location.
+    Optional per account: "extractor" and "currency" (e.g. "USD", default GBP).
+    """
+    with open(path) as f:
+        data = json.load(f)
+    base = os.path.dirname(os.path.abspath(path))
+    accounts = [
+        AccountConfig(entry["name"], entry["provider"], os.path.join(base, entry["directory"]), entry.get("extractor"),
+                      entry.get("currency", DEFAULT_CURRENCY))
+        for entry in data["accounts"]
+    ]
+    validate_accounts(accounts)
+    return accounts
+
+def accounts_for_tree(root: str, config_name: str = "accounts.json") -> List[AccountConfig]:
+    """
+    Accounts of one person's statements tree: its own accounts config when there is
+    one, otherwise whichever default provider folders (moneyfarm/, interactive-investor/) exist.
+    """
+    config = os.path.join(root, config_name)
+    if os.path.exists(config):
+        return load_accounts(config)
+    accounts = [replace(account, directory=os.path.join(root, os.path.basename(account.directory)))
+                for account in DEFAULT_ACCOUNTS]
+    accounts = [account for account in accounts if os.path.isdir(account.directory)]
+    if not accounts:
+        raise ValueError(f"{root} has neither {config_name} nor any of the default provider folders")
+    return accounts
+
+def validate_accounts(accounts: List[AccountConfig]):
+    names = set()
+    slugs: Dict[str, str] = {}
+    for account in accounts:
+        if account.provider not in PROVIDERS:
+            raise ValueError(f"Unknown provider '{account.provider}' for account '{account.name}', "
+                             f"expected one of: {', '.join(PROVIDERS)}")
+        if account.extractor is not None and account.extractor not in EXTRACTORS:
+            raise ValueError(f"Unknown extractor '{account.extractor}' for account '{account.name}', "
+                             f"expected one of: {', '.join(EXTRACTORS)}")
+        if account.extractor is not None and PROVIDERS[account.provider].needs_tables \
+                and not EXTRACTORS[account.extractor].supports_tables:
+            raise ValueError(f"Extractor '{account.extractor}' cannot read the tables that provider "
+                             f"'{account.provider}' needs, for account '{account.name}'")
+        if not re.fullmatch(r"[A-Z]{3}", account.currency):
+            raise ValueError(f"Invalid currency '{account.currency}' for account '{account.name}', "
+                             f"expected a three-letter code such as GBP or USD")
+        if account.name in names:
+            raise ValueError(f"Duplicate account name '{account.name}'")
+        names.add(account.name)
+        # The slug names the account's files (e.g. its manifest), so it must be unique too
+        if not account.slug:
+            raise ValueError(f"Account name '{account.name}' needs at least one letter or digit")
+        if account.slug in slugs:
+            raise ValueError(f"Account names '{slugs[account.slug]}' and '{account.name}' are too similar, "
+                             f"both are stored as '{account.slug}'")
+        slugs[account.slug] = account.name
+
+def build_classifier(extractor: Optional[PDFExtractor] = None, cache_path: Optional[str] = None) -> StatementClassifier:
+    """
+    Recognises every registered provider's statements from their first page. Only
+    one page per file is extracted, and only once per file content, so the fast
+    extractor is the default.
+    """
+    return StatementClassifier(extractor or PdfMinerTextExtractor(),
+                               {key: reader.fingerprint for key, reader in PROVIDERS.items()}, cache_path)
+
+def build_reader(account: AccountConfig, **reader_kwargs: Any) -> PdfStatementReader:
+    """
+    Instantiates the reader for an account. reader_kwargs (extractor, workers,
+    instrumentation, ledger, executor, ...) are passed to every reader, so all
+    accounts share the same extractor, cache and worker pool.
+    """
+    return PROVIDERS[account.provider](name=account.name, currency=account.currency, **reader_kwargs)
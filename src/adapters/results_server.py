@@ -0,0 +1,55 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Tuple
+
+class ResultsServer:
+    """
+    Serves the latest results as JSON on a background thread:
+    GET /results for the per-account numbers, GET /health for a liveness check.
+    Binds to localhost by default; the numbers are personal financial data.
+    """
+
+    def __init__(self, get_results: Callable[[], Dict[str, Any]], address: Tuple[str, int] = ("127.0.0.1", 8765)):
+        self.get_results = get_results
+        self._server = ThreadingHTTPServer(address, self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="results-server", daemon=True)
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self._server.server_address[:2]
+
+    def start(self):
+        self._thread.start()
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split("?", 1)[0].rstrip("/")
+                if path in ("", "/results", "/results.json"):
+                    self._send(200, server.get_results())
+                elif path == "/health":
+                    self._send(200, {"status": "ok"})
+                else:
+                    self._send(404, {"error": f"Unknown path {self.path}"})
+
+            def _send(self, status: int, body: Dict[str, Any]):
+                payload = json.dumps(body, indent=2).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                # Keep request logging out of the console output
+                pass
+
+        return Handler
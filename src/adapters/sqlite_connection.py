@@ -0,0 +1,49 @@
+import os
+import sqlite3
+import threading
+
+class SqliteConnectionMixin:
+    """
+    One SQLite connection per thread to a database file shared by readers on
+    several threads and processes. Subclasses call _init_connections with the
+    file path and create their tables in _create_schema, which runs on every new
+    connection.
+    """
+
+    def _init_connections(self, db_path: str):
+        self.db_path = db_path
+        self._local = threading.local()
+
+    def __getstate__(self):
+        # Connections cannot cross process boundaries; each process opens its own
+        state = self.__dict__.copy()
+        del state["_local"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._local = threading.local()
+
+    def close(self):
+        """Closes the calling thread's connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _connection(self) -> sqlite3.Connection:
+        # SQLite connections are bound to their thread; readers may run on several
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Parallel readers may share the file, so wait on locks rather than fail
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._create_schema(conn)
+            self._local.conn = conn
+        return conn
+
+    def _create_schema(self, conn: sqlite3.Connection):
+        pass
@@ -0,0 +1,213 @@
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Iterable, List, Optional, Tuple
+from src.domain.model import DEFAULT_CURRENCY, Transaction, Portfolio, Valuation
+from src.adapters.sqlite_connection import SqliteConnectionMixin
+from src.ports.statement_reader import StatementReader
+
+@dataclass
+class LedgerStatement:
+    """One ingested statement file and what was parsed from it."""
+    source_path: str
+    statement_date: date
+    account_value: Optional[float]
+    transactions: List[Transaction]
+
+class SqliteLedger(SqliteConnectionMixin):
+    """
+    Persistent store of everything parsed from statements.
+    Every statement keeps its source file (path, size, mtime, parser) and every
+    transaction points at the statement it came from, so duplicates repeated across
+    statements are kept as written and only collapsed at query time, the same way
+    the PDF readers deduplicate. Dates are ISO strings so ad-hoc SQL stays readable;
+    transactions are indexed by account and date, statements by source directory.
+    """
+
+    def __init__(self, db_path: str):
+        self._init_connections(db_path)
+
+    def replace_statements(self, account: str, source_dir: str, parser: str, statements: Iterable[LedgerStatement],
+                           currency: str = DEFAULT_CURRENCY):
+        """
+        Records the statements currently in source_dir for an account, replacing
+        whatever was ingested for it from that directory before (so deleted files
+        disappear). Other accounts sharing the directory, e.g. an inbox, are untouched.
+        Statements must be in reading order: the first copy of a duplicated
+        transaction is the one queries return.
+        currency: The account's currency, which its statement values are in.
+        """
+        source_dir = os.path.abspath(source_dir)
+        now = time.time()
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM transactions WHERE statement_id IN"
+                         " (SELECT id FROM statements WHERE source_dir = ? AND account = ?)", (source_dir, account))
+            conn.execute("DELETE FROM statements WHERE source_dir = ? AND account = ?", (source_dir, account))
+            for statement in statements:
+                stat = os.stat(statement.source_path)
+                cursor = conn.execute(
+                    "INSERT INTO statements (account, source_dir, source_path, size, mtime_ns, parser,"
+                    " ingested_at, statement_date, account_value, currency) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (account, source_dir, os.path.abspath(statement.source_path), stat.st_size, stat.st_mtime_ns,
+                     parser, now, statement.statement_date.isoformat(), statement.account_value, currency),
+                )
+                conn.executemany(
+                    "INSERT INTO transactions (statement_id, account, date, amount, description, currency)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    [(cursor.lastrowid, account, tx.date.isoformat(), tx.amount, tx.description, tx.currency)
+                     for tx in statement.transactions],
+                )
+
+    def transactions(self, account: Optional[str] = None, source_dir: Optional[str] = None,
+                     start: Optional[date] = None, end: Optional[date] = None) -> List[Transaction]:
+        """Deduplicated transactions dated within [start, end], sorted by date."""
+        where, params = self._filters(account, source_dir, "t.date", start, end)
+        # Same key as the readers: date, currency and amount to the penny, first statement wins
+        rows = self._connection().execute(
+            "SELECT t.date, t.amount, t.description, t.currency FROM transactions t WHERE t.id IN ("
+            " SELECT MIN(t.id) FROM transactions t JOIN statements s ON s.id = t.statement_id"
+            f" WHERE {where} GROUP BY t.account, t.date, t.currency, ROUND(t.amount, 2))"
+            " ORDER BY t.date, t.id",
+            params,
+        ).fetchall()
+        return [Transaction(date.fromisoformat(d), amount, description, currency)
+                for d, amount, description, currency in rows]
+
+    def valuations(self, account: Optional[str] = None, source_dir: Optional[str] = None,
+                   start: Optional[date] = None, end: Optional[date] = None) -> List[Valuation]:
+        """One valuation per statement date within [start, end]; the last statement read wins a tie."""
+        where, params = self._filters(account, source_dir, "s.statement_date", start, end)
+        rows = self._connection().execute(
+            "SELECT s.statement_date, s.account_value FROM statements s WHERE s.id IN ("
+            " SELECT MAX(s.id) FROM statements s"
+            f" WHERE {where} AND s.account_value IS NOT NULL GROUP BY s.account, s.statement_date)"
+            " ORDER BY s.statement_date",
+            params,
+        ).fetchall()
+        return [Valuation(date.fromisoformat(d), value) for d, value in rows]
+
+    def currency(self, account: str, source_dir: Optional[str] = None) -> str:
+        """Currency of the account's values, as recorded by its latest ingest."""
+        where, params = self._filters(account, source_dir, "s.statement_date", None, None)
+        row = self._connection().execute(
+            f"SELECT s.currency FROM statements s WHERE {where} ORDER BY s.id DESC LIMIT 1", params).fetchone()
+        return row[0] if row else DEFAULT_CURRENCY
+
+    def accounts(self, source_dir: Optional[str] = None) -> List[str]:
+        where, params = self._filters(None, source_dir, "s.statement_date", None, None)
+        rows = self._connection().execute(f"SELECT DISTINCT s.account FROM statements s WHERE {where} ORDER BY 1", params)
+        return [account for (account,) in rows]
+
+    def portfolio(self, account: str, source_dir: Optional[str] = None,
+                  start: Optional[date] = None, end: Optional[date] = None) -> Portfolio:
+        """
+        Builds a Portfolio from the ledger. The current value is the latest valuation
+        on or before end and only transactions up to that valuation count, so an end
+        date gives the portfolio as of that date. With a start date the account is
+        treated as bought at its last valuation on or before start: that value is an
+        opening deposit, followed by the transactions after it. Without such a
+        valuation the portfolio starts from nothing at start.
+        """
+        currency = self.currency(account, source_dir)
+        valuations = self.valuations(account, source_dir, None, end)
+        opening = None
+        if start is not None:
+            earlier = [v for v in valuations if v.date <= start]
+            if earlier:
+                opening = earlier[-1]
+                # Deposits on the opening date are already in its value
+                start = opening.date + timedelta(days=1)
+            valuations = [v for v in valuations if v.date >= (opening.date if opening else start)]
+
+        if valuations:
+            latest = valuations[-1]
+            end = latest.date
+        else:
+            latest = Valuation(date(1970, 1, 1), 0.0)
+        transactions = self.transactions(account, source_dir, start, end)
+        if opening is not None:
+            transactions.insert(0, Transaction(opening.date, -opening.value, "Opening value", currency))
+        return Portfolio(account, transactions, latest.value, latest.date, valuations, currency)
+
+    @staticmethod
+    def _filters(account: Optional[str], source_dir: Optional[str], date_column: str,
+                 start: Optional[date], end: Optional[date]) -> Tuple[str, list]:
+        clauses, params = ["1 = 1"], []
+        if account is not None:
+            clauses.append("s.account = ?")
+            params.append(account)
+        if source_dir is not None:
+            clauses.append("s.source_dir = ?")
+            params.append(os.path.abspath(source_dir))
+        if start is not None:
+            clauses.append(f"{date_column} >= ?")
+            params.append(start.isoformat())
+        if end is not None:
+            clauses.append(f"{date_column} <= ?")
+            params.append(end.isoformat())
+        return " AND ".join(clauses), params
+
+    def _create_schema(self, conn: sqlite3.Connection):
+        conn.executescript(
+            "CREATE TABLE IF NOT EXISTS statements ("
+            " id INTEGER PRIMARY KEY,"
+            " account TEXT NOT NULL,"
+            " source_dir TEXT NOT NULL,"
+            " source_path TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " mtime_ns INTEGER NOT NULL,"
+            " parser TEXT NOT NULL,"
+            " ingested_at REAL NOT NULL,"
+            " statement_date TEXT NOT NULL,"
+            " account_value REAL,"
+            " currency TEXT NOT NULL DEFAULT 'GBP');"
+            "CREATE TABLE IF NOT EXISTS transactions ("
+            " id INTEGER PRIMARY KEY,"
+            " statement_id INTEGER NOT NULL REFERENCES statements (id),"
+            " account TEXT NOT NULL,"
+            " date TEXT NOT NULL,"
+            " amount REAL NOT NULL,"
+            " description TEXT NOT NULL,"
+            " currency TEXT NOT NULL DEFAULT 'GBP');"
+            "CREATE INDEX IF NOT EXISTS idx_statements_source ON statements (source_dir);"
+            "CREATE INDEX IF NOT EXISTS idx_statements_account_date ON statements (account, statement_date);"
+            "CREATE INDEX IF NOT EXISTS idx_transactions_account_date ON transactions (account, date);"
+            "CREATE INDEX IF NOT EXISTS idx_transactions_statement ON transactions (statement_id);"
+        )
+        self._add_currency_columns(conn)
+
+    @staticmethod
+    def _add_currency_columns(conn: sqlite3.Connection):
+        # Ledgers created before amounts had currencies only ever held GBP
+        for table in ("statements", "transactions"):
+            columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+            if "currency" not in columns:
+                with conn:
+                    conn.execute(f"ALTER TABLE {table} ADD COLUMN currency TEXT NOT NULL DEFAULT 'GBP'")
+
+class LedgerStatementReader(StatementReader):
+    """
+    Reads portfolios back from a SqliteLedger instead of the PDFs, optionally
+    limited to a date range. read_all takes the statement directory the ledger
+    was filled from, so it can stand in for the PDF reader of that directory.
+    account: Which account to read when several share the directory; may be left
+    out when the directory holds only one.
+    """
+
+    def __init__(self, ledger: SqliteLedger, start: Optional[date] = None, end: Optional[date] = None,
+                 account: Optional[str] = None):
+        self.ledger = ledger
+        self.start = start
+        self.end = end
+        self.account = account
+
+    def read_all(self, directory_path: str) -> Portfolio:
+        if self.account is not None:
+            return self.ledger.portfolio(self.account, directory_path, self.start, self.end)
+        accounts = self.ledger.accounts(directory_path)
+        if len(accounts) != 1:
+            raise ValueError(f"Expected one account ingested from {directory_path}, found {len(accounts)}")
+        return self.ledger.portfolio(accounts[0], directory_path, self.start, self.end)
@@ -0,0 +1,140 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from src.adapters.file_fingerprint import file_sha256
+from src.adapters.pdf_content_stream import squash
+from src.json_io import atomic_write_json
+from src.ports.pdf_extractor import PDFExtractor
+
+logger = logging.getLogger(__name__)
+
+# Classification kinds that are not a provider's statement type
+NOT_PDF = "not-pdf"  # The bytes do not start like a PDF
+NO_TEXT = "no-text"  # The first page has no extractable text (e.g. a scan), so nothing can be said
+OTHER = "other"  # Readable, but no provider's statement
+
+CACHE_VERSION = 2
+HEADER_BYTES = 1024  # PDFs may have a little junk before %PDF-, which readers tolerate
+
+@dataclass(frozen=True)
+class Fingerprint:
+    """
+    How a provider's statements look on their first page.
+    brand: Lower-case phrases, any of which identifies the provider.
+    markers: Phrases, any of which marks the document as a statement of type kind
+    rather than another document from the same provider (contract note, tax pack).
+    They are looked for on the first page, then on the rest of the document.
+    Matching ignores case and whitespace.
+    """
+    kind: str
+    brand: Tuple[str, ...]
+    markers: Tuple[str, ...]
+
+@dataclass(frozen=True)
+class Classification:
+    provider: Optional[str]  # Key of the matching fingerprint; None when no brand matched
+    kind: str  # The fingerprint's kind when it is a statement, otherwise one of the constants above
+
+    @property
+    def is_statement(self) -> bool:
+        return self.provider is not None and self.kind != OTHER
+
+class StatementClassifier:
+    """
+    Tells which provider a PDF comes from, and whether it is a statement at all, from
+    its first page. Only when the page names a provider but holds none of its
+    statement markers are the other pages probed for them. Files that do not start
+    with a PDF header are rejected from their first bytes. Results are cached per
+    SHA-256 of the file, so a statement is classified once however often it is
+    moved, copied or re-read.
+    """
+
+    def __init__(self, extractor: PDFExtractor, fingerprints: Dict[str, Fingerprint], cache_path: Optional[str] = None):
+        """
+        fingerprints: Provider key -> Fingerprint, tried in order.
+        cache_path: JSON file keeping classifications between runs; None keeps them in memory.
+        """
+        self.extractor = extractor
+        self.fingerprints = fingerprints
+        self.cache_path = cache_path
+        # Entries made with other fingerprints are stale
+        self._version = hashlib.sha256(
+            json.dumps([CACHE_VERSION, [[k, f.kind, f.brand, f.markers] for k, f in fingerprints.items()]]).encode("utf-8")
+        ).hexdigest()[:16]
+        self._entries: Dict[str, List[Optional[str]]] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._squashed = {key: ([squash(b) for b in f.brand], [squash(m) for m in f.markers])
+                          for key, f in fingerprints.items()}
+        self._load()
+
+    def classify(self, file_path: str) -> Classification:
+        digest = file_sha256(file_path)
+        with self._lock:
+            cached = self._entries.get(digest)
+        if cached is not None:
+            return Classification(*cached)
+
+        classification = self._classify_first_page(file_path) if _looks_like_pdf(file_path) else Classification(None, NOT_PDF)
+        with self._lock:
+            self._entries[digest] = [classification.provider, classification.kind]
+            self._dirty = True
+        return classification
+
+    def save(self):
+        if self.cache_path is None:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            # Atomic so concurrent runs never read a truncated cache
+            atomic_write_json(self.cache_path, {"version": self._version, "files": self._entries})
+            self._dirty = False
+
+    def _classify_first_page(self, file_path: str) -> Classification:
+        pages = self.extractor.iter_pages(file_path, [0])
+        try:
+            text = squash(next(iter(pages), ""))
+        except Exception as e:
+            # An unreadable PDF is not a statement we could parse either
+            logger.info("Cannot read the first page of %s: %s", file_path, e)
+            return Classification(None, OTHER)
+        finally:
+            close = getattr(pages, "close", None)
+            if close is not None:
+                close()
+        if not text:
+            return Classification(None, NO_TEXT)
+
+        for provider, (brand, markers) in self._squashed.items():
+            if any(b in text for b in brand):
+                fingerprint = self.fingerprints[provider]
+                if any(m in text for m in markers) or self._markers_later(file_path, fingerprint):
+                    return Classification(provider, fingerprint.kind)
+                return Classification(provider, OTHER)
+        return Classification(None, OTHER)
+
+    def _markers_later(self, file_path: str, fingerprint: Fingerprint) -> bool:
+        """Whether a statement marker is on any page, e.g. after a cover page."""
+        pages = self.extractor.probe_pages(file_path, fingerprint.markers)
+        # An extractor that cannot probe gives no evidence either way, so the file is kept
+        return pages is None or len(pages) > 0
+
+    def _load(self):
+        if self.cache_path is None or not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path) as f:
+                data = json.load(f)
+        except ValueError:
+            return
+        if data.get("version") == self._version:
+            self._entries = data["files"]
+
+def _looks_like_pdf(file_path: str) -> bool:
+    with open(file_path, "rb") as f:
+        return b"%PDF-" in f.read(HEADER_BYTES)
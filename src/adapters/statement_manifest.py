@@ -0,0 +1,84 @@
+import json
+import os
+from datetime import date
+from typing import Dict, Any, Iterable, List, Optional
+from src.domain.model import Transaction
+from src.adapters.file_fingerprint import file_sha256
+from src.json_io import atomic_write_json
+
+MANIFEST_VERSION = 1
+
+class StatementManifest:
+    """
+    JSON record of statements that have already been ingested, together with what
+    was parsed from them. A file is reused when its size and mtime are unchanged,
+    or when they changed but its SHA-256 still matches (e.g. after a copy).
+    """
+
+    def __init__(self, path: str, reader_key: str):
+        """
+        reader_key: Identifies the reader that produced the stored results; entries
+        written by a different reader (or parser version) are ignored.
+        """
+        self.path = path
+        self.reader_key = reader_key
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        self._load()
+
+    def lookup(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """Returns the stored entry for an unchanged file, or None if it must be parsed."""
+        entry = self.entries.get(os.path.abspath(file_path))
+        if entry is None:
+            return None
+
+        stat = os.stat(file_path)
+        if entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            return entry
+
+        if entry["size"] != stat.st_size or entry["sha256"] != file_sha256(file_path):
+            return None
+
+        # Same bytes, new timestamp: remember the new stat so the next run skips hashing
+        entry["mtime_ns"] = stat.st_mtime_ns
+        self._dirty = True
+        return entry
+
+    def store(self, file_path: str, account_value: Optional[float], transactions: Iterable[Transaction]):
+        stat = os.stat(file_path)
+        self.entries[os.path.abspath(file_path)] = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": file_sha256(file_path),
+            "account_value": account_value,
+            "transactions": [[tx.date.isoformat(), tx.amount, tx.description, tx.currency] for tx in transactions],
+        }
+        self._dirty = True
+
+    def retain(self, file_paths: Iterable[str]):
+        """Forgets statements that are no longer present."""
+        keep = {os.path.abspath(p) for p in file_paths}
+        for key in [k for k in self.entries if k not in keep]:
+            del self.entries[key]
+            self._dirty = True
+
+    def save(self):
+        if not self._dirty:
+            return
+        # Atomic so an interrupted run never leaves a truncated manifest
+        atomic_write_json(self.path, {"version": MANIFEST_VERSION, "reader": self.reader_key, "files": self.entries})
+        self._dirty = False
+
+    @staticmethod
+    def transactions_from_entry(entry: Dict[str, Any]) -> List[Transaction]:
+        # Entries written before amounts had currencies have three fields
+        return [Transaction(date.fromisoformat(d), amount, description, *currency)
+                for d, amount, description, *currency in entry["transactions"]]
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path) as f:
+            data = json.load(f)
+        if data.get("version") == MANIFEST_VERSION and data.get("reader") == self.reader_key:
+            self.entries = data["files"]
@@ -0,0 +1,177 @@
+import glob
+import hashlib
+import logging
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from src.adapters.caching_pdf_extractor import CachingPDFExtractor
+from src.adapters.pdf_statement_reader import PdfStatementReader
+from src.adapters.provider_registry import EXTRACTORS, AccountConfig, accounts_for_tree, build_classifier, build_reader
+from src.domain.service import PerformanceService
+from src.instrumentation import Instrumentation
+from src.json_io import atomic_write_json
+from src.orchestration import evaluate, results_json
+from src.ports.pdf_extractor import PDFExtractor
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class BatchSettings:
+    """How every tree is read. Sent once to each worker process, so it must stay picklable."""
+    extractor: str = "layout"  # Key of EXTRACTORS for accounts that do not choose one
+    cache_path: Optional[str] = ".cache/extraction.sqlite"  # None extracts without a cache
+    state_dir: Optional[str] = None  # Enables incremental ingestion, one manifest per account under here
+    fx_rates_path: Optional[str] = None
+    currency: Optional[str] = None
+    twr: bool = False
+    detect: bool = False  # Recognise statements by their first page; see PdfStatementReader's classifier
+
+@dataclass
+class TreeResult:
+    root: str
+    accounts: Dict[str, Dict[str, Any]] = field(default_factory=dict)  # As in results_json
+    error: Optional[str] = None  # Why the tree could not be processed
+    seconds: float = 0.0
+
+def find_roots(patterns: Iterable[str]) -> List[str]:
+    """Statement roots named directly or by glob pattern, as sorted, unique absolute paths."""
+    roots = set()
+    for pattern in patterns:
+        matches = glob.glob(pattern) if glob.has_magic(pattern) else [pattern]
+        roots.update(os.path.abspath(m) for m in matches if os.path.isdir(m))
+    return sorted(roots)
+
+def shard(roots: List[str], index: int, count: int) -> List[str]:
+    """
+    This machine's share of the roots. Every machine lists the same sorted roots and
+    takes every count-th one from index, so shards never overlap and no coordination
+    is needed.
+    """
+    if not 0 <= index < count:
+        raise ValueError(f"Shard index {index} is outside 0..{count - 1}")
+    return roots[index::count]
+
+class TreeRunner:
+    """
+    Processes statement trees one at a time. Lives as long as its worker process, so
+    extractors (and their cache connections), exchange rates and readers are built
+    once and reused for every tree the worker is given.
+    """
+
+    def __init__(self, settings: BatchSettings):
+        self.settings = settings
+        fx_rates = None
+        if settings.fx_rates_path:
+            # Imported here so batches without exchange rates never load pandas
+            from src.adapters.fx_rate_file import load_fx_rates
+            fx_rates = load_fx_rates(settings.fx_rates_path)
+        self.service = PerformanceService(fx_rates=fx_rates, currency=settings.currency)
+        self.classifier = None
+        if settings.detect:
+            cache_path = os.path.join(os.path.dirname(settings.cache_path), "classification.json") if settings.cache_path else None
+            self.classifier = build_classifier(cache_path=cache_path)
+        self._extractors: Dict[str, PDFExtractor] = {}
+        self._readers: Dict[Tuple[str, str, str, str], PdfStatementReader] = {}
+
+    def run(self, root: str) -> TreeResult:
+        """Reads and evaluates every account of the tree; any failure is reported, not raised."""
+        start = time.perf_counter()
+        # Readers outlive the tree, so their per-file metrics start afresh for each one
+        instrumentation = Instrumentation()
+        try:
+            outcomes = [evaluate(self.service, account.name,
+                                 self._reader(root, account, instrumentation).read_all(account.directory),
+                                 twr=self.settings.twr)
+                        for account in accounts_for_tree(root)]
+            return TreeResult(root, results_json(outcomes), seconds=time.perf_counter() - start)
+        except Exception as e:
+            logger.error("Could not process %s", root, exc_info=True)
+            # The message travels back to the parent process, the exception object might not pickle
+            error = "".join(traceback.format_exception_only(type(e), e)).strip()
+            return TreeResult(root, error=error, seconds=time.perf_counter() - start)
+
+    def _reader(self, root: str, account: AccountConfig, instrumentation: Instrumentation) -> PdfStatementReader:
+        kind = account.extractor or self.settings.extractor
+        # Trees usually repeat the same few account names, so readers are shared across
+        # trees and only the manifest and instrumentation, which are per tree, are set for each read
+        key = (account.provider, account.name, kind, account.currency)
+        if key not in self._readers:
+            self._readers[key] = build_reader(account, extractor=self._extractor(kind), classifier=self.classifier)
+        reader = self._readers[key]
+        reader.manifest_path = self._manifest_path(root, account)
+        reader.instrumentation = instrumentation
+        return reader
+
+    def _extractor(self, kind: str) -> PDFExtractor:
+        if kind not in self._extractors:
+            extractor = EXTRACTORS[kind]()
+            if self.settings.cache_path:
+                extractor = CachingPDFExtractor(extractor, self.settings.cache_path)
+            self._extractors[kind] = extractor
+        return self._extractors[kind]
+
+    def _manifest_path(self, root: str, account: AccountConfig) -> Optional[str]:
+        if self.settings.state_dir is None:
+            return None
+        # Trees are told apart by path, since people's folders often share names
+        tree = hashlib.sha1(root.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.settings.state_dir, tree, f"{account.slug}.manifest.json")
+
+# The worker process's runner, created by the pool initializer
+_runner: Optional[TreeRunner] = None
+
+def _init_worker(settings: BatchSettings):
+    global _runner
+    _runner = TreeRunner(settings)
+
+def _run_tree(root: str) -> TreeResult:
+    return _runner.run(root)
+
+def run_batch(roots: List[str], settings: BatchSettings, workers: int = 1) -> List[TreeResult]:
+    """
+    Processes every root, in parallel over `workers` long-lived processes, and returns
+    the results in root order. Trees are independent: a failing tree is reported in
+    its result and the rest carry on.
+    """
+    if workers <= 1 or len(roots) <= 1:
+        runner = TreeRunner(settings)
+        return [runner.run(root) for root in roots]
+
+    # Largest trees first, so a big one picked up last does not leave the other workers idle
+    ordered = sorted(roots, key=_statement_count, reverse=True)
+    results: Dict[str, TreeResult] = {}
+    with ProcessPoolExecutor(max_workers=min(workers, len(roots)), initializer=_init_worker,
+                             initargs=(settings,)) as pool:
+        futures = {pool.submit(_run_tree, root): root for root in ordered}
+        for future in as_completed(futures):
+            root = futures[future]
+            try:
+                results[root] = future.result()
+            except BrokenProcessPool as e:
+                # A worker died (e.g. out of memory); the trees it had not finished are lost
+                results[root] = TreeResult(root, error=f"Worker process failed: {e}")
+    return [results[root] for root in roots]
+
+def _statement_count(root: str) -> int:
+    count = 0
+    for directory, _, files in os.walk(root):
+        count += sum(1 for f in files if f.endswith(".pdf"))
+    return count
+
+def batch_json(results: List[TreeResult], shard_index: int = 0, shard_count: int = 1) -> Dict[str, Any]:
+    return {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "shard": {"index": shard_index, "count": shard_count},
+        "trees": {
+            result.root: {"accounts": result.accounts, "error": result.error, "seconds": round(result.seconds, 3)}
+            for result in results
+        },
+    }
+
+def write_batch_results(results: List[TreeResult], path: str, shard_index: int = 0, shard_count: int = 1):
+    atomic_write_json(path, batch_json(results, shard_index, shard_count), indent=2)
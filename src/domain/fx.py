@@ -0,0 +1,95 @@
+from dataclasses import replace
+from datetime import date
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from src.domain.model import Portfolio, Valuation
+from src.domain.transaction_store import TransactionStore
+
+class FxRateTable:
+    """
+    Daily exchange rates against one base currency, e.g. GBP.
+    rate is the base-currency value of one unit of the currency on that day. Each
+    currency's rates are kept as sorted day-ordinal and rate arrays, so converting a
+    whole history is one binary search per currency: an as-of lookup that uses the
+    latest rate on or before each date (weekends and holidays take Friday's rate).
+    """
+
+    def __init__(self, base: str, series: Dict[str, Tuple[np.ndarray, np.ndarray]]):
+        """series: Currency -> (day ordinals, rates), both sorted by day."""
+        self.base = base
+        self._series = series
+
+    @classmethod
+    def from_columns(cls, base: str, days: np.ndarray, currencies: np.ndarray, rates: np.ndarray) -> "FxRateTable":
+        """Builds the index from unsorted rows, one per currency and day."""
+        days = np.asarray(days, dtype=np.int64)
+        currencies = np.asarray(currencies)
+        rates = np.asarray(rates, dtype=np.float64)
+        # One sort groups the rows by currency and orders each group by day
+        order = np.lexsort((days, currencies))
+        days, currencies, rates = days[order], currencies[order], rates[order]
+        codes, starts = np.unique(currencies, return_index=True)
+        ends = np.append(starts[1:], len(days))
+        series = {str(code): (days[start:end], rates[start:end]) for code, start, end in zip(codes, starts, ends)}
+        return cls(base, series)
+
+    @property
+    def currencies(self) -> List[str]:
+        return sorted({self.base, *self._series})
+
+    def rates(self, currency: str, days: np.ndarray) -> np.ndarray:
+        """Base-currency value of one unit of currency as of each day."""
+        days = np.asarray(days, dtype=np.int64)
+        if currency == self.base:
+            return np.ones(len(days))
+        if currency not in self._series:
+            raise ValueError(f"No {currency} rates against {self.base}")
+        rate_days, rates = self._series[currency]
+        index = np.searchsorted(rate_days, days, side="right") - 1
+        if len(index) and index.min() < 0:
+            raise ValueError(f"No {currency} rate on or before {_iso(days[index < 0].min())}; "
+                             f"{currency} rates start on {_iso(rate_days[0])}")
+        return rates[index]
+
+    def convert(self, amounts: np.ndarray, days: np.ndarray, source: str, target: str) -> np.ndarray:
+        """Converts amounts dated on days from source to target, through the base currency."""
+        if source == target:
+            return np.asarray(amounts, dtype=np.float64)
+        converted = np.asarray(amounts, dtype=np.float64) * self.rates(source, days)
+        if target != self.base:
+            converted = converted / self.rates(target, days)
+        return converted
+
+    def convert_store(self, store: TransactionStore, target: str) -> TransactionStore:
+        """Every transaction in target currency, converted at its own date."""
+        amounts = store.amounts.copy()
+        for currency_id in np.unique(store.currency_ids):
+            currency = store.currencies[currency_id]
+            if currency != target:
+                mask = store.currency_ids == currency_id
+                amounts[mask] = self.convert(store.amounts[mask], store.days[mask], currency, target)
+        return store.with_amounts(amounts, target)
+
+    def normalise(self, portfolio: Portfolio, target: Optional[str] = None) -> Portfolio:
+        """
+        The portfolio with transactions, valuations and current value all in target
+        (the base currency by default), so money-weighted returns mix like with like.
+        """
+        target = target or self.base
+        store = portfolio.transactions
+        if portfolio.currency == target and store.in_currency(target):
+            return portfolio
+
+        valuations: Sequence[Valuation] = portfolio.valuations
+        current_value = portfolio.current_value
+        if portfolio.currency != target:
+            days = np.array([v.date.toordinal() for v in valuations] + [portfolio.current_date.toordinal()])
+            values = self.convert(np.array([v.value for v in valuations] + [current_value]), days,
+                                  portfolio.currency, target)
+            valuations = [Valuation(v.date, float(value)) for v, value in zip(valuations, values[:-1])]
+            current_value = float(values[-1])
+        return replace(portfolio, transactions=self.convert_store(store, target), current_value=current_value,
+                       valuations=list(valuations), currency=target)
+
+def _iso(day: int) -> str:
+    return date.fromordinal(int(day)).isoformat()
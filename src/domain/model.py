@@ -1,16 +1,33 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import date
-from typing import List, Optional
+from typing import List, Optional, Sequence
 
-@dataclass(frozen=True)
+# Currency of accounts and amounts that do not say otherwise
+DEFAULT_CURRENCY = "GBP"
+
+@dataclass(frozen=True, slots=True)
 class Transaction:
     date: date
     amount: float  # Negative for deposits/subscriptions, Positive for withdrawals
     description: str
+    currency: str = DEFAULT_CURRENCY  # ISO 4217 code of amount
+
+@dataclass(frozen=True)
+class Valuation:
+    date: date
+    value: float  # Total account value reported by a statement
 
 @dataclass
 class Portfolio:
     name: str
-    transactions: List[Transaction]
+    transactions: Sequence[Transaction]  # Stored as a date-sorted TransactionStore
     current_value: float
     current_date: date
+    valuations: List[Valuation] = field(default_factory=list)  # One per statement, sorted by date
+    currency: str = DEFAULT_CURRENCY  # Of current_value and the valuations; transactions carry their own
+
+    def __post_init__(self):
+        # Imported here because the store builds on Transaction
+        from src.domain.transaction_store import TransactionStore
+        if not isinstance(self.transactions, TransactionStore):
+            self.transactions = TransactionStore.from_transactions(self.transactions)
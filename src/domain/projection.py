@@ -0,0 +1,143 @@
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import List, Optional, Sequence, Union
+import numpy as np
+from src.domain.model import DEFAULT_CURRENCY, Portfolio
+from src.domain.xirr import DAYS_PER_YEAR
+
+MONTHS_PER_YEAR = 12
+DAYS_PER_MONTH = DAYS_PER_YEAR / MONTHS_PER_YEAR
+
+# Contribution intervals (in months) that fit a whole number of times into a year
+_INTERVALS = np.array([1, 2, 3, 4, 6, 12])
+
+@dataclass(frozen=True)
+class ContributionSchedule:
+    amount: float  # Paid in every interval; negative for regular withdrawals
+    every_months: int  # 1 = monthly, 3 = quarterly, 12 = yearly
+
+    @property
+    def per_year(self) -> float:
+        return self.amount * (MONTHS_PER_YEAR // self.every_months)
+
+    def monthly_flows(self, months: int) -> np.ndarray:
+        """Amount paid in at the end of each simulated month."""
+        flows = np.zeros(months)
+        flows[self.every_months - 1::self.every_months] = self.amount
+        return flows
+
+def contribution_schedule(portfolio: Portfolio, lookback_years: float = 1.0) -> ContributionSchedule:
+    """
+    Continues the account's recent saving habit: the net amount paid in over the last
+    lookback_years (deposits minus withdrawals), spread over the cadence the deposits
+    arrived at, e.g. monthly direct debits or a quarterly top-up.
+    """
+    store = portfolio.transactions
+    end = portfolio.current_date.toordinal()
+    recent = store.between(portfolio.current_date - timedelta(days=round(lookback_years * DAYS_PER_YEAR)),
+                           portfolio.current_date)
+    if len(recent) == 0:
+        return ContributionSchedule(0.0, MONTHS_PER_YEAR)
+
+    # Accounts younger than the lookback are averaged over the time they have existed,
+    # counting the month the first deposit paid for
+    span_years = min(lookback_years, (end - int(store.days[0]) + DAYS_PER_MONTH) / DAYS_PER_YEAR)
+    per_year = -float(recent.amounts.sum()) / span_years
+
+    deposit_days = np.unique(recent.days[recent.amounts < 0])
+    if deposit_days.size > 1:
+        gap_months = float(np.median(np.diff(deposit_days))) / DAYS_PER_MONTH
+        # Snap to the nearest interval that divides the year
+        every = int(_INTERVALS[np.argmin(np.abs(_INTERVALS - gap_months))])
+    else:
+        every = MONTHS_PER_YEAR
+    return ContributionSchedule(per_year * every / MONTHS_PER_YEAR, every)
+
+@dataclass
+class ProjectionResult:
+    """
+    Distribution of the simulated account value at each year end.
+    bands[i, y] is the percentiles[i] value after y years (year 0 is today's value);
+    contributed[y] is the net amount paid in by then, which is the same on every path.
+    Values are in currency, the projected portfolio's.
+    """
+    name: str
+    start: date
+    percentiles: Sequence[float]
+    years: np.ndarray
+    bands: np.ndarray
+    contributed: np.ndarray
+    paths: int
+    currency: str = DEFAULT_CURRENCY
+
+    def band(self, percentile: float) -> np.ndarray:
+        return self.bands[list(self.percentiles).index(percentile)]
+
+    @property
+    def dates(self) -> List[date]:
+        return [_add_years(self.start, int(y)) for y in self.years]
+
+def _add_years(day: date, years: int) -> date:
+    # 29 February becomes 28 February in years that are not leap years
+    try:
+        return day.replace(year=day.year + years)
+    except ValueError:
+        return day.replace(year=day.year + years, day=28)
+
+def project(portfolio: Portfolio, annual_return: float, volatility: float, years: int = 30,
+            paths: int = 100_000, schedule: Optional[ContributionSchedule] = None,
+            rng: Union[None, int, np.random.Generator] = None, chunk_size: int = 8192,
+            percentiles: Sequence[float] = (5, 25, 50, 75, 95)) -> ProjectionResult:
+    """
+    Monte Carlo projection of the account value with monthly log-normal returns.
+    annual_return: Median yearly growth, e.g. the account's historical XIRR.
+    volatility: Standard deviation of the yearly log return.
+    schedule: Future contributions; derived from the transaction history when None.
+    rng: Seed or Generator. Paths are drawn chunk by chunk from it, so results are
+        reproducible for a given seed and chunk_size.
+    chunk_size: Paths simulated at once; memory stays around 3 * chunk_size * 12 * years floats.
+    """
+    if schedule is None:
+        schedule = contribution_schedule(portfolio)
+    rng = np.random.default_rng(rng)
+    months = years * MONTHS_PER_YEAR
+    drift = np.log1p(annual_return) / MONTHS_PER_YEAR
+    sigma = volatility / np.sqrt(MONTHS_PER_YEAR)
+    flows = schedule.monthly_flows(months)
+    year_ends = np.arange(MONTHS_PER_YEAR - 1, months, MONTHS_PER_YEAR)
+
+    # Only the year-end values of every path are kept
+    values = np.empty((paths, years + 1))
+    values[:, 0] = portfolio.current_value
+    for start in range(0, paths, chunk_size):
+        n = min(chunk_size, paths - start)
+        values[start:start + n, 1:] = _simulate_chunk(rng, n, portfolio.current_value, flows, drift, sigma, year_ends)
+
+    return ProjectionResult(
+        name=portfolio.name,
+        start=portfolio.current_date,
+        percentiles=tuple(percentiles),
+        years=np.arange(years + 1),
+        bands=np.percentile(values, percentiles, axis=0),
+        contributed=np.concatenate(([0.0], np.cumsum(flows)[year_ends])),
+        paths=paths,
+        currency=portfolio.currency,
+    )
+
+def _simulate_chunk(rng: np.random.Generator, n: int, start_value: float, flows: np.ndarray,
+                    drift: float, sigma: float, checkpoints: np.ndarray) -> np.ndarray:
+    """
+    Values at the checkpoint months for n paths, without stepping month by month.
+    With growth G_t = R_1 * ... * R_t, the recurrence V_t = V_(t-1) * R_t + c_t
+    unrolls to V_t = G_t * (V_0 + sum_(s<=t) c_s / G_s), i.e. two cumulative sums.
+    """
+    log_growth = rng.standard_normal((n, flows.size))
+    log_growth *= sigma
+    log_growth += drift
+    np.cumsum(log_growth, axis=1, out=log_growth)
+
+    discounted = np.exp(-log_growth)
+    discounted *= flows
+    np.cumsum(discounted, axis=1, out=discounted)
+    discounted += start_value
+    return np.exp(log_growth[:, checkpoints]) * discounted[:, checkpoints]
@@ -1,30 +1,137 @@
+import logging
 from datetime import date
-from typing import List
+from typing import List, Optional, Tuple
+import numpy as np
 from src.domain.model import Transaction, Portfolio
-from scipy.optimize import newton
+from src.domain.fx import FxRateTable
+from src.domain.twr import TwrResult, time_weighted_return
+from src.domain.xirr import DAYS_PER_YEAR, XirrResult, solve_xirr, solve_xirr_batch, solve_xirr_years
+from src.instrumentation import Instrumentation
+
+logger = logging.getLogger(__name__)
 
 class PerformanceService:
+    def __init__(self, instrumentation: Optional[Instrumentation] = None, fx_rates: Optional[FxRateTable] = None,
+                 currency: Optional[str] = None):
+        """
+        instrumentation: Receives solve and solver iteration counts.
+        fx_rates: Used by normalise to convert accounts with foreign-currency flows.
+        currency: Currency results are reported in; defaults to the rate table's base.
+        """
+        self.instrumentation = instrumentation or Instrumentation()
+        self.fx_rates = fx_rates
+        self.currency = currency
+
+    def normalise(self, portfolio: Portfolio) -> Portfolio:
+        """
+        Converts a portfolio into the reporting currency before any return is calculated.
+        Portfolios already entirely in that currency are returned unchanged.
+        """
+        target = self.currency or (self.fx_rates.base if self.fx_rates is not None else portfolio.currency)
+        if portfolio.currency == target and portfolio.transactions.in_currency(target):
+            return portfolio
+        if self.fx_rates is None:
+            store = portfolio.transactions
+            used = {store.currencies[i] for i in np.unique(store.currency_ids)}
+            found = sorted(({portfolio.currency} | used) - {target})
+            raise ValueError(f"{portfolio.name} has amounts in {', '.join(found)}; "
+                             f"exchange rates are needed to report in {target}")
+        self.instrumentation.count("fx_conversions")
+        return self.fx_rates.normalise(portfolio, target)
+
     def calculate_xirr(self, portfolio: Portfolio) -> float:
-        cash_flows = []
-        for tx in portfolio.transactions:
-            cash_flows.append((tx.date, tx.amount))
-        
-        cash_flows.append((portfolio.current_date, portfolio.current_value))
-        
-        if not cash_flows or len(cash_flows) < 2:
+        """
+        Annualised money-weighted return as a decimal.
+        Returns 0.0 when there are not enough cash flows and NaN if the solver
+        could not find a rate; use calculate_xirr_result for the solver details.
+        """
+        if not portfolio.transactions:
             return 0.0
 
-        print(f"DEBUG: XIRR Cashflows for {portfolio.name}: {cash_flows}")
+        result = self.calculate_xirr_result(portfolio)
+        if not result.converged:
+            logger.warning("XIRR did not converge for %s after %d iterations", portfolio.name, result.iterations)
+        return result.rate
 
-        def xnpv(rate, flows):
-            d0 = flows[0][0]
-            return sum([f / (1 + rate)**((d - d0).days / 365.25) for d, f in flows])
+    def calculate_xirr_result(self, portfolio: Portfolio) -> XirrResult:
+        days, amounts = self._cash_flow_arrays(portfolio)
 
-        try:
-            # We want to find the rate where XNPV = 0
-            return newton(lambda r: xnpv(r, cash_flows), 0.1)
-        except (RuntimeError, OverflowError):
-            return 0.0
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("XIRR cash flows for %s: %s", portfolio.name, list(zip(days.tolist(), amounts.tolist())))
+
+        return self._record(solve_xirr(days, amounts))
+
+    def calculate_xirr_batch(self, portfolios: List[Portfolio]) -> List[XirrResult]:
+        """Solves XIRR for many portfolios (e.g. accounts or what-if scenarios) in one vectorized call."""
+        return [self._record(r) for r in solve_xirr_batch([self._cash_flow_arrays(p) for p in portfolios])]
+
+    def _record(self, result: XirrResult) -> XirrResult:
+        self.instrumentation.count("xirr_solves")
+        self.instrumentation.count("solver_iterations", result.iterations)
+        return result
+
+    def calculate_xirr_series(self, portfolio: Portfolio) -> List[Tuple[date, XirrResult]]:
+        """
+        Money-weighted return as of every statement valuation: the flows up to each
+        valuation date plus that statement's value as the closing flow.
+        Dates are converted to years once and each point solves on a prefix slice,
+        warm-started from the previous point's rate.
+        """
+        if not portfolio.valuations:
+            return []
+
+        # Portfolio keeps transactions as a date-sorted TransactionStore
+        tx_days = portfolio.transactions.days.astype(np.int64)
+        tx_amounts = portfolio.transactions.amounts
+
+        valuation_days = np.array([v.date.toordinal() for v in portfolio.valuations], dtype=np.int64)
+        origin = min(tx_days[0], valuation_days[0]) if len(tx_days) else valuation_days[0]
+        tx_years = (tx_days - origin) / DAYS_PER_YEAR
+        # Flows on the valuation date count towards it, as they do for calculate_xirr
+        prefix_ends = np.searchsorted(tx_days, valuation_days, side="right")
+        # Net amount paid in up to each point, used to seed the first solve
+        net_invested = np.concatenate(([0.0], np.cumsum(-tx_amounts)))
+
+        series = []
+        guess = None
+        for valuation, day, end in zip(portfolio.valuations, valuation_days, prefix_ends):
+            if end == 0:
+                series.append((valuation.date, XirrResult.failed()))
+                continue
+
+            if guess is None:
+                invested = net_invested[end]
+                guess = float(np.clip(valuation.value / invested - 1.0, -0.5, 1.0)) if invested > 0 else 0.1
+
+            years = np.append(tx_years[:end], (day - origin) / DAYS_PER_YEAR)
+            amounts = np.append(tx_amounts[:end], valuation.value)
+            result = self._record(solve_xirr_years(years, amounts, guess=guess))
+            if result.converged:
+                guess = result.rate
+            series.append((valuation.date, result))
+        return series
+
+    def calculate_twr(self, portfolio: Portfolio) -> TwrResult:
+        """
+        Time-weighted return over the statement valuations (and the current value when
+        it is more recent), which unlike XIRR does not depend on when money was paid in.
+        NaN rates when there are fewer than two valuation points.
+        """
+        valuation_days = np.array([v.date.toordinal() for v in portfolio.valuations], dtype=np.int64)
+        values = np.array([v.value for v in portfolio.valuations], dtype=np.float64)
+        current_day = portfolio.current_date.toordinal()
+        if not valuation_days.size or current_day > valuation_days[-1]:
+            valuation_days = np.append(valuation_days, current_day)
+            values = np.append(values, portfolio.current_value)
+        store = portfolio.transactions
+        return time_weighted_return(valuation_days, values, store.days, store.amounts)
+
+    def _cash_flow_arrays(self, portfolio: Portfolio) -> Tuple[np.ndarray, np.ndarray]:
+        """Day ordinals and amounts of every transaction plus the closing value."""
+        store = portfolio.transactions
+        days = np.append(store.days.astype(np.int64), portfolio.current_date.toordinal())
+        amounts = np.append(store.amounts, portfolio.current_value)
+        return days, amounts
 
     def calculate_total_return(self, portfolio: Portfolio) -> float:
         """
@@ -32,14 +139,8 @@ class PerformanceService:
         This ignores the timing of deposits.
         Returns decimal (e.g. 0.10 for 10%).
         """
-        total_invested = 0.0
-        total_withdrawn = 0.0
-        
-        for tx in portfolio.transactions:
-            if tx.amount < 0:
-                total_invested += abs(tx.amount)
-            else:
-                total_withdrawn += tx.amount
+        total_invested = portfolio.transactions.total_invested()
+        total_withdrawn = portfolio.transactions.total_withdrawn()
         
         net_invested = total_invested - total_withdrawn
         
@@ -0,0 +1,98 @@
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Union, overload
+import numpy as np
+from src.domain.model import DEFAULT_CURRENCY, Transaction
+
+class TransactionStore(Sequence[Transaction]):
+    """
+    Date-sorted, array-backed transactions.
+    Dates are stored as ordinals and amounts as float64 in NumPy arrays, with
+    descriptions and currencies interned into small lookup tables, so analytics can
+    work on the columns directly. Indexing and iteration still yield Transaction objects.
+    """
+    __slots__ = ("days", "amounts", "description_ids", "descriptions", "currency_ids", "currencies")
+
+    def __init__(self, days: np.ndarray, amounts: np.ndarray, description_ids: np.ndarray, descriptions: List[str],
+                 currency_ids: Optional[np.ndarray] = None, currencies: Optional[List[str]] = None):
+        """
+        Columns must already be sorted by date; use from_transactions otherwise.
+        Without currency columns every amount is in DEFAULT_CURRENCY.
+        """
+        self.days = days
+        self.amounts = amounts
+        self.description_ids = description_ids
+        self.descriptions = descriptions
+        self.currency_ids = currency_ids if currency_ids is not None else np.zeros(len(days), dtype=np.int16)
+        self.currencies = currencies if currencies is not None else [DEFAULT_CURRENCY]
+
+    @classmethod
+    def from_transactions(cls, transactions: Iterable[Transaction]) -> "TransactionStore":
+        transactions = list(transactions)
+        interned: Dict[str, int] = {}
+        currencies: Dict[str, int] = {}
+        days = np.fromiter((tx.date.toordinal() for tx in transactions), dtype=np.int32, count=len(transactions))
+        amounts = np.fromiter((tx.amount for tx in transactions), dtype=np.float64, count=len(transactions))
+        description_ids = np.fromiter((interned.setdefault(tx.description, len(interned)) for tx in transactions),
+                                      dtype=np.int32, count=len(transactions))
+        currency_ids = np.fromiter((currencies.setdefault(tx.currency, len(currencies)) for tx in transactions),
+                                   dtype=np.int16, count=len(transactions))
+        # Stable, so transactions on the same date keep their statement order
+        order = np.argsort(days, kind="stable")
+        return cls(days[order], amounts[order], description_ids[order], list(interned),
+                   currency_ids[order], list(currencies) or [DEFAULT_CURRENCY])
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    @overload
+    def __getitem__(self, index: int) -> Transaction: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "TransactionStore": ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Transaction, "TransactionStore"]:
+        if isinstance(index, slice):
+            return TransactionStore(self.days[index], self.amounts[index], self.description_ids[index], self.descriptions,
+                                    self.currency_ids[index], self.currencies)
+        return Transaction(date.fromordinal(int(self.days[index])), float(self.amounts[index]),
+                           self.descriptions[self.description_ids[index]], self.currencies[self.currency_ids[index]])
+
+    def __iter__(self) -> Iterator[Transaction]:
+        for day, amount, description_id, currency_id in zip(self.days.tolist(), self.amounts.tolist(),
+                                                            self.description_ids.tolist(), self.currency_ids.tolist()):
+            yield Transaction(date.fromordinal(day), amount, self.descriptions[description_id], self.currencies[currency_id])
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, TransactionStore):
+            return (np.array_equal(self.days, other.days) and np.array_equal(self.amounts, other.amounts)
+                    and [self.descriptions[i] for i in self.description_ids] == [other.descriptions[i] for i in other.description_ids]
+                    and [self.currencies[i] for i in self.currency_ids] == [other.currencies[i] for i in other.currency_ids])
+        if isinstance(other, Sequence):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"TransactionStore({list(self)!r})"
+
+    def between(self, start: Optional[date] = None, end: Optional[date] = None) -> "TransactionStore":
+        """Transactions dated within [start, end], found by binary search."""
+        lo = 0 if start is None else int(np.searchsorted(self.days, start.toordinal(), side="left"))
+        hi = len(self) if end is None else int(np.searchsorted(self.days, end.toordinal(), side="right"))
+        return self[lo:hi]
+
+    def in_currency(self, currency: str) -> bool:
+        """Whether every amount is in the given currency."""
+        used = np.unique(self.currency_ids)
+        return all(self.currencies[i] == currency for i in used)
+
+    def with_amounts(self, amounts: np.ndarray, currency: str) -> "TransactionStore":
+        """The same transactions with new amounts, all in one currency (e.g. after conversion)."""
+        return TransactionStore(self.days, amounts, self.description_ids, self.descriptions,
+                                np.zeros(len(self.days), dtype=np.int16), [currency])
+
+    def total_invested(self) -> float:
+        """Sum of deposits, as a positive number."""
+        return float(-self.amounts[self.amounts < 0].sum())
+
+    def total_withdrawn(self) -> float:
+        return float(self.amounts[self.amounts > 0].sum())
@@ -0,0 +1,93 @@
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict
+import numpy as np
+from src.domain.xirr import DAYS_PER_YEAR
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+@dataclass
+class TwrResult:
+    """
+    Time-weighted return: the growth of one pound held from the first valuation to
+    the last, whatever was paid in or taken out along the way.
+    periods: pandas DataFrame with one row per sub-period between valuations
+        (start, end, start_value, end_value, net_flow, return).
+    yearly: pandas Series of the return within each calendar year, indexed by year.
+    """
+    cumulative: float
+    annualised: float
+    start: date
+    end: date
+    periods: Any
+    yearly: Any
+
+    @classmethod
+    def empty(cls, start: date, end: date) -> "TwrResult":
+        import pandas as pd
+        periods = pd.DataFrame(columns=["start", "end", "start_value", "end_value", "net_flow", "return"])
+        return cls(float("nan"), float("nan"), start, end, periods, pd.Series(dtype=float))
+
+    def yearly_dict(self) -> Dict[int, float]:
+        return {int(year): float(value) for year, value in self.yearly.items()}
+
+def time_weighted_return(valuation_days: np.ndarray, values: np.ndarray,
+                         tx_days: np.ndarray, tx_amounts: np.ndarray) -> TwrResult:
+    """
+    Chains the sub-period returns between consecutive valuations.
+    Flows within a sub-period are weighted by the share of it they were invested for
+    (Modified Dietz), so a deposit made just before a statement barely counts as
+    capital at work. Flows on or before the first valuation are already in its value;
+    flows on a valuation date count towards the period ending there.
+    valuation_days / tx_days: Day ordinals, both sorted ascending.
+    tx_amounts: Negative for deposits, positive for withdrawals, as on Transaction.
+    """
+    # Imported here so runs without time-weighted returns never load pandas
+    import pandas as pd
+    valuation_days = np.asarray(valuation_days, dtype=np.int64)
+    values = np.asarray(values, dtype=np.float64)
+    tx_days = np.asarray(tx_days, dtype=np.int64)
+    # Inflows into the account are positive from here on
+    flows = -np.asarray(tx_amounts, dtype=np.float64)
+    start, end = date.fromordinal(int(valuation_days[0])), date.fromordinal(int(valuation_days[-1]))
+    if valuation_days.size < 2:
+        return TwrResult.empty(start, end)
+
+    n_periods = valuation_days.size - 1
+    # Sub-period i runs from valuation i to valuation i + 1
+    period = np.searchsorted(valuation_days, tx_days, side="left") - 1
+    inside = (period >= 0) & (period < n_periods)
+    period, flow_days, flows = period[inside], tx_days[inside], flows[inside]
+
+    lengths = np.diff(valuation_days).astype(np.float64)
+    weights = (valuation_days[period + 1] - flow_days) / lengths[period]
+    net_flow = np.bincount(period, weights=flows, minlength=n_periods)
+    weighted_flow = np.bincount(period, weights=flows * weights, minlength=n_periods)
+
+    start_values, end_values = values[:-1], values[1:]
+    capital = start_values + weighted_flow
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = (end_values - start_values - net_flow) / capital
+    # Nothing was at work (e.g. the statement before the first deposit), so nothing was earned
+    returns = np.where(capital > 0, returns, 0.0)
+
+    # Day ordinals to datetime64 without going through date objects
+    timestamps = pd.DatetimeIndex((valuation_days - _EPOCH_ORDINAL).astype("datetime64[D]"))
+    ends = timestamps[1:]
+    periods = pd.DataFrame({
+        "start": timestamps[:-1],
+        "end": ends,
+        "start_value": start_values,
+        "end_value": end_values,
+        "net_flow": net_flow,
+        "return": returns,
+    })
+    growth = pd.Series(1.0 + returns, index=ends)
+    # A sub-period spanning New Year counts towards the year it ends in
+    yearly = growth.groupby(growth.index.year).prod() - 1.0
+
+    cumulative = float(growth.prod() - 1.0)
+    years = (valuation_days[-1] - valuation_days[0]) / DAYS_PER_YEAR
+    with np.errstate(divide="ignore", invalid="ignore"):
+        annualised = float((1.0 + cumulative) ** (1.0 / years) - 1.0)
+    return TwrResult(cumulative, annualised, start, end, periods, yearly)
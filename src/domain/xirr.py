@@ -0,0 +1,156 @@
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+
+DAYS_PER_YEAR = 365.25
+
+# Rates tried, in order, when looking for a sign change to hand to Brent's method
+_BRACKET_GRID = np.array([-0.9999, -0.99, -0.9, -0.5, -0.2, 0.0, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 100.0, 1000.0])
+
+@dataclass(frozen=True)
+class XirrResult:
+    rate: float
+    converged: bool
+    iterations: int
+    method: str  # "newton", "brent" or "none" when no root was found
+
+    @classmethod
+    def failed(cls, iterations: int = 0) -> "XirrResult":
+        return cls(float("nan"), False, iterations, "none")
+
+def year_fractions(days: np.ndarray) -> np.ndarray:
+    """Converts day offsets (or ordinals) into years since the earliest flow."""
+    days = np.asarray(days, dtype=np.float64)
+    if days.size == 0:
+        return days
+    return (days - days.min()) / DAYS_PER_YEAR
+
+def xnpv(rate: float, years: np.ndarray, amounts: np.ndarray) -> float:
+    """Net present value of the flows at `rate`, discounted to the earliest flow."""
+    with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+        return float(np.sum(amounts * np.exp(-years * np.log1p(rate))))
+
+def xnpv_derivative(rate: float, years: np.ndarray, amounts: np.ndarray) -> float:
+    """d(xnpv)/d(rate) = -sum(t * a * (1 + r)^(-t - 1))."""
+    with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+        return float(-np.sum(years * amounts * np.exp(-(years + 1.0) * np.log1p(rate))))
+
+def solve_xirr(days: np.ndarray, amounts: np.ndarray, guess: float = 0.1,
+               tol: float = 1e-10, max_iter: int = 50) -> XirrResult:
+    """
+    Finds the annual rate at which the flows' net present value is zero.
+    days: Day offsets or ordinals of each flow (any origin, any order).
+    amounts: Flow amounts; deposits negative, withdrawals and final value positive.
+    Runs Newton's method with the analytic derivative from `guess`, and falls back
+    to Brent's method on a bracketed root if Newton diverges or stalls.
+    """
+    return solve_xirr_years(year_fractions(days), np.asarray(amounts, dtype=np.float64), guess, tol, max_iter)
+
+def solve_xirr_years(years: np.ndarray, amounts: np.ndarray, guess: float = 0.1,
+                     tol: float = 1e-10, max_iter: int = 50) -> XirrResult:
+    """
+    solve_xirr on flows already expressed in years from a common origin.
+    The root does not depend on the origin, so callers solving many overlapping
+    flow sets can convert dates once and pass slices.
+    """
+    if not _has_root(amounts):
+        return XirrResult.failed()
+
+    rate, iterations, converged = _newton(years, amounts, guess, tol, max_iter)
+    if converged:
+        return XirrResult(rate, True, iterations, "newton")
+    return _brent(years, amounts, tol, max_iter, iterations)
+
+def solve_xirr_batch(cash_flows: Sequence[Tuple[np.ndarray, np.ndarray]],
+                     guesses: Optional[Sequence[float]] = None,
+                     tol: float = 1e-10, max_iter: int = 50) -> List[XirrResult]:
+    """
+    Solves many independent cash-flow sets at once.
+    The sets are padded into a single matrix and Newton steps are taken for all of
+    them together; any set that fails to converge is retried individually with Brent.
+    """
+    count = len(cash_flows)
+    if count == 0:
+        return []
+
+    width = max(len(amounts) for _, amounts in cash_flows)
+    years = np.zeros((count, width))
+    amounts = np.zeros((count, width))
+    for i, (days, flow_amounts) in enumerate(cash_flows):
+        n = len(flow_amounts)
+        years[i, :n] = year_fractions(days)
+        amounts[i, :n] = flow_amounts
+
+    rates = np.full(count, 0.1) if guesses is None else np.array(guesses, dtype=np.float64)
+    solvable = np.array([_has_root(row) for row in amounts])
+    active = solvable.copy()
+    converged = np.zeros(count, dtype=bool)
+    iterations = np.zeros(count, dtype=int)
+
+    with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+        for _ in range(max_iter):
+            if not active.any():
+                break
+            log_base = np.log1p(rates[active])[:, None]
+            t = years[active]
+            a = amounts[active]
+            discount = np.exp(-t * log_base)
+            f = np.sum(a * discount, axis=1)
+            df = -np.sum(t * a * discount, axis=1) / (1.0 + rates[active])
+            step = f / df
+            new_rates = rates[active] - step
+
+            idx = np.flatnonzero(active)
+            iterations[idx] += 1
+            diverged = ~np.isfinite(new_rates) | (new_rates <= -1.0)
+            done = ~diverged & (np.abs(step) <= tol * (1.0 + np.abs(new_rates)))
+
+            rates[idx[~diverged]] = new_rates[~diverged]
+            converged[idx[done]] = True
+            active[idx[done | diverged]] = False
+
+    results = []
+    for i, (days, flow_amounts) in enumerate(cash_flows):
+        if not solvable[i]:
+            results.append(XirrResult.failed())
+        elif converged[i]:
+            results.append(XirrResult(float(rates[i]), True, int(iterations[i]), "newton"))
+        else:
+            n = len(flow_amounts)
+            results.append(_brent(years[i, :n], amounts[i, :n], tol, max_iter, int(iterations[i])))
+    return results
+
+def _has_root(amounts: np.ndarray) -> bool:
+    # XNPV can only cross zero if there are flows in both directions
+    return bool(np.any(amounts > 0) and np.any(amounts < 0))
+
+def _newton(years: np.ndarray, amounts: np.ndarray, guess: float,
+            tol: float, max_iter: int) -> Tuple[float, int, bool]:
+    rate = guess
+    for iteration in range(1, max_iter + 1):
+        f = xnpv(rate, years, amounts)
+        df = xnpv_derivative(rate, years, amounts)
+        if not np.isfinite(f) or not np.isfinite(df) or df == 0.0:
+            return rate, iteration, False
+
+        step = f / df
+        rate -= step
+        if not np.isfinite(rate) or rate <= -1.0:
+            return rate, iteration, False
+        if abs(step) <= tol * (1.0 + abs(rate)):
+            return rate, iteration, True
+    return rate, max_iter, False
+
+def _brent(years: np.ndarray, amounts: np.ndarray, tol: float,
+           max_iter: int, iterations: int) -> XirrResult:
+    # Only needed when Newton fails, so scipy stays off the startup path
+    from scipy.optimize import brentq
+    values = np.array([xnpv(r, years, amounts) for r in _BRACKET_GRID])
+    for i in range(len(_BRACKET_GRID) - 1):
+        lo, hi = values[i], values[i + 1]
+        if np.isfinite(lo) and np.isfinite(hi) and np.sign(lo) != np.sign(hi):
+            rate, info = brentq(xnpv, _BRACKET_GRID[i], _BRACKET_GRID[i + 1],
+                                args=(years, amounts), xtol=tol, maxiter=max_iter * 2,
+                                full_output=True, disp=False)
+            return XirrResult(float(rate), info.converged, iterations + info.iterations, "brent")
+    return XirrResult.failed(iterations)
@@ -0,0 +1,68 @@
+import cProfile
+import pstats
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+from src.json_io import atomic_write_json
+
+class Instrumentation:
+    """
+    Lightweight timers and counters for a pipeline run.
+    Stages accumulate wall-clock seconds, counters accumulate integers and each
+    statement file gets its own record, so slow statements stand out in the report.
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, float] = defaultdict(float)
+        self.counters: Counter = Counter()
+        self.files: List[Dict[str, Any]] = []
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] += time.perf_counter() - start
+
+    def count(self, name: str, amount: int = 1):
+        self.counters[name] += amount
+
+    def record_file(self, path: str, **metrics: Any):
+        self.files.append({"path": path, **metrics})
+        for name, value in metrics.items():
+            if isinstance(value, int):
+                self.counters[name] += value
+
+    def report(self, slowest: int = 10) -> Dict[str, Any]:
+        timed = [f for f in self.files if "seconds" in f]
+        return {
+            "stages": dict(self.stages),
+            "counters": dict(self.counters),
+            "files": self.files,
+            "slowest_files": sorted(timed, key=lambda f: f["seconds"], reverse=True)[:slowest],
+        }
+
+    def write_json(self, path: str):
+        atomic_write_json(path, self.report(), indent=2)
+
+@contextmanager
+def profiled(output_path: Optional[str], top: int = 25) -> Iterator[None]:
+    """
+    Runs the block under cProfile when output_path is given, writing the raw stats
+    there (for snakeviz/pstats) and printing the top functions by cumulative time.
+    A None path makes this a no-op so callers need not branch.
+    """
+    if output_path is None:
+        yield
+        return
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(output_path)
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(top)
@@ -0,0 +1,23 @@
+import json
+import os
+import tempfile
+from typing import Any, Optional
+
+def atomic_write_json(path: str, data: Any, indent: Optional[int] = None):
+    """
+    Writes data as JSON to a temporary file next to path, then renames it over path,
+    so readers never see a half-written file and an interrupted write leaves the old
+    one in place. Each call gets its own temporary file, so concurrent writers of
+    the same path cannot interleave; the last rename wins.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory or ".", prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=indent)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
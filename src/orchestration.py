@@ -0,0 +1,137 @@
+import asyncio
+import math
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from src.domain.model import Portfolio
+from src.domain.service import PerformanceService
+from src.domain.twr import TwrResult
+from src.domain.xirr import XirrResult
+from src.json_io import atomic_write_json
+from src.ports.statement_reader import StatementReader
+
+@dataclass
+class ProviderJob:
+    name: str
+    reader: StatementReader
+    directory: str
+
+@dataclass
+class ProviderOutcome:
+    name: str
+    portfolio: Portfolio
+    xirr: float
+    simple_return: float
+    history: List[Tuple[date, XirrResult]] = field(default_factory=list)
+    twr: Optional[TwrResult] = None
+
+def evaluate(service: PerformanceService, name: str, portfolio: Portfolio, history: bool = False,
+             twr: bool = False) -> ProviderOutcome:
+    """Computes the metrics reported for one provider, in the service's reporting currency."""
+    portfolio = service.normalise(portfolio)
+    with service.instrumentation.stage("xirr"):
+        xirr = service.calculate_xirr(portfolio)
+        series = service.calculate_xirr_series(portfolio) if history else []
+    return ProviderOutcome(
+        name,
+        portfolio,
+        xirr,
+        service.calculate_total_return(portfolio),
+        series,
+        service.calculate_twr(portfolio) if twr else None,
+    )
+
+class InlineExecutor(Executor):
+    """
+    Runs each call to completion on the submitting thread. Used when profiling:
+    cProfile only sees the thread it was enabled on, so work handed to pool
+    threads would be missing from the profile. Providers then run one at a time.
+    """
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+async def run_providers(jobs: Sequence[ProviderJob], service: PerformanceService,
+                        max_concurrency: int = 2, history: bool = False, twr: bool = False,
+                        on_outcome: Optional[Callable[[ProviderOutcome], None]] = None,
+                        executor: Optional[Executor] = None) -> List[ProviderOutcome]:
+    """
+    Reads every provider concurrently and evaluates each one as soon as its
+    statements are in, so end-to-end latency tracks the slowest provider rather
+    than the sum. Blocking reader work runs on the executor; at most
+    max_concurrency providers read at once. on_outcome is called on the event
+    loop as each provider finishes. If any provider fails, the others are
+    cancelled and the original exception is raised. Outcomes are in job order.
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(max_concurrency)
+    own_executor = executor is None
+    if executor is None:
+        executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="provider")
+
+    failed = asyncio.Event()
+
+    async def process(job: ProviderJob) -> ProviderOutcome:
+        async with semaphore:
+            # A failure frees its slot before gather reports it; don't start new reads meanwhile
+            if failed.is_set():
+                raise asyncio.CancelledError()
+            try:
+                portfolio = await loop.run_in_executor(executor, job.reader.read_all, job.directory)
+            except BaseException:
+                failed.set()
+                raise
+        outcome = await loop.run_in_executor(executor, evaluate, service, job.name, portfolio, history, twr)
+        if on_outcome is not None:
+            on_outcome(outcome)
+        return outcome
+
+    tasks = [asyncio.create_task(process(job), name=job.name) for job in jobs]
+    try:
+        return list(await asyncio.gather(*tasks))
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    finally:
+        if own_executor:
+            # Drop queued work; a read already running in a thread finishes on its own
+            executor.shutdown(wait=False, cancel_futures=True)
+
+async def run_outputs(outputs: Sequence[Callable[[], None]], executor: Optional[Executor] = None):
+    """Runs independent output stages (chart rendering, report writing) concurrently."""
+    loop = asyncio.get_running_loop()
+    await asyncio.gather(*(loop.run_in_executor(executor, output) for output in outputs))
+
+def results_json(outcomes: Sequence[ProviderOutcome]) -> Dict[str, Dict[str, Any]]:
+    """The headline numbers per account as JSON-ready data (NaN rates become null)."""
+    def number(value: float) -> Optional[float]:
+        return None if math.isnan(value) else value
+
+    results = {}
+    for outcome in outcomes:
+        result = {
+            "xirr": number(outcome.xirr),
+            "simple_return": number(outcome.simple_return),
+            "current_value": outcome.portfolio.current_value,
+            "as_of": outcome.portfolio.current_date.isoformat(),
+        }
+        if outcome.twr is not None:
+            result["twr"] = {
+                "annualised": number(outcome.twr.annualised),
+                "cumulative": number(outcome.twr.cumulative),
+                "yearly": {str(year): number(value) for year, value in outcome.twr.yearly_dict().items()},
+            }
+        results[outcome.name] = result
+    return results
+
+def write_results(outcomes: Sequence[ProviderOutcome], path: str):
+    # Atomic so readers (e.g. a dashboard polling the file) never see half a file
+    atomic_write_json(path, results_json(outcomes), indent=2)
@@ -1,7 +1,35 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict
+from dataclasses import dataclass
+from typing import Any, List, Dict
+
+@dataclass
+class ChartRequest:
+    """
+    One chart to render. data depends on kind:
+    "comparison": Dict of name -> (XIRR, SimpleReturn)
+    "account": a Portfolio, drawn as its valuations against net money invested
+    "history": Dict of name -> list of (date, XIRR) points
+    "projection": a ProjectionResult, drawn as percentile bands around the median
+    """
+    kind: str
+    data: Any
+    output_path: str
+    title: str = ""
 
 class ChartGenerator(ABC):
     @abstractmethod
     def generate_performance_chart(self, data: Dict[str, float], output_path: str):
         pass
+
+    def render_charts(self, requests: List[ChartRequest]) -> List[bool]:
+        """
+        Renders several charts in one go. Returns, per request, whether the file
+        was written (False when an up-to-date chart was already there).
+        """
+        rendered = []
+        for request in requests:
+            if request.kind != "comparison":
+                raise ValueError(f"{type(self).__name__} cannot render {request.kind} charts")
+            self.generate_performance_chart(request.data, request.output_path)
+            rendered.append(True)
+        return rendered
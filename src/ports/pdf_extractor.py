@@ -1,7 +1,24 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Iterator, Optional, Sequence
+
+@dataclass
+class PageContent:
+    """Text and tables of one page, extracted from the same parsed page."""
+    text: str
+    tables: List[List[List[str]]] = field(default_factory=list)
+
+class TablesNotSupportedError(ValueError):
+    """Tables were requested from an extractor that cannot detect them."""
+
+    def __init__(self, extractor: "PDFExtractor"):
+        super().__init__(f"{type(extractor).__name__} cannot extract tables; use a layout-aware extractor")
 
 class PDFExtractor(ABC):
+    # Whether extract_tables (and so iter_document) works; readers that need tables check it.
+    # Adapters that set it to False raise TablesNotSupportedError when tables are requested.
+    supports_tables = True
+
     @abstractmethod
     def extract_tables(self, file_path: str) -> List[List[List[str]]]:
         pass
@@ -9,3 +26,51 @@ class PDFExtractor(ABC):
     @abstractmethod
     def extract_text(self, file_path: str) -> str:
         pass
+
+    def iter_pages(self, file_path: str, pages: Optional[Sequence[int]] = None) -> Iterator[str]:
+        """
+        Yields the text of each page lazily, so callers can stop once they have what
+        they need. pages: Zero-based indices to extract, in order; None for all pages.
+        Adapters that cannot stream yield the whole document as one page and may
+        ignore pages, so callers must not rely on it to exclude text.
+        """
+        yield self.extract_text(file_path)
+
+    def iter_document(self, file_path: str, pages: Optional[Sequence[int]] = None) -> Iterator[PageContent]:
+        """
+        Yields text and tables per page from a single pass over the document, for
+        readers that need both. The default makes separate text and table calls;
+        as tables then cannot be placed on their pages, all of them are attached
+        to the first page yielded. Adapters should override this to open the file once.
+        """
+        if not self.supports_tables:
+            raise TablesNotSupportedError(self)
+        tables = self.extract_tables(file_path)
+        text_pages = self.iter_pages(file_path) if pages is None else self.iter_pages(file_path, pages)
+        for index, text in enumerate(text_pages):
+            yield PageContent(text, tables if index == 0 else [])
+
+    def page_count(self, file_path: str) -> Optional[int]:
+        """
+        Number of pages iter_pages can yield for the document, found without
+        extracting them, so a reader of the first pages can resume from where it
+        stopped. None when the adapter cannot tell.
+        """
+        return None
+
+    def probe_pages(self, file_path: str, keywords: Sequence[str]) -> Optional[List[int]]:
+        """
+        Cheap first pass returning the indices of pages containing any of the keywords
+        (compared case-insensitively and ignoring whitespace), so only those need full
+        extraction. Pages the probe cannot read are included, so it never costs a
+        second extraction. None means the adapter cannot probe and every page should
+        be read.
+        """
+        return None
+
+    def settings_key(self) -> str:
+        """
+        Identifies the extractor and any settings that change its output.
+        Used to key cached results, so adapters with options should include them.
+        """
+        return type(self).__name__
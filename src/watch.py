@@ -0,0 +1,91 @@
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+from src.adapters.directory_watcher import DirectoryWatcher
+from src.domain.service import PerformanceService
+from src.orchestration import ProviderJob, ProviderOutcome, results_json, run_providers
+
+logger = logging.getLogger(__name__)
+
+class WatchService:
+    """
+    Keeps every account's results in memory and recomputes only the accounts whose
+    statement directory changed. Readers should be incremental (manifest enabled),
+    so a refresh extracts just the statements that arrived. A failing account keeps
+    its previous results and is retried on its next change.
+    """
+
+    def __init__(self, jobs: Sequence[ProviderJob], service: PerformanceService, watcher: DirectoryWatcher,
+                 max_concurrency: int = 2, history: bool = False, twr: bool = False,
+                 on_update: Optional[Callable[[List[ProviderOutcome]], None]] = None):
+        self.jobs = list(jobs)
+        self.service = service
+        self.watcher = watcher
+        self.max_concurrency = max_concurrency
+        self.history = history
+        self.twr = twr
+        self.on_update = on_update
+        self.updated_at: Optional[datetime] = None
+        self._outcomes: Dict[str, ProviderOutcome] = {}
+        self._lock = threading.Lock()
+
+    def latest(self) -> List[ProviderOutcome]:
+        """Current results in job order; safe to call from other threads."""
+        with self._lock:
+            return [self._outcomes[job.name] for job in self.jobs if job.name in self._outcomes]
+
+    def results(self) -> Dict[str, Any]:
+        with self._lock:
+            updated_at = self.updated_at
+        return {
+            "updated_at": updated_at.isoformat(timespec="seconds") if updated_at else None,
+            "accounts": results_json(self.latest()),
+        }
+
+    def refresh(self, directories: Optional[Iterable[str]] = None) -> List[ProviderOutcome]:
+        """Recomputes the accounts reading from the given directories (all accounts when None)."""
+        if directories is None:
+            selected = self.jobs
+        else:
+            wanted = {os.path.abspath(d) for d in directories}
+            selected = [job for job in self.jobs if os.path.abspath(job.directory) in wanted]
+        if not selected:
+            return []
+
+        outcomes = asyncio.run(self._evaluate(selected))
+        with self._lock:
+            for outcome in outcomes:
+                self._outcomes[outcome.name] = outcome
+            self.updated_at = datetime.now()
+        if outcomes and self.on_update is not None:
+            self.on_update(self.latest())
+        return outcomes
+
+    def run(self, stop: threading.Event, poll_timeout: float = 1.0):
+        """Computes everything once, then refreshes on changes until stop is set."""
+        self.refresh()
+        while not stop.is_set():
+            changed = self.watcher.changes(poll_timeout)
+            if changed:
+                logger.info("Statements changed in %s", ", ".join(sorted(changed)))
+                self.refresh(changed)
+
+    async def _evaluate(self, jobs: List[ProviderJob]) -> List[ProviderOutcome]:
+        # Accounts run independently so one unreadable statement does not hold back the rest
+        with ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="watch") as executor:
+            results = await asyncio.gather(
+                *(run_providers([job], self.service, history=self.history, twr=self.twr,
+                                executor=executor) for job in jobs),
+                return_exceptions=True,
+            )
+        outcomes = []
+        for job, result in zip(jobs, results):
+            if isinstance(result, BaseException):
+                logger.error("Could not refresh %s, keeping previous results", job.name, exc_info=result)
+            else:
+                outcomes.extend(result)
+        return outcomes
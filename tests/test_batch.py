@@ -0,0 +1,67 @@
+import json
+import os
+import pytest
+from benchmarks.corpus import CorpusSpec, generate_corpus
+from src.batch import BatchSettings, TreeRunner, find_roots, run_batch, shard, write_batch_results
+
+def make_tree(root, seed: int):
+    account, = generate_corpus(str(root), CorpusSpec(years=1, holdings_lines=5, boilerplate_pages=0, seed=seed),
+                               providers=("moneyfarm",), pdf=True)
+    (root / "accounts.json").write_text(json.dumps({"accounts": [
+        {"name": "Moneyfarm ISA", "provider": "moneyfarm", "directory": os.path.basename(account.directory)}]}))
+    return account
+
+def test_roots_are_globbed_and_sharded_without_overlap(tmp_path):
+    for name in ("alice", "bob", "carol"):
+        (tmp_path / name / "statements").mkdir(parents=True)
+    (tmp_path / "notes.txt").write_text("not a tree")
+
+    roots = find_roots([str(tmp_path / "*" / "statements"), str(tmp_path / "alice" / "statements")])
+
+    assert [os.path.basename(os.path.dirname(r)) for r in roots] == ["alice", "bob", "carol"]
+    shards = [shard(roots, i, 2) for i in range(2)]
+    assert sorted(shards[0] + shards[1]) == roots
+    assert not set(shards[0]) & set(shards[1])
+    with pytest.raises(ValueError):
+        shard(roots, 2, 2)
+
+def test_batch_runs_trees_in_parallel_and_isolates_failures(tmp_path):
+    accounts = {}
+    for i, name in enumerate(("alice", "bob")):
+        accounts[name] = make_tree(tmp_path / name, seed=i)
+    broken = tmp_path / "mallory"
+    broken.mkdir()
+    (broken / "accounts.json").write_text(json.dumps({"accounts": [{"name": "X", "provider": "vanguard", "directory": "x"}]}))
+
+    roots = find_roots([str(tmp_path / "*")])
+    results = run_batch(roots, BatchSettings(extractor="fast", cache_path=None), workers=2)
+
+    assert [os.path.basename(r.root) for r in results] == ["alice", "bob", "mallory"]
+    for result in results[:2]:
+        assert result.error is None
+        value = accounts[os.path.basename(result.root)].valuations[-1][1]
+        assert result.accounts["Moneyfarm ISA"]["current_value"] == value
+    assert "vanguard" in results[2].error
+
+    path = tmp_path / "out" / "batch.json"
+    write_batch_results(results, str(path), shard_index=0, shard_count=1)
+    data = json.loads(path.read_text())
+    assert set(data["trees"]) == set(roots)
+    assert data["trees"][roots[2]]["accounts"] == {}
+
+def test_runner_reuses_readers_and_extractors_across_trees(tmp_path):
+    accounts = [make_tree(tmp_path / name, seed=i) for i, name in enumerate(("alice", "bob"))]
+    runner = TreeRunner(BatchSettings(extractor="fast", cache_path=None, state_dir=str(tmp_path / "state")))
+
+    results = [runner.run(str(tmp_path / name)) for name in ("alice", "bob", "alice")]
+
+    assert len(runner._readers) == 1 and len(runner._extractors) == 1
+    for result, account in zip(results, accounts + accounts[:1]):
+        assert result.accounts["Moneyfarm ISA"]["current_value"] == account.valuations[-1][1]
+    assert results[2].accounts == results[0].accounts
+    # Incremental state is kept per tree
+    assert len(os.listdir(tmp_path / "state")) == 2
+    # Metrics cover the last tree only, which came from its manifest, rather than piling up in the reader
+    reader, = runner._readers.values()
+    assert reader.instrumentation.files == []
+    assert reader.instrumentation.counters["manifest_hits"] == len(accounts[0].valuations)
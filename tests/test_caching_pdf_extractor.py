@@ -0,0 +1,210 @@
+import sqlite3
+from typing import List, Optional, Sequence
+from benchmarks.corpus import CorpusSpec, generate_corpus
+from src.ports.pdf_extractor import PDFExtractor, PageContent
+from src.adapters import file_fingerprint
+from src.adapters.caching_pdf_extractor import CachingPDFExtractor
+from src.adapters.moneyfarm_reader import MoneyfarmReader
+from src.adapters.pdfminer_text_extractor import PdfMinerTextExtractor
+from src.instrumentation import Instrumentation
+
+class CountingPDFExtractor(PDFExtractor):
+    def __init__(self):
+        self.calls = 0
+
+    def extract_tables(self, file_path: str) -> List[List[List[str]]]:
+        self.calls += 1
+        return [[["Date", "Amount"], ["2023-11-03", None]]]
+
+    def extract_text(self, file_path: str) -> str:
+        self.calls += 1
+        with open(file_path) as f:
+            return f"text of {f.read()}"
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+def test_cache_hits_on_unchanged_file(tmp_path):
+    pdf = tmp_path / "23_q4.pdf"
+    pdf.write_text("statement")
+    inner = CountingPDFExtractor()
+    extractor = CachingPDFExtractor(inner, str(tmp_path / "cache.sqlite"))
+
+    assert extractor.extract_text(str(pdf)) == "text of statement"
+    assert extractor.extract_text(str(pdf)) == "text of statement"
+    assert extractor.extract_tables(str(pdf)) == [[["Date", "Amount"], ["2023-11-03", None]]]
+
+    assert inner.calls == 2
+    assert (extractor.stats.hits, extractor.stats.misses) == (1, 2)
+
+    # A fresh instance (i.e. the next run) reads from disk
+    warm = CachingPDFExtractor(inner, str(tmp_path / "cache.sqlite"))
+    assert warm.extract_text(str(pdf)) == "text of statement"
+    assert warm.stats.hits == 1
+    assert inner.calls == 2
+
+def test_cache_misses_when_file_changes(tmp_path):
+    pdf = tmp_path / "23_q4.pdf"
+    pdf.write_text("statement")
+    extractor = CachingPDFExtractor(CountingPDFExtractor(), str(tmp_path / "cache.sqlite"))
+
+    extractor.extract_text(str(pdf))
+    pdf.write_text("corrected statement")
+
+    assert extractor.extract_text(str(pdf)) == "text of corrected statement"
+    assert extractor.stats.misses == 2
+
+def test_cache_evicts_expired_entries(tmp_path):
+    pdf = tmp_path / "23_q4.pdf"
+    pdf.write_text("statement")
+    clock = FakeClock()
+    extractor = CachingPDFExtractor(CountingPDFExtractor(), str(tmp_path / "cache.sqlite"),
+                                    max_age_seconds=60, clock=clock)
+
+    extractor.extract_text(str(pdf))
+    clock.now += 61
+    extractor.extract_text(str(pdf))
+
+    assert extractor.stats.misses == 2
+    assert extractor.stats.evictions == 1
+
+def test_cache_evicts_least_recently_used_when_full(tmp_path):
+    clock = FakeClock()
+    extractor = CachingPDFExtractor(CountingPDFExtractor(), str(tmp_path / "cache.sqlite"),
+                                    max_bytes=60, clock=clock)
+    paths = []
+    for i in range(3):
+        pdf = tmp_path / f"{i}.pdf"
+        pdf.write_text(f"statement {i}")
+        paths.append(str(pdf))
+
+    for path in paths:
+        clock.now += 1
+        extractor.extract_text(path)
+
+    assert extractor.stats.evictions > 0
+    # The most recent entry always survives
+    extractor.extract_text(paths[-1])
+    assert extractor.stats.hits == 1
+
+class PagedPDFExtractor(CountingPDFExtractor):
+    def iter_pages(self, file_path: str):
+        self.calls += 1
+        yield "page 1"
+        yield "page 2"
+
+def test_cache_keeps_partial_page_reads(tmp_path):
+    pdf = tmp_path / "23_q4.pdf"
+    pdf.write_text("statement")
+    inner = PagedPDFExtractor()
+    extractor = CachingPDFExtractor(inner, str(tmp_path / "cache.sqlite"))
+
+    # A reader that stops after the first page is served from the cache next time
+    pages = extractor.iter_pages(str(pdf))
+    assert next(pages) == "page 1"
+    pages.close()
+    cached = extractor.iter_pages(str(pdf))
+    assert next(cached) == "page 1"
+    cached.close()
+    assert inner.calls == 1
+
+    # Reading further resumes from the wrapped extractor, then the full document is cached
+    assert list(extractor.iter_pages(str(pdf))) == ["page 1", "page 2"]
+    assert list(extractor.iter_pages(str(pdf))) == ["page 1", "page 2"]
+
+    assert inner.calls == 2
+    assert (extractor.stats.hits, extractor.stats.misses) == (3, 1)
+
+def test_document_text_and_tables_are_cached_together(tmp_path):
+    pdf = tmp_path / "23_q4.pdf"
+    pdf.write_text("statement")
+    inner = CountingPDFExtractor()
+    extractor = CachingPDFExtractor(inner, str(tmp_path / "cache.sqlite"))
+
+    first = list(extractor.iter_document(str(pdf)))
+    second = list(extractor.iter_document(str(pdf)))
+
+    assert first == second == [PageContent("text of statement", [[["Date", "Amount"], ["2023-11-03", None]]])]
+    assert inner.calls == 2
+
+class IndexedPDFExtractor(CountingPDFExtractor):
+    def __init__(self):
+        super().__init__()
+        self.requested = []
+
+    def page_count(self, file_path: str) -> Optional[int]:
+        return 3
+
+    def iter_pages(self, file_path: str, pages: Optional[Sequence[int]] = None):
+        pages = range(3) if pages is None else pages
+        for index in pages:
+            self.requested.append(index)
+            yield f"page {index + 1}"
+
+def test_resumed_page_reads_extract_only_the_missing_pages(tmp_path):
+    pdf = tmp_path / "23_q4.pdf"
+    pdf.write_text("statement")
+    inner = IndexedPDFExtractor()
+    extractor = CachingPDFExtractor(inner, str(tmp_path / "cache.sqlite"))
+
+    pages = extractor.iter_pages(str(pdf))
+    assert next(pages) == "page 1"
+    pages.close()
+    assert list(extractor.iter_pages(str(pdf))) == ["page 1", "page 2", "page 3"]
+
+    # The cached first page is not rendered again when the read resumes
+    assert inner.requested == [0, 1, 2]
+
+def test_file_is_hashed_once_across_lookups(tmp_path, monkeypatch):
+    pdf = tmp_path / "23_q4.pdf"
+    pdf.write_text("statement")
+    extractor = CachingPDFExtractor(CountingPDFExtractor(), str(tmp_path / "cache.sqlite"))
+    file_fingerprint._sha256.cache_clear()
+
+    extractor.extract_text(str(pdf))
+    extractor.extract_tables(str(pdf))
+    list(extractor.iter_document(str(pdf)))
+
+    assert file_fingerprint._sha256.cache_info().misses == 1
+
+    # Rewriting the file changes its size and mtime, so it is hashed again
+    pdf.write_text("corrected statement")
+    assert extractor.extract_text(str(pdf)) == "text of corrected statement"
+
+def test_cache_hits_do_not_write_until_the_next_store(tmp_path):
+    pdf = tmp_path / "23_q4.pdf"
+    pdf.write_text("statement")
+    clock = FakeClock()
+    db_path = str(tmp_path / "cache.sqlite")
+    extractor = CachingPDFExtractor(CountingPDFExtractor(), db_path, clock=clock)
+    extractor.extract_text(str(pdf))
+
+    clock.now += 5
+    extractor.extract_text(str(pdf))
+    accessed = lambda: sqlite3.connect(db_path).execute("SELECT accessed FROM extractions").fetchone()[0]
+    assert accessed() == 1000.0
+
+    extractor.close()
+    assert accessed() == 1005.0
+
+def test_cache_counts_from_worker_processes_reach_the_instrumentation(tmp_path):
+    account = next(a for a in generate_corpus(str(tmp_path / "corpus"), CorpusSpec(years=1), pdf=True)
+                   if a.provider == "moneyfarm")
+    db_path = str(tmp_path / "cache.sqlite")
+
+    counters = []
+    for _ in range(2):
+        instrumentation = Instrumentation()
+        reader = MoneyfarmReader(CachingPDFExtractor(PdfMinerTextExtractor(), db_path), workers=2,
+                                 instrumentation=instrumentation)
+        reader.read_all(account.directory)
+        counters.append((instrumentation.counters["cache_hits"], instrumentation.counters["cache_misses"]))
+
+    # Every lookup missed on the cold run and hit on the warm one, although workers made them
+    cold_hits, cold_misses = counters[0]
+    assert cold_hits == 0 and cold_misses >= len(account.valuations)
+    assert counters[1] == (cold_misses, 0)
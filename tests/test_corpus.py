@@ -0,0 +1,28 @@
+from benchmarks.corpus import CorpusSpec, TextCorpusExtractor, generate_corpus
+from src.adapters.interactive_investor_reader import InteractiveInvestorReader
+from src.adapters.moneyfarm_reader import MoneyfarmReader
+from src.adapters.pdf_plumber_extractor import PdfPlumberExtractor
+
+READERS = {"moneyfarm": MoneyfarmReader, "interactive-investor": InteractiveInvestorReader}
+
+def test_readers_recover_generated_text_corpus(tmp_path):
+    accounts = generate_corpus(str(tmp_path), CorpusSpec(accounts=2, years=2, seed=7))
+
+    for account in accounts:
+        portfolio = READERS[account.provider](TextCorpusExtractor()).read_all(account.directory)
+
+        # Overlapping statements repeat transactions; deduplication must leave exactly the generated set
+        assert sorted((t.date, t.amount) for t in portfolio.transactions) == \
+            sorted((t.date, t.amount) for t in account.transactions)
+        assert [(v.date, v.value) for v in portfolio.valuations] == account.valuations
+        assert (portfolio.current_date, portfolio.current_value) == account.valuations[-1]
+
+def test_generated_pdfs_extract_with_pdfplumber(tmp_path):
+    spec = CorpusSpec(years=1, holdings_lines=5, boilerplate_pages=0)
+    account, = generate_corpus(str(tmp_path), spec, providers=("moneyfarm",), pdf=True)
+
+    portfolio = MoneyfarmReader(PdfPlumberExtractor()).read_all(account.directory)
+
+    assert sorted((t.date, t.amount) for t in portfolio.transactions) == \
+        sorted((t.date, t.amount) for t in account.transactions)
+    assert portfolio.current_value == account.valuations[-1][1]
@@ -0,0 +1,113 @@
+import os
+import pytest
+from typing import Callable, Dict
+from datetime import date
+from benchmarks.corpus import CorpusSpec, generate_corpus, write_pdf_objects
+from src.adapters.pdf_plumber_extractor import PdfPlumberExtractor
+from src.adapters.pdfminer_text_extractor import PdfMinerTextExtractor
+from src.adapters.provider_registry import PROVIDERS
+from src.adapters.interactive_investor_reader import InteractiveInvestorReader
+
+@pytest.fixture(scope="module")
+def pdf_accounts(tmp_path_factory):
+    root = str(tmp_path_factory.mktemp("corpus"))
+    return generate_corpus(root, CorpusSpec(accounts=1, years=1, holdings_lines=20, boilerplate_pages=1), pdf=True)
+
+def test_readers_build_identical_portfolios_with_either_extractor(pdf_accounts):
+    for account in pdf_accounts:
+        reader_cls = PROVIDERS[account.provider]
+        layout = reader_cls(PdfPlumberExtractor()).read_all(account.directory)
+        fast = reader_cls(PdfMinerTextExtractor()).read_all(account.directory)
+
+        assert fast == layout
+        assert sorted((t.date, t.amount) for t in fast.transactions) == sorted((t.date, t.amount) for t in account.transactions)
+
+def test_page_text_and_probes_match(pdf_accounts):
+    layout, fast = PdfPlumberExtractor(), PdfMinerTextExtractor()
+    keywords = PROVIDERS["interactive-investor"].page_keywords
+    for account in pdf_accounts:
+        path = os.path.join(account.directory, sorted(os.listdir(account.directory))[0])
+
+        assert list(fast.iter_pages(path)) == list(layout.iter_pages(path))
+        assert list(fast.iter_pages(path, [1, 0])) == list(layout.iter_pages(path, [1, 0]))
+        assert fast.probe_pages(path, keywords) == layout.probe_pages(path, keywords)
+
+SUBSCRIPTION = "01 Jan 2024 Monthly Subscription \u00a3 500.00"
+FONT = b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"
+
+def stream(data: bytes, attributes: bytes = b"") -> bytes:
+    return b"<< %s /Length %d >>\nstream\n" % (attributes, len(data)) + data + b"\nendstream"
+
+def text_ops(*operands: bytes) -> bytes:
+    return b"BT /F1 8 Tf 10 TL 36 806 Td " + b" ".join(operand + b" Tj T*" for operand in operands) + b" ET"
+
+def literal(text: str) -> bytes:
+    return b"(" + text.encode("cp1252") + b")"
+
+def write_statement(path: str, subscription_page: bytes, forms: bytes = b"",
+                    fonts: Dict[int, bytes] = {3: FONT}, show: Callable[[str], bytes] = literal):
+    """
+    Interactive Investor statement whose second page carries the subscription in
+    the content stream given, with objects from 10 up available for forms and
+    fonts. F1 is object 3, and show encodes the other pages' text for it.
+    """
+    resources = b"/Resources << /Font << /F1 3 0 R >> /XObject << %s >> >>" % (b"/Fm0 10 0 R" if forms else b"")
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        2: b"<< /Type /Pages /Kids [4 0 R 5 0 R 6 0 R] /Count 3 >>",
+        7: stream(text_ops(show("Interactive Investor Statement"), show("Total Portfolio Value \u00a3 1.00 \u00a3 2.00 \u00a3 3,000.00"))),
+        8: stream(subscription_page),
+        9: stream(text_ops(show("Important information"))),
+        **fonts,
+    }
+    for page_id, content_id in ((4, 7), (5, 8), (6, 9)):
+        objects[page_id] = b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] %s /Contents %d 0 R >>" % (
+            resources, content_id)
+    if forms:
+        objects[10] = forms
+    write_pdf_objects(path, objects)
+
+@pytest.mark.parametrize("layout", ["hex string", "form xobject"])
+def test_probe_sees_text_outside_literal_page_strings(tmp_path, layout):
+    path = str(tmp_path / "Statement 2024-01-31.pdf")
+    encoded = SUBSCRIPTION.encode("cp1252")
+    if layout == "hex string":
+        write_statement(path, text_ops(b"<" + encoded.hex().upper().encode("ascii") + b">"))
+    else:
+        form = stream(text_ops(b"(" + encoded + b")"),
+                      b"/Type /XObject /Subtype /Form /BBox [0 0 595 842] /Resources << /Font << /F1 3 0 R >> >>")
+        write_statement(path, b"/Fm0 Do", forms=form)
+    keywords = InteractiveInvestorReader.page_keywords
+
+    for extractor in (PdfPlumberExtractor(), PdfMinerTextExtractor()):
+        assert extractor.probe_pages(path, keywords) == [0, 1]
+        portfolio = InteractiveInvestorReader(extractor).read_all(str(tmp_path))
+        assert [(t.date, t.amount) for t in portfolio.transactions] == [(date(2024, 1, 1), -500.0)]
+        assert portfolio.current_value == 3000.0
+
+# Composite font whose two-byte codes are offset from the text, so only its ToUnicode map decodes them
+TO_UNICODE_FONTS = {
+    3: b"<< /Type /Font /Subtype /Type0 /BaseFont /Helvetica /Encoding /Identity-H /DescendantFonts [10 0 R]"
+       b" /ToUnicode 11 0 R >>",
+    10: b"<< /Type /Font /Subtype /CIDFontType2 /BaseFont /Helvetica /DW 500"
+        b" /CIDSystemInfo << /Registry (Adobe) /Ordering (Identity) /Supplement 0 >> >>",
+    11: stream(b"/CIDInit /ProcSet findresource begin 12 dict begin begincmap /CMapName /Offset def"
+               b" 1 begincodespacerange <0000> <FFFF> endcodespacerange"
+               b" 1 beginbfrange <0100> <01FF> <0000> endbfrange"
+               b" endcmap CMapName currentdict /CMap defineresource pop end end"),
+}
+
+def offset_hex(text: str) -> bytes:
+    return b"<" + "".join(f"{ord(char) + 0x100:04X}" for char in text).encode("ascii") + b">"
+
+def test_probe_decodes_fonts_through_their_to_unicode_map(tmp_path):
+    path = str(tmp_path / "Statement 2024-01-31.pdf")
+    write_statement(path, text_ops(offset_hex(SUBSCRIPTION)), fonts=TO_UNICODE_FONTS, show=offset_hex)
+    keywords = InteractiveInvestorReader.page_keywords
+
+    for extractor in (PdfPlumberExtractor(), PdfMinerTextExtractor()):
+        # The notices page is decoded and left out rather than selected unread
+        assert extractor.probe_pages(path, keywords) == [0, 1]
+        portfolio = InteractiveInvestorReader(extractor).read_all(str(tmp_path))
+        assert [(t.date, t.amount) for t in portfolio.transactions] == [(date(2024, 1, 1), -500.0)]
+        assert portfolio.current_value == 3000.0
@@ -0,0 +1,83 @@
+import time
+from datetime import date, timedelta
+import numpy as np
+import pytest
+from src.adapters.fx_rate_file import load_fx_rates
+from src.domain.fx import FxRateTable
+from src.domain.model import Transaction, Portfolio, Valuation
+from src.domain.service import PerformanceService
+
+def ordinals(*days: date) -> np.ndarray:
+    return np.array([d.toordinal() for d in days])
+
+# GBP value of one USD / EUR; rows deliberately out of order
+RATES = FxRateTable.from_columns(
+    "GBP",
+    ordinals(date(2024, 1, 3), date(2024, 1, 1), date(2024, 1, 1), date(2024, 1, 2)),
+    np.array(["USD", "USD", "EUR", "USD"]),
+    np.array([0.78, 0.80, 0.86, 0.79]),
+)
+
+def test_rates_are_looked_up_as_of_each_date():
+    days = ordinals(date(2024, 1, 1), date(2024, 1, 2), date(2024, 1, 3), date(2024, 1, 7))
+
+    assert RATES.rates("USD", days).tolist() == [0.80, 0.79, 0.78, 0.78]
+    assert RATES.rates("GBP", days).tolist() == [1.0] * 4
+    assert RATES.currencies == ["EUR", "GBP", "USD"]
+    # Through the base currency
+    assert RATES.convert(np.array([100.0]), ordinals(date(2024, 1, 2)), "EUR", "USD") == pytest.approx(100.0 * 0.86 / 0.79)
+
+def test_missing_rates_are_reported():
+    with pytest.raises(ValueError, match="rates start on 2024-01-01"):
+        RATES.rates("USD", ordinals(date(2023, 12, 31)))
+    with pytest.raises(ValueError, match="No JPY rates"):
+        RATES.rates("JPY", ordinals(date(2024, 1, 1)))
+
+def test_normalise_converts_flows_and_values_at_their_own_dates():
+    portfolio = Portfolio(
+        name="US account",
+        transactions=[Transaction(date(2024, 1, 1), -1000.0, "Deposit", "USD"),
+                      Transaction(date(2024, 1, 2), -100.0, "Deposit", "GBP")],
+        current_value=1200.0,
+        current_date=date(2024, 1, 3),
+        valuations=[Valuation(date(2024, 1, 2), 1100.0), Valuation(date(2024, 1, 3), 1200.0)],
+        currency="USD",
+    )
+
+    normalised = PerformanceService(fx_rates=RATES).normalise(portfolio)
+
+    assert normalised.currency == "GBP"
+    assert normalised.transactions.in_currency("GBP")
+    assert normalised.transactions.amounts.tolist() == pytest.approx([-800.0, -100.0])
+    assert [v.value for v in normalised.valuations] == pytest.approx([869.0, 936.0])
+    assert normalised.current_value == pytest.approx(936.0)
+    # Already in the reporting currency: nothing to do
+    assert PerformanceService(fx_rates=RATES).normalise(normalised) is normalised
+
+def test_foreign_amounts_need_rates():
+    portfolio = Portfolio("US account", [Transaction(date(2024, 1, 1), -1000.0, "Deposit", "USD")], 1100.0, date(2025, 1, 1))
+
+    with pytest.raises(ValueError, match="amounts in USD"):
+        PerformanceService().normalise(portfolio)
+
+def test_rate_file_is_loaded_and_large_histories_convert_in_one_pass(tmp_path):
+    path = tmp_path / "rates.csv"
+    start = date(2000, 1, 3)
+    lines = ["date,currency,rate"] + [f"{start + timedelta(days=i)},{c},{r + i * 1e-6}"
+                                      for i in range(9000) for c, r in (("usd", 0.7), ("EUR", 0.85))]
+    path.write_text("\n".join(lines))
+
+    rates = load_fx_rates(str(path))
+    assert rates.currencies == ["EUR", "GBP", "USD"]
+    assert rates.rates("USD", ordinals(start + timedelta(days=10))) == pytest.approx([0.7 + 10e-6])
+
+    rng = np.random.default_rng(0)
+    transactions = [Transaction(start + timedelta(days=int(d)), -100.0, "Deposit", c)
+                    for d, c in zip(rng.integers(0, 9000, 200_000), rng.choice(["USD", "EUR", "GBP"], 200_000))]
+    store = Portfolio("Big", transactions, 0.0, start).transactions
+
+    started = time.perf_counter()
+    converted = rates.convert_store(store, "GBP")
+    assert time.perf_counter() - started < 0.5
+    assert converted.in_currency("GBP")
+    assert np.all(converted.amounts[store.currency_ids == store.currencies.index("GBP")] == -100.0)
@@ -0,0 +1,22 @@
+import json
+from src.instrumentation import Instrumentation
+
+def test_report_aggregates_stages_counters_and_files(tmp_path):
+    instrumentation = Instrumentation()
+    with instrumentation.stage("ingest"):
+        pass
+    with instrumentation.stage("ingest"):
+        pass
+    instrumentation.count("cache_hits", 3)
+    instrumentation.record_file("a.pdf", pages=2, lines=40, seconds=0.5)
+    instrumentation.record_file("b.pdf", pages=3, lines=60, seconds=1.5)
+
+    report = instrumentation.report()
+
+    assert report["stages"]["ingest"] >= 0.0
+    assert report["counters"] == {"cache_hits": 3, "pages": 5, "lines": 100}
+    assert [f["path"] for f in report["slowest_files"]] == ["b.pdf", "a.pdf"]
+
+    path = tmp_path / "report.json"
+    instrumentation.write_json(str(path))
+    assert json.loads(path.read_text())["counters"]["pages"] == 5
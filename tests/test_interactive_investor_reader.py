@@ -1,8 +1,10 @@
 import pytest
-from datetime import date
+import re
+from datetime import date, datetime
 from src.adapters.interactive_investor_reader import InteractiveInvestorReader
 from src.ports.pdf_extractor import PDFExtractor
 from typing import List
+import os
 
 class FakePDFExtractor(PDFExtractor):
     def __init__(self, text: str):
@@ -114,3 +116,127 @@ def test_ii_reader_parsing_with_fees(tmp_path):
     
     fee_tx2 = next(t for t in portfolio.transactions if t.date == date(2025, 5, 12))
     assert fee_tx2.amount == -4.99
+
+class PerFilePDFExtractor(PDFExtractor):
+    def __init__(self, texts: dict):
+        self.texts = texts
+
+    def extract_tables(self, file_path: str) -> List[List[List[str]]]:
+        return []
+
+    def extract_text(self, file_path: str) -> str:
+        return self.texts[os.path.basename(file_path)]
+
+def test_ii_reader_parallel_matches_serial(tmp_path):
+    d = tmp_path / "ii_parallel"
+    d.mkdir()
+    texts = {}
+    for month in range(1, 13):
+        filename = f"Statement 2024-{month:02d}-28.pdf"
+        (d / filename).write_text("dummy")
+        # Each statement repeats the previous month's subscription to exercise deduplication
+        texts[filename] = f"""
+        Total Portfolio Value £ {1000 * month:,}.00
+        {month:02d} Jan 2024 Monthly Subscription £ 1,000.00
+        {month + 1:02d} Jan 2024 Monthly Subscription £ 1,000.00
+        """
+
+    serial = InteractiveInvestorReader(PerFilePDFExtractor(texts)).read_all(str(d))
+    parallel = InteractiveInvestorReader(PerFilePDFExtractor(texts), workers=4).read_all(str(d))
+
+    assert parallel == serial
+    assert len(parallel.transactions) == 13
+    assert parallel.current_value == 12000.0
+    assert parallel.current_date == date(2024, 12, 28)
+
+class PagedPDFExtractor(PDFExtractor):
+    def __init__(self, pages: List[str]):
+        self.pages = pages
+        self.pages_read = 0
+
+    def extract_tables(self, file_path: str) -> List[List[List[str]]]:
+        return []
+
+    def extract_text(self, file_path: str) -> str:
+        return "".join(page + "\n" for page in self.pages)
+
+    def iter_pages(self, file_path: str):
+        for page in self.pages:
+            self.pages_read += 1
+            yield page
+
+def test_ii_reader_reads_pages_after_regular_fees(tmp_path):
+    d = tmp_path / "ii_pages"
+    d.mkdir()
+    (d / "Statement 2025-06-30.pdf").write_text("dummy")
+
+    extractor = PagedPDFExtractor([
+        "Total Portfolio Value £ 13,273.19",
+        "Activities - ISA\n12 Jun 2025 Monthly Subscription £ 1,000.00",
+        "Regular Fees\n10 Jun 2025 Total Monthly Fee £ 4.99 3657992 PAID",
+        "Holdings\nVanguard LifeStrategy 80% £ 13,273.19",
+        "20 Jun 2025 SUBSCRIPTION £ 50.00",
+    ])
+    portfolio = InteractiveInvestorReader(extractor).read_all(str(d))
+
+    # A page without fees after the fee section does not end the read
+    assert extractor.pages_read == 5
+    assert portfolio.current_value == 13273.19
+    assert sorted(tx.amount for tx in portfolio.transactions) == [-1000.0, -50.0, -4.99]
+
+def test_ii_reader_fallback_value_split_across_lines(tmp_path):
+    d = tmp_path / "ii_fallback"
+    d.mkdir()
+    (d / "Statement 2025-06-30.pdf").write_text("dummy")
+
+    portfolio = InteractiveInvestorReader(FakePDFExtractor("Total account value\n£ 2,500.00")).read_all(str(d))
+
+    assert portfolio.current_value == 2500.0
+
+    # Blank lines between the label and its value are skipped
+    portfolio = InteractiveInvestorReader(FakePDFExtractor("Total Account Value\n\n£ 99.00")).read_all(str(d))
+
+    assert portfolio.current_value == 99.0
+
+def test_ii_reader_reads_currency_symbols(tmp_path):
+    d = tmp_path / "ii"
+    d.mkdir()
+    (d / "Statement 2025-09-30.pdf").write_text("dummy")
+    text = """
+    Total Portfolio Value $ 9,000.00 $ 1,000.00 $ 10,000.00
+    23 Nov 2024 SUBSCRIPTION $ 1,000.00
+    12 Dec 2024 SUBSCRIPTION € 500.00
+    14 Dec 2024 SUBSCRIPTION 200.00
+    10 Jan 2025 Total Monthly Fee £ 4.99
+    """
+
+    portfolio = InteractiveInvestorReader(FakePDFExtractor(text), currency="USD").read_all(str(d))
+
+    assert portfolio.currency == "USD"
+    assert portfolio.current_value == 10000.0
+    # Amounts without a symbol are in the account's currency
+    assert [(t.amount, t.currency) for t in portfolio.transactions] == [
+        (-1000.0, "USD"), (-500.0, "EUR"), (-200.0, "USD"), (-4.99, "GBP")]
+
+def test_ii_reader_fee_amount_wrapped_onto_next_line(tmp_path):
+    d = tmp_path / "ii_wrapped"
+    d.mkdir()
+    (d / "Statement 2025-06-30.pdf").write_text("dummy")
+    text = "\n".join([
+        "Total Portfolio Value £ 2,000.00 £ 500.00 £ 2,500.00",
+        "Regular Fees",
+        "10 May 2025 Total Monthly Fee £ 4.99 3657992 PAID",
+        "10 Jun 2025 Total Monthly Fee",
+        "£ 4.99 3657993 PAID",
+        "10 Jul 2025 Total Monthly Fee",
+        "",
+        "£ 4.99 3657994 PAID",
+    ])
+    # Fees used to be found with one search over the whole text, across line breaks
+    baseline = re.findall(r"(\d{1,2} [A-Za-z]{3} \d{4})\s+Total Monthly Fee\s+£\s*([\d,]+\.\d{2})", text)
+
+    portfolio = InteractiveInvestorReader(FakePDFExtractor(text)).read_all(str(d))
+
+    assert len(baseline) == 3
+    assert [(t.date, t.amount) for t in portfolio.transactions] == [
+        (datetime.strptime(day, "%d %b %Y").date(), -float(amount)) for day, amount in baseline]
@@ -0,0 +1,22 @@
+import json
+import os
+import pytest
+from src.json_io import atomic_write_json
+
+def test_write_replaces_the_file_and_leaves_no_temporary_files(tmp_path):
+    path = tmp_path / "out" / "results.json"
+    atomic_write_json(str(path), {"a": 1})
+    atomic_write_json(str(path), {"a": 2}, indent=2)
+
+    assert json.loads(path.read_text()) == {"a": 2}
+    assert os.listdir(path.parent) == ["results.json"]
+
+def test_failed_write_keeps_the_previous_file(tmp_path):
+    path = tmp_path / "results.json"
+    atomic_write_json(str(path), {"a": 1})
+
+    with pytest.raises(TypeError):
+        atomic_write_json(str(path), {"a": object()})
+
+    assert json.loads(path.read_text()) == {"a": 1}
+    assert os.listdir(tmp_path) == ["results.json"]
@@ -0,0 +1,42 @@
+import re
+from src.adapters.line_classifier import LineClassifier, LineRule
+
+def test_classifier_yields_matches_in_rule_order():
+    classifier = LineClassifier([
+        LineRule("value", re.compile(r"Total value £(\d+)"), ("total value",)),
+        LineRule("deposit", re.compile(r"input £(\d+)"), ("input",), find_all=True),
+    ])
+
+    matches = [(name, m.group(1)) for name, m in classifier.matches("input £5 input £7 Total value £12")]
+
+    assert matches == [("value", "12"), ("deposit", "5"), ("deposit", "7")]
+
+def test_keywords_only_prefilter_and_pattern_decides():
+    classifier = LineClassifier([LineRule("value", re.compile(r"Total value"), ("total value",))])
+
+    assert list(classifier.matches("Holdings page")) == []
+    # Keywords are case-insensitive, but the case-sensitive pattern still rejects the line
+    assert list(classifier.matches("TOTAL VALUE")) == []
+    assert [name for name, _ in classifier.matches("Total value")] == ["value"]
+
+def test_rule_without_keywords_sees_every_line():
+    classifier = LineClassifier([
+        LineRule("value", re.compile(r"Total value"), ("total value",)),
+        LineRule("date", re.compile(r"\d{4}-\d{2}-\d{2}")),
+    ])
+
+    assert [name for name, _ in classifier.matches("2023-11-03")] == ["date"]
+
+def test_wrapped_entries_are_matched_across_the_line_break():
+    classifier = LineClassifier([
+        LineRule("deposit", re.compile(r"(\d{4}-\d{2}-\d{2}) input\s+£(\d+)"), ("input",), find_all=True,
+                 wrap=re.compile(r"\d{4}-\d{2}-\d{2} input\s*$")),
+    ])
+
+    line, next_line = "2023-11-03 input £5 2023-11-04 input", "£7 and more"
+
+    assert [m.group(2) for _, m in classifier.matches(line)] == ["5"]
+    assert [m.groups() for _, m in classifier.wrapped(line, [next_line])] == [("2023-11-04", "7")]
+    assert list(classifier.wrapped("2023-11-03 input £5", [next_line])) == []
+    # The pattern decides how many following lines the entry spans
+    assert [m.groups() for _, m in classifier.wrapped(line, ["", next_line])] == [("2023-11-04", "7")]
@@ -0,0 +1,70 @@
+import os
+from datetime import date
+import pytest
+from src.domain.model import Transaction, Portfolio, Valuation
+from src.domain.projection import project
+from src.ports.chart_generator import ChartRequest
+from src.adapters.matplotlib_chart_generator import MatplotlibChartGenerator, _figure
+
+RESULTS = {"Moneyfarm": (0.07, 0.12), "Interactive Investor": (0.05, 0.09)}
+
+def test_unchanged_results_skip_rendering(tmp_path):
+    path = str(tmp_path / "chart.png")
+    generator = MatplotlibChartGenerator()
+
+    assert generator.generate_performance_chart(RESULTS, path) is True
+    mtime = os.stat(path).st_mtime_ns
+    assert generator.generate_performance_chart(RESULTS, path) is False
+    assert os.stat(path).st_mtime_ns == mtime
+
+    changed = dict(RESULTS, Moneyfarm=(0.08, 0.12))
+    assert generator.generate_performance_chart(changed, path) is True
+
+def test_settings_and_missing_output_invalidate_the_cache(tmp_path):
+    path = str(tmp_path / "chart.png")
+    MatplotlibChartGenerator().generate_performance_chart(RESULTS, path)
+
+    assert MatplotlibChartGenerator(dpi=50).generate_performance_chart(RESULTS, path) is True
+    os.remove(path)
+    assert MatplotlibChartGenerator(dpi=50).generate_performance_chart(RESULTS, path) is True
+
+def make_portfolio(currency: str = "GBP") -> Portfolio:
+    return Portfolio(
+        name="Moneyfarm",
+        transactions=[Transaction(date(2023, 1, 1), -1000.0, "Deposit"), Transaction(date(2023, 7, 1), -500.0, "Deposit")],
+        current_value=1600.0,
+        current_date=date(2023, 12, 31),
+        valuations=[Valuation(date(2023, 6, 30), 1050.0), Valuation(date(2023, 12, 31), 1600.0)],
+        currency=currency,
+    )
+
+def test_batch_renders_every_kind_of_chart(tmp_path):
+    portfolio = make_portfolio()
+    history = {"Moneyfarm": [(date(2023, 6, 30), 0.1), (date(2023, 12, 31), 0.08)]}
+    requests = [
+        ChartRequest("comparison", RESULTS, str(tmp_path / "comparison.png")),
+        ChartRequest("account", portfolio, str(tmp_path / "account.png")),
+        ChartRequest("history", history, str(tmp_path / "history.png")),
+        ChartRequest("projection", project(portfolio, 0.06, 0.15, years=5, paths=500, rng=0), str(tmp_path / "projection.png")),
+    ]
+    generator = MatplotlibChartGenerator()
+
+    assert generator.render_charts(requests) == [True, True, True, True]
+    assert all(os.path.getsize(r.output_path) > 0 for r in requests)
+    assert generator.render_charts(requests) == [False, False, False, False]
+
+def test_unknown_chart_kind_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        MatplotlibChartGenerator().render_charts([ChartRequest("pie", {}, str(tmp_path / "pie.png"))])
+
+def test_value_axes_are_labelled_with_the_portfolio_currency(tmp_path):
+    # Portfolios are converted to the reporting currency before charts are drawn
+    portfolio = make_portfolio("USD")
+    generator = MatplotlibChartGenerator()
+    fig = _figure(generator.figsize, generator.dpi)
+
+    for kind, data in (("account", portfolio), ("projection", project(portfolio, 0.06, 0.15, years=5, paths=100, rng=0))):
+        fig.clear()
+        ax = fig.add_subplot()
+        getattr(generator, f"_draw_{kind}")(ax, ChartRequest(kind, data, str(tmp_path / f"{kind}.png")))
+        assert ax.get_ylabel() == "Value (USD)"
@@ -1,8 +1,11 @@
+import re
 from datetime import date
 from typing import List
 from src.domain.model import Transaction
-from src.ports.pdf_extractor import PDFExtractor
+from src.ports.pdf_extractor import PDFExtractor, PageContent
 from src.adapters.moneyfarm_reader import MoneyfarmReader
+from src.adapters.pdf_statement_reader import ParsedStatement
+from src.instrumentation import Instrumentation
 import os
 
 class FakePDFExtractor(PDFExtractor):
@@ -43,3 +46,148 @@ def test_moneyfarm_reader_parsing(tmp_path):
     assert len(portfolio.transactions) == 3
     # Bank input should be negative (deposit)
     assert portfolio.transactions[0].amount == -2000.0
+
+class CountingPDFExtractor(PDFExtractor):
+    def __init__(self, texts: dict):
+        self.texts = texts
+        self.extracted: List[str] = []
+
+    def extract_tables(self, file_path: str) -> List[List[List[str]]]:
+        return []
+
+    def extract_text(self, file_path: str) -> str:
+        filename = os.path.basename(file_path)
+        self.extracted.append(filename)
+        return self.texts[filename]
+
+def test_moneyfarm_reader_incremental_only_parses_new_statements(tmp_path):
+    d = tmp_path / "moneyfarm"
+    d.mkdir()
+    manifest = str(tmp_path / "manifest.json")
+    texts = {
+        "23_q3.pdf": "Total account value £1,000.00\n2023-08-01 Bank input £1,000.00",
+        "23_q4.pdf": "Total account value £3,077.39\n2023-08-01 Bank input £1,000.00\n2023-11-03 Bank input £2,000.00",
+        "24_q1.pdf": "Total account value £3,500.00\n2024-01-05 Bank input £250.00",
+    }
+    for filename in ["23_q3.pdf", "23_q4.pdf"]:
+        (d / filename).write_text(filename)
+
+    first = CountingPDFExtractor(texts)
+    MoneyfarmReader(first, manifest_path=manifest).read_all(str(d))
+    assert first.extracted == ["23_q3.pdf", "23_q4.pdf"]
+
+    (d / "24_q1.pdf").write_text("24_q1.pdf")
+    second = CountingPDFExtractor(texts)
+    portfolio = MoneyfarmReader(second, manifest_path=manifest).read_all(str(d))
+
+    assert second.extracted == ["24_q1.pdf"]
+    assert portfolio == MoneyfarmReader(CountingPDFExtractor(texts)).read_all(str(d))
+    assert len(portfolio.transactions) == 3
+    assert portfolio.current_value == 3500.0
+    assert portfolio.current_date == date(2024, 3, 31)
+    assert [(v.date, v.value) for v in portfolio.valuations] == [
+        (date(2023, 9, 30), 1000.0),
+        (date(2023, 12, 31), 3077.39),
+        (date(2024, 3, 31), 3500.0),
+    ]
+
+    # A changed statement is parsed again
+    (d / "23_q4.pdf").write_text("23_q4.pdf, reissued")
+    third = CountingPDFExtractor(texts)
+    MoneyfarmReader(third, manifest_path=manifest).read_all(str(d))
+    assert third.extracted == ["23_q4.pdf"]
+
+def test_moneyfarm_reader_records_per_file_metrics(tmp_path):
+    d = tmp_path / "moneyfarm"
+    d.mkdir()
+    (d / "23_q4.pdf").write_text("dummy")
+    instrumentation = Instrumentation()
+
+    reader = MoneyfarmReader(FakePDFExtractor("Total account value £3,077.39\n2023-11-03 Bank input £2,000.00", []),
+                             instrumentation=instrumentation)
+    reader.read_all(str(d))
+
+    record, = instrumentation.files
+    assert record["path"].endswith("23_q4.pdf")
+    assert (record["pages"], record["lines"], record["matches"]) == (1, 2, 2)
+    assert set(instrumentation.stages) == {"ingest", "dedup"}
+
+def test_merged_transactions_are_date_sorted_and_deduplicated():
+    older = ParsedStatement(1000.0, [
+        Transaction(date(2023, 9, 1), -500.0, "Bank input"),
+        Transaction(date(2023, 8, 1), -1000.0, "Bank input"),
+    ])
+    newer = ParsedStatement(2000.0, [
+        Transaction(date(2023, 8, 1), -1000.0, "Bank input (repeated)"),
+        Transaction(date(2023, 8, 1), -250.0, "Bank input"),
+        Transaction(date(2023, 11, 3), -500.0, "Bank input"),
+    ])
+
+    merged = list(MoneyfarmReader._merge_transactions([older, newer]))
+
+    assert merged == [
+        Transaction(date(2023, 8, 1), -1000.0, "Bank input"),
+        Transaction(date(2023, 8, 1), -250.0, "Bank input"),
+        Transaction(date(2023, 9, 1), -500.0, "Bank input"),
+        Transaction(date(2023, 11, 3), -500.0, "Bank input"),
+    ]
+
+class TableValueReader(MoneyfarmReader):
+    """Takes the account value from a summary table instead of the text."""
+    needs_tables = True
+
+    def _parse_document(self, contents) -> ParsedStatement:
+        contents = list(contents)
+        statement = self._parse_pages(c.text for c in contents)
+        for content in contents:
+            for table in content.tables:
+                for label, value in table:
+                    if label == "Account value":
+                        statement.account_value = float(value)
+        return statement
+
+class DocumentPDFExtractor(FakePDFExtractor):
+    def iter_document(self, file_path, pages=None):
+        self.document_reads = getattr(self, "document_reads", 0) + 1
+        yield PageContent(self.text, self.tables)
+
+def test_reader_can_parse_text_and_tables_from_one_pass(tmp_path):
+    d = tmp_path / "moneyfarm"
+    d.mkdir()
+    (d / "23_q4.pdf").write_text("dummy")
+    extractor = DocumentPDFExtractor("2023-11-03 Bank input £2,000.00", [[["Account value", "3077.39"]]])
+
+    portfolio = TableValueReader(extractor).read_all(str(d))
+
+    assert extractor.document_reads == 1
+    assert portfolio.current_value == 3077.39
+    assert len(portfolio.transactions) == 1
+
+# How transactions were found before line-by-line parsing: one search over the whole text
+BASELINE_TRANSACTION = re.compile(r"(\d{4}-\d{2}-\d{2})\s+(.*?)\s+£\s*([\d,]+(?:\.\d{2})?)")
+
+def test_wrapped_amounts_match_whole_text_parsing(tmp_path):
+    d = tmp_path / "moneyfarm"
+    d.mkdir()
+    (d / "23_q4.pdf").write_text("dummy")
+    text = "\n".join([
+        "Total account value At 31 December 2023 £3,077.39",
+        "2023-11-03 Bank input",
+        "£2,000.00",
+        "2023-11-17 Bank input £700.00 2023-11-20 Withdrawal",
+        "£100.00 Portfolio rebalancing",
+        "2023-12-21 Bank input £250.00",
+        "2023-12-22 Bank input",
+        "Holdings Fund £10.00",
+        "2024-05-03",
+        "Bank input £200.00",
+        "2024-05-10 Withdrawal",
+        "",
+        "£50.00",
+    ])
+    baseline = [(date.fromisoformat(d), float(a.replace(",", ""))) for d, _, a in BASELINE_TRANSACTION.findall(text)]
+
+    portfolio = MoneyfarmReader(FakePDFExtractor(text, [])).read_all(str(d))
+
+    assert sorted((t.date, abs(t.amount)) for t in portfolio.transactions) == sorted(baseline)
+    assert sorted(t.amount for t in portfolio.transactions) == [-2000.0, -700.0, -250.0, -200.0, 50.0, 100.0]
@@ -0,0 +1,103 @@
+import asyncio
+import json
+import threading
+import time
+from datetime import date
+import pytest
+from src.domain.model import Transaction, Portfolio
+from src.domain.service import PerformanceService
+from src.instrumentation import Instrumentation
+from src.orchestration import InlineExecutor, ProviderJob, run_outputs, run_providers, write_results
+from src.ports.statement_reader import StatementReader
+
+class SleepingReader(StatementReader):
+    """Simulates a slow, blocking provider read."""
+
+    def __init__(self, delay: float, fail: bool = False):
+        self.delay = delay
+        self.fail = fail
+        self.finished = False
+
+    def read_all(self, directory: str) -> Portfolio:
+        time.sleep(self.delay)
+        if self.fail:
+            raise ValueError(f"cannot read {directory}")
+        self.finished = True
+        return Portfolio(
+            name=directory,
+            transactions=[Transaction(date(2023, 1, 1), -1000.0, "Deposit")],
+            current_value=1100.0,
+            current_date=date(2024, 1, 1),
+        )
+
+def test_providers_are_read_concurrently_and_returned_in_job_order():
+    jobs = [ProviderJob("Slow", SleepingReader(0.3), "slow"), ProviderJob("Fast", SleepingReader(0.1), "fast")]
+    finished = []
+    instrumentation = Instrumentation()
+
+    start = time.perf_counter()
+    outcomes = asyncio.run(run_providers(jobs, PerformanceService(instrumentation),
+                                         on_outcome=lambda o: finished.append(o.name)))
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.35
+    assert finished == ["Fast", "Slow"]
+    assert [o.name for o in outcomes] == ["Slow", "Fast"]
+    assert round(outcomes[0].xirr, 2) == 0.10
+    assert round(outcomes[0].simple_return, 2) == 0.10
+    # Each provider's evaluation is timed in the run report
+    assert set(instrumentation.stages) == {"xirr"}
+    assert instrumentation.counters["xirr_solves"] == 2
+
+def test_concurrency_limit_is_respected():
+    jobs = [ProviderJob(str(i), SleepingReader(0.1), str(i)) for i in range(2)]
+
+    start = time.perf_counter()
+    asyncio.run(run_providers(jobs, PerformanceService(), max_concurrency=1))
+
+    assert time.perf_counter() - start >= 0.2
+
+def test_failing_provider_cancels_the_rest():
+    pending = SleepingReader(0.1)
+    jobs = [
+        ProviderJob("Broken", SleepingReader(0.0, fail=True), "broken"),
+        ProviderJob("Running", SleepingReader(0.2), "running"),
+        ProviderJob("Queued", pending, "queued"),
+    ]
+
+    with pytest.raises(ValueError, match="cannot read broken"):
+        asyncio.run(run_providers(jobs, PerformanceService(), max_concurrency=2))
+    time.sleep(0.3)
+
+    # The queued read never started
+    assert not pending.finished
+
+def test_inline_executor_keeps_provider_work_on_the_calling_thread():
+    threads = []
+
+    class RecordingReader(SleepingReader):
+        def read_all(self, directory: str) -> Portfolio:
+            threads.append(threading.get_ident())
+            return super().read_all(directory)
+
+    jobs = [ProviderJob(str(i), RecordingReader(0.0), str(i)) for i in range(2)]
+    outcomes = asyncio.run(run_providers(jobs, PerformanceService(), executor=InlineExecutor()))
+
+    # cProfile enabled on this thread would see both reads
+    assert threads == [threading.get_ident()] * 2
+    assert [o.name for o in outcomes] == ["0", "1"]
+
+def test_outputs_run_concurrently_and_results_are_written(tmp_path):
+    jobs = [ProviderJob("Account", SleepingReader(0.0), "account")]
+    outcomes = asyncio.run(run_providers(jobs, PerformanceService(), twr=True))
+    path = tmp_path / "out" / "results.json"
+
+    start = time.perf_counter()
+    asyncio.run(run_outputs([lambda: time.sleep(0.2), lambda: write_results(outcomes, str(path))]))
+
+    assert time.perf_counter() - start < 0.35
+    data = json.loads(path.read_text())
+    assert data["Account"]["current_value"] == 1100.0
+    assert data["Account"]["as_of"] == "2024-01-01"
+    # A single valuation point has no time-weighted return
+    assert data["Account"]["twr"] == {"annualised": None, "cumulative": None, "yearly": {}}
@@ -0,0 +1,71 @@
+from datetime import date
+from benchmarks.corpus import write_pdf
+from src.adapters.pdf_plumber_extractor import PdfPlumberExtractor
+from src.adapters.pdf_content_stream import raw_page_text, squash
+from src.adapters.caching_pdf_extractor import CachingPDFExtractor
+from src.adapters.moneyfarm_reader import MoneyfarmReader
+
+PAGES = [
+    "Moneyfarm Stocks and Shares ISA\nTotal account value At 31 December 2023 £3,077.39\n2023-11-03 Bank input £2,000.00",
+    "Holdings\nFund Units Price Value\nVanguard FTSE Global All Cap Index 10.000 (acc) 1.0000 £10.00",
+    "Important information\nPast performance is not a reliable indicator of future results.",
+    "2023-12-21 Bank input £250.00",
+]
+
+def test_probe_finds_keyword_pages_without_layout_extraction(tmp_path):
+    path = str(tmp_path / "statement.pdf")
+    write_pdf(path, PAGES)
+    extractor = PdfPlumberExtractor()
+
+    assert extractor.probe_pages(path, ["Total account value", "bank input"]) == [0, 3]
+    assert extractor.probe_pages(path, ["(acc)"]) == [1]
+    assert list(extractor.iter_pages(path, [3, 0])) == [PAGES[3], PAGES[0]]
+
+def test_raw_stream_text_matches_decoded_characters(tmp_path):
+    import pdfplumber
+    path = str(tmp_path / "statement.pdf")
+    write_pdf(path, PAGES)
+
+    with pdfplumber.open(path) as pdf:
+        for page in pdf.pages:
+            raw = raw_page_text(page.page_obj)
+            assert raw is not None
+            assert squash(raw) == squash("".join(c["text"] for c in page.chars))
+
+def test_reader_extracts_only_probed_pages(tmp_path):
+    d = tmp_path / "moneyfarm"
+    d.mkdir()
+    write_pdf(str(d / "23_q4.pdf"), PAGES)
+    cache = str(tmp_path / "cache.sqlite")
+
+    reader = MoneyfarmReader(CachingPDFExtractor(PdfPlumberExtractor(), cache))
+    portfolio = reader.read_all(str(d))
+    all_pages = MoneyfarmReader(PdfPlumberExtractor())
+    all_pages.page_keywords = ()
+
+    assert portfolio == all_pages.read_all(str(d))
+    assert portfolio.current_value == 3077.39
+    assert [t.date for t in portfolio.transactions] == [date(2023, 11, 3), date(2023, 12, 21)]
+    assert reader.instrumentation.counters["pages"] == 2
+
+    # Probe results are cached per file alongside the extracted text
+    warm = CachingPDFExtractor(PdfPlumberExtractor(), cache)
+    MoneyfarmReader(warm).read_all(str(d))
+    assert (warm.stats.hits, warm.stats.misses) == (2, 0)
+
+def test_document_pass_opens_the_file_once(tmp_path, monkeypatch):
+    import pdfplumber
+    path = str(tmp_path / "statement.pdf")
+    write_pdf(path, PAGES)
+    extractor = PdfPlumberExtractor()
+    expected_text = list(extractor.iter_pages(path))
+    expected_tables = extractor.extract_tables(path)
+
+    opened = []
+    real_open = pdfplumber.open
+    monkeypatch.setattr(pdfplumber, "open", lambda *args, **kwargs: opened.append(args) or real_open(*args, **kwargs))
+    contents = list(extractor.iter_document(path))
+
+    assert len(opened) == 1
+    assert [c.text for c in contents] == expected_text
+    assert [t for c in contents for t in c.tables] == expected_tables
@@ -0,0 +1,50 @@
+import time
+from datetime import date
+import numpy as np
+from src.domain.model import Transaction, Portfolio
+from src.domain.projection import ContributionSchedule, contribution_schedule, project
+
+def make_portfolio(transactions, current_value=5000.0) -> Portfolio:
+    return Portfolio(name="Moneyfarm", transactions=transactions, current_value=current_value, current_date=date(2024, 12, 31))
+
+def test_schedule_follows_the_deposit_cadence():
+    monthly = [Transaction(date(2024, m, 1), -200.0, "Deposit") for m in range(1, 13)]
+    quarterly = [Transaction(date(2024, m, 5), -900.0, "Deposit") for m in (1, 4, 7, 10)]
+    withdrawal = [Transaction(date(2024, 6, 1), 600.0, "Withdrawal")]
+
+    assert contribution_schedule(make_portfolio(monthly)) == ContributionSchedule(200.0, 1)
+    assert contribution_schedule(make_portfolio(quarterly + withdrawal)) == ContributionSchedule(750.0, 3)
+    assert contribution_schedule(make_portfolio([Transaction(date(2020, 1, 1), -1000.0, "Deposit")])).per_year == 0.0
+
+def test_zero_volatility_matches_compound_growth():
+    portfolio = make_portfolio([], current_value=1000.0)
+    schedule = ContributionSchedule(100.0, 12)
+
+    result = project(portfolio, 0.05, 0.0, years=3, paths=10, schedule=schedule, rng=0)
+
+    expected = [1000.0, 1150.0, 1307.5, 1472.875]
+    for percentile in result.percentiles:
+        np.testing.assert_allclose(result.band(percentile), expected)
+    np.testing.assert_allclose(result.contributed, [0.0, 100.0, 200.0, 300.0])
+    assert result.dates[-1] == date(2027, 12, 31)
+
+def test_seeded_projections_are_reproducible_and_ordered():
+    portfolio = make_portfolio([Transaction(date(2024, m, 1), -200.0, "Deposit") for m in range(1, 13)])
+
+    first = project(portfolio, 0.06, 0.15, years=10, paths=5000, rng=42, chunk_size=1000)
+    second = project(portfolio, 0.06, 0.15, years=10, paths=5000, rng=np.random.default_rng(42), chunk_size=1000)
+
+    np.testing.assert_array_equal(first.bands, second.bands)
+    assert np.all(np.diff(first.bands[:, 1:], axis=0) > 0)
+    # Median growth is the requested rate, so the median path ends near the deterministic value
+    deterministic = project(portfolio, 0.06, 0.0, years=10, paths=1)
+    assert abs(first.band(50)[-1] / deterministic.band(50)[-1] - 1) < 0.05
+
+def test_hundred_thousand_paths_over_thirty_years_run_in_seconds():
+    portfolio = make_portfolio([Transaction(date(2024, m, 1), -200.0, "Deposit") for m in range(1, 13)])
+
+    started = time.perf_counter()
+    result = project(portfolio, 0.06, 0.15, years=30, paths=100_000, rng=1)
+
+    assert time.perf_counter() - started < 10
+    assert result.bands.shape == (5, 31)
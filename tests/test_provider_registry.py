@@ -0,0 +1,78 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from benchmarks.corpus import CorpusSpec, TextCorpusExtractor, generate_corpus
+from src.adapters.moneyfarm_reader import MoneyfarmReader
+from src.adapters.caching_pdf_extractor import CachingPDFExtractor
+from src.adapters.pdfminer_text_extractor import PdfMinerTextExtractor
+from src.adapters.provider_registry import PROVIDERS, AccountConfig, build_reader, load_accounts
+from src.ports.pdf_extractor import TablesNotSupportedError
+
+def write_config(tmp_path, accounts) -> str:
+    path = tmp_path / "accounts.json"
+    path.write_text(json.dumps({"accounts": accounts}))
+    return str(path)
+
+def test_load_accounts_resolves_directories_against_the_config(tmp_path):
+    path = write_config(tmp_path, [
+        {"name": "Moneyfarm ISA", "provider": "moneyfarm", "directory": "statements/mf-isa"},
+        {"name": "II SIPP", "provider": "interactive-investor", "directory": "/data/ii-sipp"},
+    ])
+
+    accounts = load_accounts(path)
+
+    assert accounts[0] == AccountConfig("Moneyfarm ISA", "moneyfarm", os.path.join(str(tmp_path), "statements/mf-isa"))
+    assert accounts[1].directory == "/data/ii-sipp"
+    assert accounts[1].slug == "ii-sipp"
+
+@pytest.mark.parametrize("accounts", [
+    [{"name": "A", "provider": "vanguard", "directory": "a"}],
+    [{"name": "A", "provider": "moneyfarm", "directory": "a", "extractor": "ocr"}],
+    [{"name": "A", "provider": "moneyfarm", "directory": "a", "currency": "usd"}],
+    [{"name": "A", "provider": "moneyfarm", "directory": "a"}, {"name": "A", "provider": "moneyfarm", "directory": "b"}],
+    [{"name": "MF ISA", "provider": "moneyfarm", "directory": "a"},
+     {"name": "mf-isa", "provider": "moneyfarm", "directory": "b"}],
+    [{"name": "£", "provider": "moneyfarm", "directory": "a"}],
+])
+def test_invalid_configs_are_rejected(tmp_path, accounts):
+    with pytest.raises(ValueError):
+        load_accounts(write_config(tmp_path, accounts))
+
+def test_accounts_of_the_same_provider_share_resources(tmp_path):
+    generated = generate_corpus(str(tmp_path), CorpusSpec(accounts=2, years=1), providers=("moneyfarm",))
+    extractor = TextCorpusExtractor()
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        readers = [build_reader(AccountConfig(f"Moneyfarm {i}", "moneyfarm", a.directory),
+                                extractor=extractor, workers=2, executor=pool)
+                   for i, a in enumerate(generated)]
+        portfolios = [reader.read_all(a.directory) for reader, a in zip(readers, generated)]
+
+    assert all(isinstance(reader, MoneyfarmReader) and reader.extractor is extractor for reader in readers)
+    assert [p.name for p in portfolios] == ["Moneyfarm 0", "Moneyfarm 1"]
+    for portfolio, account in zip(portfolios, generated):
+        assert sorted((t.date, t.amount) for t in portfolio.transactions) == sorted((t.date, t.amount) for t in account.transactions)
+
+class TableReader(MoneyfarmReader):
+    needs_tables = True
+
+def test_readers_needing_tables_reject_the_fast_extractor(tmp_path, monkeypatch):
+    monkeypatch.setitem(PROVIDERS, "tables", TableReader)
+
+    with pytest.raises(ValueError, match="tables"):
+        load_accounts(write_config(tmp_path, [{"name": "A", "provider": "tables", "directory": "a", "extractor": "fast"}]))
+    # The run's default extractor is only known when the reader is built
+    with pytest.raises(TablesNotSupportedError):
+        build_reader(AccountConfig("A", "tables", "a"),
+                     extractor=CachingPDFExtractor(PdfMinerTextExtractor(), str(tmp_path / "cache.sqlite")))
+
+def test_fast_extractor_refuses_table_requests(tmp_path):
+    path = str(tmp_path / "23_q4.pdf")
+    extractor = PdfMinerTextExtractor()
+
+    # Callers that skip the supports_tables check get a clear error, before the file is even opened
+    with pytest.raises(TablesNotSupportedError, match="PdfMinerTextExtractor cannot extract tables"):
+        extractor.extract_tables(path)
+    with pytest.raises(TablesNotSupportedError, match="PdfMinerTextExtractor"):
+        next(extractor.iter_document(path))
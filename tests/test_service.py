@@ -1,5 +1,6 @@
+import math
 from datetime import date
-from src.domain.model import Transaction, Portfolio
+from src.domain.model import Transaction, Portfolio, Valuation
 from src.domain.service import PerformanceService
 
 def test_calculate_xirr_simple_growth():
@@ -39,3 +40,81 @@ def test_calculate_xirr_with_mid_year_deposit():
     # 2100 - 2000 = 100 profit. 
     # Average capital ~ 1500 (rough). 100/1500 ~ 6.6%.
     assert 0.06 < result < 0.08
+
+def test_calculate_xirr_returns_nan_when_unsolvable():
+    # Only deposits and a zero closing value: no rate makes the NPV zero
+    service = PerformanceService()
+    portfolio = Portfolio(
+        name="Test",
+        transactions=[
+            Transaction(date=date(2023, 1, 1), amount=-1000.0, description="Initial")
+        ],
+        current_value=0.0,
+        current_date=date(2024, 1, 1)
+    )
+
+    assert math.isnan(service.calculate_xirr(portfolio))
+    assert not service.calculate_xirr_result(portfolio).converged
+
+def test_calculate_xirr_series_matches_point_in_time_solves():
+    service = PerformanceService()
+    transactions = [
+        Transaction(date=date(2023, 1, 1), amount=-1000.0, description="Initial"),
+        Transaction(date=date(2023, 7, 1), amount=-1000.0, description="Mid"),
+        Transaction(date=date(2024, 2, 1), amount=-500.0, description="Top up"),
+    ]
+    valuations = [
+        Valuation(date(2023, 6, 30), 1040.0),
+        Valuation(date(2023, 12, 31), 2100.0),
+        Valuation(date(2024, 6, 30), 2750.0),
+    ]
+    portfolio = Portfolio("Test", transactions, 2750.0, date(2024, 6, 30), valuations)
+
+    series = service.calculate_xirr_series(portfolio)
+
+    assert [d for d, _ in series] == [v.date for v in valuations]
+    for as_of, result in series:
+        snapshot = Portfolio(
+            "Test",
+            [tx for tx in transactions if tx.date <= as_of],
+            next(v.value for v in valuations if v.date == as_of),
+            as_of,
+        )
+        assert result.converged
+        assert math.isclose(result.rate, service.calculate_xirr(snapshot), rel_tol=1e-8)
+    # The final point is the headline XIRR
+    assert math.isclose(series[-1][1].rate, service.calculate_xirr(portfolio), rel_tol=1e-8)
+
+def test_calculate_xirr_series_without_prior_flows_fails_cleanly():
+    service = PerformanceService()
+    portfolio = Portfolio(
+        "Test",
+        [Transaction(date(2023, 7, 1), -1000.0, "Initial")],
+        1100.0,
+        date(2024, 7, 1),
+        [Valuation(date(2023, 3, 31), 0.0), Valuation(date(2024, 7, 1), 1100.0)],
+    )
+
+    first, last = service.calculate_xirr_series(portfolio)
+
+    assert not first[1].converged
+    assert last[1].converged
+
+def test_calculate_twr_ends_at_the_current_value():
+    service = PerformanceService()
+    portfolio = Portfolio(
+        name="Test",
+        transactions=[
+            Transaction(date=date(2023, 1, 1), amount=-1000.0, description="Initial"),
+            Transaction(date=date(2023, 7, 1), amount=-1000.0, description="Top up"),
+        ],
+        current_value=2310.0,
+        current_date=date(2024, 1, 1),
+        valuations=[Valuation(date(2023, 1, 1), 1000.0), Valuation(date(2023, 7, 1), 2100.0)],
+    )
+
+    result = service.calculate_twr(portfolio)
+
+    # 10% in each half, whatever was paid in
+    assert math.isclose(result.cumulative, 0.21)
+    assert result.end == date(2024, 1, 1)
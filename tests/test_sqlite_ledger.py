@@ -0,0 +1,117 @@
+import os
+from datetime import date
+from typing import List
+import pytest
+from src.domain.model import Transaction, Valuation
+from src.domain.service import PerformanceService
+from src.ports.pdf_extractor import PDFExtractor
+from src.adapters.moneyfarm_reader import MoneyfarmReader
+from src.adapters.sqlite_ledger import SqliteLedger, LedgerStatement, LedgerStatementReader
+
+class FileTextExtractor(PDFExtractor):
+    def __init__(self, texts: dict):
+        self.texts = texts
+
+    def extract_tables(self, file_path: str) -> List[List[List[str]]]:
+        return []
+
+    def extract_text(self, file_path: str) -> str:
+        return self.texts[os.path.basename(file_path)]
+
+TEXTS = {
+    "23_q3.pdf": """
+    Total account value At 30 September 2023 £1,020.00
+    2023-08-01 Bank input £1,000.00
+    """,
+    "23_q4.pdf": """
+    Total account value At 31 December 2023 £1,540.00
+    2023-08-01 Bank input £1,000.00
+    2023-11-03 Bank input £500.00
+    """,
+}
+
+def make_statements(tmp_path) -> str:
+    d = tmp_path / "moneyfarm"
+    d.mkdir()
+    for name in TEXTS:
+        (d / name).write_text("dummy")
+    return str(d)
+
+def test_ledger_round_trips_what_the_reader_parsed(tmp_path):
+    directory = make_statements(tmp_path)
+    ledger = SqliteLedger(str(tmp_path / "ledger.sqlite"))
+    parsed = MoneyfarmReader(FileTextExtractor(TEXTS), ledger=ledger).read_all(directory)
+
+    stored = LedgerStatementReader(ledger).read_all(directory)
+
+    assert stored.name == parsed.name
+    assert stored.transactions == parsed.transactions
+    assert stored.current_value == parsed.current_value == 1540.0
+    assert stored.current_date == parsed.current_date
+    assert stored.valuations == parsed.valuations
+
+def test_ledger_keeps_provenance_and_replaces_on_reingest(tmp_path):
+    directory = make_statements(tmp_path)
+    ledger = SqliteLedger(str(tmp_path / "ledger.sqlite"))
+    reader = MoneyfarmReader(FileTextExtractor(TEXTS), ledger=ledger)
+    reader.read_all(directory)
+
+    os.remove(os.path.join(directory, "23_q3.pdf"))
+    reader.read_all(directory)
+
+    conn = ledger._connection()
+    sources = conn.execute("SELECT source_path, parser FROM statements").fetchall()
+    assert sources == [(os.path.abspath(os.path.join(directory, "23_q4.pdf")), "MoneyfarmReader:4:GBP")]
+    # Both transactions are still present because the remaining statement repeats the older one
+    assert conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0] == 2
+
+def test_date_range_values_the_portfolio_as_of_the_end_date(tmp_path):
+    ledger = SqliteLedger(str(tmp_path / "ledger.sqlite"))
+    source = tmp_path / "account"
+    source.mkdir()
+    paths = []
+    for name in ("a.pdf", "b.pdf"):
+        (source / name).write_text("dummy")
+        paths.append(str(source / name))
+    ledger.replace_statements("Account", str(source), "test", [
+        LedgerStatement(paths[0], date(2023, 6, 30), 1000.0, [Transaction(date(2023, 1, 1), -900.0, "Deposit")]),
+        LedgerStatement(paths[1], date(2023, 12, 31), 2100.0, [
+            Transaction(date(2023, 1, 1), -900.0, "Deposit (repeated)"),
+            Transaction(date(2023, 9, 1), -1000.0, "Deposit"),
+        ]),
+    ])
+
+    portfolio = LedgerStatementReader(ledger, end=date(2023, 6, 30)).read_all(str(source))
+
+    assert portfolio.current_value == 1000.0
+    assert portfolio.current_date == date(2023, 6, 30)
+    assert portfolio.transactions == [Transaction(date(2023, 1, 1), -900.0, "Deposit")]
+    assert ledger.valuations("Account", start=date(2023, 7, 1)) == [Valuation(date(2023, 12, 31), 2100.0)]
+
+def test_start_date_opens_the_portfolio_at_its_earlier_value(tmp_path):
+    ledger = SqliteLedger(str(tmp_path / "ledger.sqlite"))
+    source = tmp_path / "account"
+    source.mkdir()
+    paths = []
+    for name in ("a.pdf", "b.pdf", "c.pdf"):
+        (source / name).write_text("dummy")
+        paths.append(str(source / name))
+    ledger.replace_statements("Account", str(source), "test", [
+        LedgerStatement(paths[0], date(2022, 12, 31), 10000.0, [Transaction(date(2020, 1, 1), -5000.0, "Deposit")]),
+        LedgerStatement(paths[1], date(2023, 12, 31), 11000.0, [Transaction(date(2023, 6, 1), -500.0, "Deposit")]),
+        LedgerStatement(paths[2], date(2024, 6, 30), 12000.0, [Transaction(date(2024, 3, 1), -800.0, "Deposit")]),
+    ])
+
+    portfolio = LedgerStatementReader(ledger, start=date(2023, 1, 1), end=date(2024, 1, 31)).read_all(str(source))
+
+    # The 2020 deposit is inside the opening value and the 2024 one is after the valuation used
+    assert portfolio.transactions == [Transaction(date(2022, 12, 31), -10000.0, "Opening value"),
+                                      Transaction(date(2023, 6, 1), -500.0, "Deposit")]
+    assert (portfolio.current_date, portfolio.current_value) == (date(2023, 12, 31), 11000.0)
+    # 10,000 grew to 11,000 over the year with 500 added in June: about 4.86%, not the 2020 deposit's doubling
+    assert PerformanceService().calculate_xirr(portfolio) == pytest.approx(0.0486, abs=1e-4)
+
+def test_reading_an_unknown_directory_fails(tmp_path):
+    ledger = SqliteLedger(str(tmp_path / "ledger.sqlite"))
+    with pytest.raises(ValueError):
+        LedgerStatementReader(ledger).read_all(str(tmp_path / "missing"))
@@ -0,0 +1,14 @@
+import subprocess
+import sys
+
+def test_importing_main_does_not_load_heavy_libraries():
+    probe = "import main, sys; print(','.join(m for m in ('pdfplumber', 'scipy', 'matplotlib', 'pandas') if m in sys.modules))"
+    output = subprocess.run([sys.executable, "-c", probe], check=True, capture_output=True, text=True)
+
+    assert output.stdout.strip() == ""
+
+def test_domain_does_not_depend_on_adapters():
+    probe = "import src.domain.service, sys; print(','.join(m for m in sys.modules if m.startswith('src.adapters')))"
+    output = subprocess.run([sys.executable, "-c", probe], check=True, capture_output=True, text=True)
+
+    assert output.stdout.strip() == ""
@@ -0,0 +1,96 @@
+import os
+import shutil
+from datetime import date
+from benchmarks.corpus import CorpusSpec, generate_corpus, write_pdf
+from src.adapters.pdfminer_text_extractor import PdfMinerTextExtractor
+from src.adapters.provider_registry import AccountConfig, build_classifier, build_reader
+from src.adapters.sqlite_ledger import LedgerStatementReader, SqliteLedger
+from src.adapters.statement_classifier import NOT_PDF, OTHER
+from src.instrumentation import Instrumentation
+
+def make_inbox(tmp_path):
+    """One folder holding both providers' statements, a contract note and a stray download."""
+    accounts = generate_corpus(str(tmp_path / "generated"), CorpusSpec(years=1, holdings_lines=5, boilerplate_pages=0),
+                               pdf=True)
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    for account in accounts:
+        prefix = "mf" if account.provider == "moneyfarm" else "ii"
+        for name in os.listdir(account.directory):
+            shutil.copy(os.path.join(account.directory, name), inbox / f"{prefix}-{name}")
+    write_pdf(str(inbox / "contract-note.pdf"), ["Moneyfarm\nContract note\nBuy 10 units"])
+    (inbox / "download.pdf").write_text("<html>Session expired</html>")
+    return str(inbox), accounts
+
+def test_first_page_tells_providers_and_non_statements_apart(tmp_path):
+    inbox, _ = make_inbox(tmp_path)
+    classifier = build_classifier()
+
+    classifications = {name: classifier.classify(os.path.join(inbox, name)) for name in os.listdir(inbox)}
+
+    for name, classification in classifications.items():
+        if name.startswith("mf-"):
+            assert (classification.provider, classification.kind) == ("moneyfarm", "quarterly statement")
+        elif name.startswith("ii-"):
+            assert (classification.provider, classification.kind) == ("interactive-investor", "monthly statement")
+    contract_note = classifications["contract-note.pdf"]
+    assert (contract_note.provider, contract_note.kind, contract_note.is_statement) == ("moneyfarm", OTHER, False)
+    assert classifications["download.pdf"].kind == NOT_PDF
+
+def test_statement_markers_after_a_cover_page_are_found(tmp_path):
+    path = str(tmp_path / "23_q4.pdf")
+    write_pdf(path, ["Moneyfarm\nYour quarterly pack", "Total account value At 31 December 2023 £3,077.39"])
+
+    classification = build_classifier().classify(path)
+
+    assert (classification.provider, classification.is_statement) == ("moneyfarm", True)
+
+class CountingExtractor:
+    def __init__(self, extractor):
+        self.extractor = extractor
+        self.calls = 0
+
+    def iter_pages(self, file_path, pages=None):
+        self.calls += 1
+        return self.extractor.iter_pages(file_path, pages)
+
+def test_classifications_are_cached_by_content(tmp_path):
+    inbox, _ = make_inbox(tmp_path)
+    statement = os.path.join(inbox, sorted(f for f in os.listdir(inbox) if f.startswith("mf-"))[0])
+    cache_path = str(tmp_path / "cache" / "classification.json")
+    extractor = CountingExtractor(PdfMinerTextExtractor())
+    classifier = build_classifier(extractor, cache_path)
+    first = classifier.classify(statement)
+    classifier.save()
+
+    # A renamed copy in a new run is recognised without opening the PDF
+    renamed = str(tmp_path / "renamed.pdf")
+    shutil.copy(statement, renamed)
+    again = build_classifier(extractor, cache_path).classify(renamed)
+
+    assert again == first and again.provider == "moneyfarm"
+    assert extractor.calls == 1
+
+def test_readers_sharing_an_inbox_read_only_their_own_statements(tmp_path):
+    inbox, accounts = make_inbox(tmp_path)
+    ledger = SqliteLedger(str(tmp_path / "ledger.sqlite"))
+    extractor = PdfMinerTextExtractor()
+    classifier = build_classifier(extractor)
+    instrumentation = Instrumentation()
+
+    portfolios = {}
+    for account in accounts:
+        config = AccountConfig(account.provider, account.provider, inbox)
+        reader = build_reader(config, extractor=extractor, ledger=ledger, classifier=classifier,
+                              instrumentation=instrumentation)
+        portfolios[account.provider] = (reader.read_all(inbox), account)
+
+    for portfolio, account in portfolios.values():
+        expected = sorted((t.date, round(t.amount, 2)) for t in account.transactions)
+        assert sorted((t.date, round(t.amount, 2)) for t in portfolio.transactions) == expected
+        assert portfolio.current_value == account.valuations[-1][1]
+        # Each account keeps its own ledger rows although both come from the same folder
+        stored = LedgerStatementReader(ledger, date(2000, 1, 1), date(2100, 1, 1), account=account.provider).read_all(inbox)
+        assert len(stored.transactions) == len(account.transactions)
+    # Two non-statements plus the other provider's statements, for each reader
+    assert instrumentation.counters["skipped_files"] == 2 * 2 + sum(len(os.listdir(a.directory)) for a in accounts)
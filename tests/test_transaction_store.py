@@ -0,0 +1,43 @@
+from datetime import date
+from src.domain.model import Transaction, Portfolio
+from src.domain.transaction_store import TransactionStore
+
+TRANSACTIONS = [
+    Transaction(date(2024, 3, 1), -500.0, "Bank input"),
+    Transaction(date(2023, 11, 3), -2000.0, "Bank input"),
+    Transaction(date(2024, 3, 1), 100.0, "Withdrawal"),
+    Transaction(date(2023, 12, 21), -250.0, "Bank input"),
+]
+
+def test_store_sorts_by_date_and_keeps_transaction_view():
+    store = TransactionStore.from_transactions(TRANSACTIONS)
+
+    assert [tx.date for tx in store] == [date(2023, 11, 3), date(2023, 12, 21), date(2024, 3, 1), date(2024, 3, 1)]
+    # Same-date transactions keep their original order
+    assert store[2] == Transaction(date(2024, 3, 1), -500.0, "Bank input")
+    assert store[-1].description == "Withdrawal"
+    assert store == sorted(TRANSACTIONS, key=lambda tx: tx.date)
+    # Descriptions are interned
+    assert store.descriptions == ["Bank input", "Withdrawal"]
+
+def test_store_range_and_totals():
+    store = TransactionStore.from_transactions(TRANSACTIONS)
+
+    assert [tx.amount for tx in store.between(date(2023, 12, 1), date(2024, 3, 1))] == [-250.0, -500.0, 100.0]
+    assert len(store.between(end=date(2023, 12, 31))) == 2
+    assert store.total_invested() == 2750.0
+    assert store.total_withdrawn() == 100.0
+
+def test_portfolio_stores_transactions_in_columns():
+    portfolio = Portfolio("Test", TRANSACTIONS, 3000.0, date(2024, 3, 31))
+
+    assert isinstance(portfolio.transactions, TransactionStore)
+    assert portfolio.transactions.amounts.tolist() == [-2000.0, -250.0, -500.0, 100.0]
+
+def test_store_keeps_currencies():
+    store = TransactionStore.from_transactions(TRANSACTIONS + [Transaction(date(2024, 1, 5), -100.0, "Bank input", "USD")])
+
+    assert store.currencies == ["GBP", "USD"]
+    assert store[2] == Transaction(date(2024, 1, 5), -100.0, "Bank input", "USD")
+    assert not store.in_currency("GBP")
+    assert store.between(end=date(2023, 12, 31)).in_currency("GBP")
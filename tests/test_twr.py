@@ -0,0 +1,67 @@
+import math
+import time
+from datetime import date
+import numpy as np
+from src.domain.twr import time_weighted_return
+
+def ordinals(*days: date) -> np.ndarray:
+    return np.array([d.toordinal() for d in days])
+
+def test_twr_without_flows_is_the_growth_of_the_account():
+    valuations = ordinals(date(2021, 1, 1), date(2021, 12, 31), date(2022, 12, 31))
+
+    result = time_weighted_return(valuations, [1000.0, 1100.0, 1210.0], np.array([], dtype=np.int64), [])
+
+    assert math.isclose(result.cumulative, 0.21)
+    assert list(result.yearly_dict()) == [2021, 2022]
+    assert np.allclose(result.yearly.values, [0.10, 0.10])
+    assert math.isclose(result.annualised, 1.21 ** (365.25 / (valuations[-1] - valuations[0])) - 1)
+
+def test_deposits_do_not_count_as_returns():
+    valuations = ordinals(date(2023, 1, 1), date(2023, 7, 1), date(2024, 1, 1))
+    # 1000 paid in on a statement date, then 1000 halfway through the second period
+    deposits = ordinals(date(2022, 12, 1), date(2023, 7, 1), date(2023, 10, 1))
+
+    result = time_weighted_return(valuations, [1000.0, 2100.0, 3200.0], deposits, [-1000.0, -1000.0, -1000.0])
+
+    first, second = result.periods["return"]
+    assert math.isclose(first, 0.10)
+    # Modified Dietz: the mid-period deposit was at work for half of the period
+    weight = (valuations[2] - deposits[2]) / (valuations[2] - valuations[1])
+    assert math.isclose(second, 100.0 / (2100.0 + 1000.0 * weight))
+    assert list(result.periods["net_flow"]) == [1000.0, 1000.0]
+
+def test_periods_without_capital_earn_nothing():
+    valuations = ordinals(date(2023, 1, 1), date(2023, 4, 1), date(2023, 7, 1))
+
+    result = time_weighted_return(valuations, [0.0, 1000.0, 1050.0], ordinals(date(2023, 4, 1)), [-1000.0])
+
+    assert np.allclose(result.periods["return"], [0.0, 0.05])
+    assert math.isclose(result.cumulative, 0.05)
+
+def test_single_valuation_has_no_return():
+    result = time_weighted_return(ordinals(date(2023, 1, 1)), [1000.0], np.array([], dtype=np.int64), [])
+
+    assert math.isnan(result.annualised)
+    assert result.periods.empty
+
+def test_thousands_of_valuations_match_a_row_by_row_calculation():
+    rng = np.random.default_rng(3)
+    valuation_days = np.unique(rng.integers(730000, 740000, 3000))
+    values = rng.uniform(1000.0, 5000.0, valuation_days.size)
+    tx_days = np.sort(rng.integers(729900, 740000, 20000))
+    tx_amounts = rng.normal(-100.0, 50.0, tx_days.size)
+
+    started = time.perf_counter()
+    result = time_weighted_return(valuation_days, values, tx_days, tx_amounts)
+    assert time.perf_counter() - started < 1.0
+
+    expected = []
+    for i in range(valuation_days.size - 1):
+        start, end = valuation_days[i], valuation_days[i + 1]
+        inside = (tx_days > start) & (tx_days <= end)
+        flows = -tx_amounts[inside]
+        weighted = np.sum(flows * (end - tx_days[inside]) / (end - start))
+        capital = values[i] + weighted
+        expected.append((values[i + 1] - values[i] - flows.sum()) / capital if capital > 0 else 0.0)
+    assert np.allclose(result.periods["return"], expected)
@@ -0,0 +1,98 @@
+import json
+import threading
+import urllib.request
+from datetime import date
+import pytest
+from src.domain.model import Transaction, Portfolio
+from src.domain.service import PerformanceService
+from src.ports.statement_reader import StatementReader
+from src.orchestration import ProviderJob
+from src.adapters.directory_watcher import InotifyWatcher, PollingWatcher
+from src.adapters.results_server import ResultsServer
+from src.watch import WatchService
+
+class CountingReader(StatementReader):
+    def __init__(self):
+        self.reads = 0
+        self.fail = False
+
+    def read_all(self, directory: str) -> Portfolio:
+        self.reads += 1
+        if self.fail:
+            raise ValueError("unreadable statement")
+        return Portfolio(
+            name=directory,
+            transactions=[Transaction(date(2023, 1, 1), -1000.0, "Deposit")],
+            current_value=1000.0 + 100.0 * self.reads,
+            current_date=date(2024, 1, 1),
+        )
+
+class FakeWatcher:
+    def __init__(self, batches, stop: threading.Event):
+        self.batches = list(batches)
+        self.stop = stop
+
+    def changes(self, timeout: float):
+        if not self.batches:
+            self.stop.set()
+            return set()
+        return self.batches.pop(0)
+
+def test_polling_watcher_reports_new_statements(tmp_path):
+    watched, other = tmp_path / "watched", tmp_path / "other"
+    watched.mkdir()
+    other.mkdir()
+    watcher = PollingWatcher([str(watched), str(other)], interval=0.05, settle_seconds=0.05)
+
+    assert watcher.changes(0.1) == set()
+    (watched / "24_q1.pdf").write_text("statement")
+    (watched / "notes.txt").write_text("ignored")
+    assert watcher.changes(1.0) == {str(watched)}
+    assert watcher.changes(0.1) == set()
+
+def test_inotify_watcher_reports_completed_writes(tmp_path):
+    try:
+        watcher = InotifyWatcher([str(tmp_path)], settle_seconds=0.05)
+    except (OSError, AttributeError):
+        pytest.skip("inotify is not available")
+    try:
+        (tmp_path / "notes.txt").write_text("ignored")
+        assert watcher.changes(0.1) == set()
+        (tmp_path / "24_q1.pdf").write_text("statement")
+        assert watcher.changes(1.0) == {str(tmp_path)}
+    finally:
+        watcher.close()
+
+def test_only_changed_accounts_are_recomputed_and_failures_keep_old_results(tmp_path):
+    first, second = CountingReader(), CountingReader()
+    jobs = [ProviderJob("First", first, str(tmp_path / "first")), ProviderJob("Second", second, str(tmp_path / "second"))]
+    updates = []
+    stop = threading.Event()
+    watcher = FakeWatcher([{str(tmp_path / "second")}, set()], stop)
+    service = WatchService(jobs, PerformanceService(), watcher, on_update=updates.append)
+
+    service.run(stop)
+
+    assert (first.reads, second.reads) == (1, 2)
+    assert [o.portfolio.current_value for o in service.latest()] == [1100.0, 1200.0]
+    assert len(updates) == 2
+
+    second.fail = True
+    assert service.refresh([str(tmp_path / "second")]) == []
+    assert [o.portfolio.current_value for o in service.latest()] == [1100.0, 1200.0]
+
+def test_results_server_serves_latest_results():
+    results = {"accounts": {"Moneyfarm": {"xirr": 0.07}}}
+    server = ResultsServer(lambda: results, ("127.0.0.1", 0))
+    server.start()
+    host, port = server.address
+    try:
+        with urllib.request.urlopen(f"http://{host}:{port}/results") as response:
+            assert json.load(response) == results
+        results["accounts"]["Moneyfarm"]["xirr"] = 0.08
+        with urllib.request.urlopen(f"http://{host}:{port}/results") as response:
+            assert json.load(response)["accounts"]["Moneyfarm"]["xirr"] == 0.08
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(f"http://{host}:{port}/unknown")
+    finally:
+        server.close()
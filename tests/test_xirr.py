@@ -0,0 +1,51 @@
+import math
+import numpy as np
+from src.domain.xirr import solve_xirr, solve_xirr_batch, xnpv, xnpv_derivative, year_fractions
+
+def test_solve_xirr_one_year_growth():
+    # Deposit 1000, worth 1100 exactly one (365.25 day) year later
+    result = solve_xirr(np.array([0, 365.25]), np.array([-1000.0, 1100.0]))
+    assert result.converged
+    assert result.method == "newton"
+    assert math.isclose(result.rate, 0.10, rel_tol=1e-9)
+
+def test_solve_xirr_ignores_flow_order():
+    days = np.array([400, 0, 200])
+    amounts = np.array([2100.0, -1000.0, -1000.0])
+    ordered = solve_xirr(np.sort(days), np.array([-1000.0, -1000.0, 2100.0]))
+    assert math.isclose(solve_xirr(days, amounts).rate, ordered.rate, rel_tol=1e-9)
+
+def test_analytic_derivative_matches_finite_difference():
+    years = year_fractions(np.array([0, 100, 300, 700]))
+    amounts = np.array([-500.0, -250.0, 100.0, 800.0])
+    h = 1e-6
+    numeric = (xnpv(0.05 + h, years, amounts) - xnpv(0.05 - h, years, amounts)) / (2 * h)
+    assert math.isclose(xnpv_derivative(0.05, years, amounts), numeric, rel_tol=1e-6)
+
+def test_solve_xirr_falls_back_to_brent_when_newton_diverges():
+    # Half the money lost in a year; Newton from a large guess overshoots below -100%
+    days = np.array([0, 365.25])
+    amounts = np.array([-1000.0, 500.0])
+    result = solve_xirr(days, amounts, guess=50.0)
+    assert result.converged
+    assert result.method == "brent"
+    assert math.isclose(result.rate, -0.5, rel_tol=1e-9)
+
+def test_solve_xirr_reports_failure_without_sign_change():
+    result = solve_xirr(np.array([0, 100]), np.array([-1000.0, -50.0]))
+    assert not result.converged
+    assert math.isnan(result.rate)
+
+def test_batch_matches_individual_solves():
+    cash_flows = [
+        (np.array([0, 365]), np.array([-1000.0, 1100.0])),
+        (np.array([0, 181, 365]), np.array([-1000.0, -1000.0, 2100.0])),
+        (np.array([0, 365]), np.array([-1000.0, 500.0])),
+        (np.array([0, 100]), np.array([-1000.0, -50.0])),
+    ]
+    batch = solve_xirr_batch(cash_flows)
+    for (days, amounts), result in zip(cash_flows, batch):
+        single = solve_xirr(days, amounts)
+        assert result.converged == single.converged
+        if single.converged:
+            assert math.isclose(result.rate, single.rate, rel_tol=1e-8)